@@ -1,105 +1,542 @@
 
-from flask import Flask, jsonify, request, send_from_directory
+import time
+_BOOT_START = time.perf_counter()
+
+from flask import Flask, jsonify, request, send_from_directory, Response, stream_with_context
 from flask_cors import CORS
 import sys
 import os
+import json
 import threading
+import hmac
+import functools
 
 # Add parent to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from core import data, engine
+from core import data, engine, jobs, cache, payload, scenario, encoding, spatial, metrics, scheduler, shared, profiling
 
 app = Flask(__name__, static_url_path='', static_folder='static')
 CORS(app)
 
-# Load Data Global
+def build_static_views(df_clusters, df_sctp):
+    """
+    Precompressed /api/data/static payload plus the viewport indexes, from one GeoJSON build.
+    """
+    static_geojson = payload.build_static_geojson(df_clusters, df_sctp)
+    return (
+        payload.encode_payload(static_geojson),
+        spatial.PointLayer(static_geojson['gvps']['features']),
+        spatial.PointLayer(static_geojson['sctps']['features'])
+    )
+
+def load_route_layer(path):
+    # Base route layer until the first solve: the shipped static routes dataset
+    try:
+        return spatial.LineLayer(encoding.load_route_dataset(path)['features'])
+    except Exception as e:
+        print(f"Static routes not indexed: {e}")
+        return spatial.LineLayer([])
+
+# Data Globals: populated by ensure_data(), either by the warm-up thread or on first request
 DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
-try:
+ROUTES_JS = os.path.join(os.path.dirname(__file__), 'static', 'routes.js')
+DF_CLUSTERS, DF_SCTP, FLEET, G, ZONE_INDEX = None, None, None, None, None
+DATA_FINGERPRINT, DATA_SIGNATURE, STATIC_PAYLOAD = None, None, None
+GVP_LAYER = SCTP_LAYER = None
+ROUTE_LAYER = spatial.LineLayer([])
+
+# Publish the datasets as memory-mapped files that every worker process attaches to read-only
+SHARED_DATA = os.environ.get('ROUTEMIND_SHARED_DATA', '1') != '0'
+
+def load_tables():
+    """
+    Returns (df_clusters, df_sctp, zone_index); zone_index is None without shared data.
+    """
+    if SHARED_DATA:
+        return shared.load_shared_tables(DATA_DIR)
+    return data.load_tables(DATA_DIR) + (None,)
+
+DATA_STATE = {'status': 'pending', 'error': None}
+LOAD_LOCK = threading.Lock()
+
+# Startup-time report (seconds per phase)
+STARTUP = {'imports': round(time.perf_counter() - _BOOT_START, 3)}
+
+def _load_all():
+    global DF_CLUSTERS, DF_SCTP, FLEET, G, ZONE_INDEX, DATA_FINGERPRINT, DATA_SIGNATURE, STATIC_PAYLOAD
+    global GVP_LAYER, SCTP_LAYER, ROUTE_LAYER
+    
     print("Loading Data...")
-    DF_CLUSTERS, DF_SCTP, FLEET, G = data.load_data(DATA_DIR)
+    t = time.perf_counter()
+    signature = data.data_files_signature(DATA_DIR)
+    df_clusters, df_sctp, zone_index = load_tables()
+    STARTUP['tables'] = round(time.perf_counter() - t, 3)
+    
+    t = time.perf_counter()
+    graph = shared.load_shared_graph(DATA_DIR) if SHARED_DATA else data.load_graph(DATA_DIR)
+    STARTUP['graph'] = round(time.perf_counter() - t, 3)
+    
+    t = time.perf_counter()
+    static_payload, gvp_layer, sctp_layer = build_static_views(df_clusters, df_sctp)
+    route_layer = load_route_layer(ROUTES_JS)
+    STARTUP['views'] = round(time.perf_counter() - t, 3)
+    
+    DF_CLUSTERS, DF_SCTP, FLEET, G, ZONE_INDEX = df_clusters, df_sctp, data.default_fleet(), graph, zone_index
+    DATA_FINGERPRINT = data.fingerprint_data(DF_CLUSTERS, DF_SCTP)
+    DATA_SIGNATURE = signature
+    STATIC_PAYLOAD, GVP_LAYER, SCTP_LAYER = static_payload, gvp_layer, sctp_layer
+    # A solve may already have published fresher routes while we were loading
+    if not ROUTE_LAYER.features:
+        ROUTE_LAYER = route_layer
     print("Data Loaded Successfully.")
-except Exception as e:
-    print(f"Error Loading Data: {e}")
-    DF_CLUSTERS, DF_SCTP, FLEET, G = None, None, None, None
+
+def ensure_data():
+    """
+    Loads the datasets once (thread-safe). Returns True when the data is available.
+    """
+    if DATA_STATE['status'] == 'pending':
+        with LOAD_LOCK:
+            if DATA_STATE['status'] == 'pending':
+                t = time.perf_counter()
+                try:
+                    _load_all()
+                    DATA_STATE['status'] = 'ready'
+                except Exception as e:
+                    print(f"Error Loading Data: {e}")
+                    DATA_STATE['status'], DATA_STATE['error'] = 'failed', str(e)
+                STARTUP['data_total'] = round(time.perf_counter() - t, 3)
+                STARTUP['ready_after_boot'] = round(time.perf_counter() - _BOOT_START, 3)
+                print("Startup: " + " | ".join(f"{k} {v:.2f}s" for k, v in STARTUP.items()))
+    return DATA_STATE['status'] == 'ready'
+
+def start_warmup():
+    threading.Thread(target=ensure_data, name="data-warmup", daemon=True).start()
+
+DATA_LOCK = threading.Lock()
+
+def refresh_tables():
+    """
+    Reloads the CSV tables (not the graph) and rebuilds the static payload if the files changed on disk.
+    """
+    global DF_CLUSTERS, DF_SCTP, ZONE_INDEX, DATA_FINGERPRINT, DATA_SIGNATURE, STATIC_PAYLOAD, GVP_LAYER, SCTP_LAYER
+    signature = data.data_files_signature(DATA_DIR)
+    if signature == DATA_SIGNATURE:
+        return
+    with DATA_LOCK:
+        if signature == DATA_SIGNATURE:
+            return
+        try:
+            df_clusters, df_sctp, zone_index = load_tables()
+            static_payload, gvp_layer, sctp_layer = build_static_views(df_clusters, df_sctp)
+        except Exception as e:
+            print(f"Error Reloading Data: {e}")
+            return
+        print("Data files changed, tables reloaded.")
+        DF_CLUSTERS, DF_SCTP, ZONE_INDEX = df_clusters, df_sctp, zone_index
+        DATA_FINGERPRINT = data.fingerprint_data(DF_CLUSTERS, DF_SCTP)
+        STATIC_PAYLOAD, GVP_LAYER, SCTP_LAYER = static_payload, gvp_layer, sctp_layer
+        DATA_SIGNATURE = signature
+
+# Solved results keyed by (request config, data fingerprint, solver signature)
+RESULT_CACHE = cache.ResultCache()
+
+# Last solutions per zone, keyed by the zone's own inputs, so partial edits only re-solve changed zones
+ZONE_CACHE = cache.ResultCache(max_entries=256)
+
+# Admission control: bounded concurrent solves plus a bounded FIFO queue, 429 beyond that
+SCHEDULER = scheduler.SolveScheduler()
+# Queued jobs block on the scheduler, so the job pool needs a thread per admissible solve
+jobs.JOB_WORKERS = SCHEDULER.max_concurrent + SCHEDULER.max_queue
+
+metrics.REGISTRY.set_gauge('solves_running', lambda: SCHEDULER.stats()['running'])
+metrics.REGISTRY.set_gauge('solves_queued', lambda: SCHEDULER.stats()['queued'])
+metrics.REGISTRY.set_gauge('result_cache_entries', lambda: RESULT_CACHE.stats()['entries'])
+# Running totals: exported as counters (routemind_<name>_total)
+metrics.REGISTRY.set_counter('solves_rejected', lambda: SCHEDULER.stats()['rejected'])
+metrics.REGISTRY.set_counter('result_cache_hits', lambda: RESULT_CACHE.stats()['hits'])
+metrics.REGISTRY.set_counter('zone_cache_hits', lambda: ZONE_CACHE.stats()['hits'])
+metrics.REGISTRY.set_counter('zone_cache_misses', lambda: ZONE_CACHE.stats()['misses'])
+
+# Per-request profiling (?profile=1|cprofile|sample) is admin-only: X-Admin-Token must match this
+ADMIN_TOKEN = os.environ.get('ROUTEMIND_ADMIN_TOKEN')
+PROFILE_DIR = os.environ.get('ROUTEMIND_PROFILE_DIR', os.path.join(os.path.dirname(__file__), '..', 'profiles'))
+
+# Per-zone GA convergence traces (JSONL, one record per generation, latest solve per zone); off when unset
+TRACE_DIR = os.environ.get('ROUTEMIND_TRACE_DIR')
+
+def result_key(config):
+    return cache.make_key(config, DATA_FINGERPRINT, engine.solver_signature())
+
+@app.route('/api/status', methods=['GET'])
+def status():
+    return jsonify({"data": DATA_STATE['status'], "error": DATA_STATE['error'], "startup_s": STARTUP,
+                    "scheduler": SCHEDULER.stats()})
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    if request.args.get('format') == 'json':
+        return jsonify(metrics.REGISTRY.snapshot())
+    return Response(metrics.REGISTRY.render_prometheus(), mimetype='text/plain; version=0.0.4')
 
 @app.route('/')
 def index():
     return send_from_directory('static', 'index.html')
 
-@app.route('/api/simulate', methods=['POST'])
-def simulate():
-    if DF_CLUSTERS is None:
-        return jsonify({"error": "Server Data not loaded"}), 500
-        
-    config = request.json or {}
-    print(f"Running Simulation Request: {config}")
+def zone_trace_path(zone_name):
+    if not TRACE_DIR:
+        return None
+    os.makedirs(TRACE_DIR, exist_ok=True)
+    return os.path.join(TRACE_DIR, f"zone_{profiling.profile_label(zone_name)}.jsonl")
+
+def iter_city(config=None, progress_callback=None, profiler=None):
+    """
+    Solves every SCTP zone in turn, yielding (zone_name, features, metrics, reused) as soon as each zone is done.
+    Zones whose inputs match a previous solve are served from ZONE_CACHE (reused=True).
+    progress_callback(zone_idx, zone_count, gen, total, message, stats) reports GA progress,
+    `stats` being the generation's convergence record (engine.convergence_record).
+    With a profiling.ProfileSession, every zone is solved fresh (no ZONE_CACHE) under the profiler.
+    """
+    zone_inputs = scenario.build_zone_inputs(DF_CLUSTERS, DF_SCTP, FLEET, config, ZONE_INDEX)
+    signature = engine.solver_signature()
     
+    for zone_idx, zone in enumerate(zone_inputs):
+        # The engine reports (gen, total, message, stats); prefix the zone's place in the city
+        zone_progress = functools.partial(progress_callback, zone_idx, len(zone_inputs)) if progress_callback else None
+        
+        def solve_zone(zone=zone, zone_progress=zone_progress):
+            return engine.solve_scenario(zone['gvps'], zone['fleet'], G, zone['depot_loc'], progress_callback=zone_progress,
+                                         trace_path=zone_trace_path(zone['name']))
+        
+        if profiler is not None:
+            with profiler.zone(zone['name']):
+                result, reused = solve_zone(), False
+        else:
+            result, reused = ZONE_CACHE.get_or_compute(scenario.zone_key(zone, signature), solve_zone)
+        
+        # Merge properties
+        for f in result['routes']['features']:
+            f['properties']['zone'] = zone['name']
+        
+        yield zone['name'], result['routes']['features'], result['metrics'], reused
+
+def city_metrics(total_dist, total_load, total_co2, total_routes):
+    return {
+        "total_dist": round(total_dist, 2),
+        "total_waste": round(total_load, 1),
+        "total_co2": round(total_co2, 2),
+        "total_routes": total_routes
+    }
+
+def solve_city(config=None, progress_callback=None, zone_callback=None, profiler=None):
+    """
+    Solves the whole city and merges the routes into one FeatureCollection.
+    zone_callback(zone_name, features, zone_metrics) receives each zone as soon as it is solved.
+    """
     # Gather Results
     all_features = []
-    
-    zones = DF_CLUSTERS['Assigned_SCTP_ID'].unique()
+    resolved, reused_zones = [], []
     
     total_dist = 0
     total_load = 0
     total_co2 = 0
     
-    for z in zones:
-        sctp_info = DF_SCTP[DF_SCTP['SCTP_ID'] == z].iloc[0]
-        zone_clusters = DF_CLUSTERS[DF_CLUSTERS['Assigned_SCTP_ID'] == z]
-        depot_loc = (sctp_info['lat'], sctp_info['lon'])
-        
-        result = engine.solve_scenario(zone_clusters, FLEET, G, depot_loc)
-        
-        # Merge properties
-        for f in result['routes']['features']:
-            f['properties']['zone'] = sctp_info['SCTP_Name']
-            all_features.append(f)
+    for zone_name, features, zone_metrics, reused in iter_city(config, progress_callback, profiler):
+        all_features.extend(features)
+        (reused_zones if reused else resolved).append(zone_name)
             
-        total_dist += result['metrics']['total_dist']
-        total_load += result['metrics']['total_waste']
-        total_co2 += result['metrics']['total_co2']
+        total_dist += zone_metrics['total_dist']
+        total_load += zone_metrics['total_waste']
+        total_co2 += zone_metrics['total_co2']
+        
+        if zone_callback:
+            zone_callback(zone_name, features, zone_metrics)
             
-    response = {
+    # Latest full solve becomes the route layer for viewport queries
+    global ROUTE_LAYER
+    ROUTE_LAYER = spatial.LineLayer(all_features)
+    
+    return {
         "routes": {
             "type": "FeatureCollection",
             "features": all_features
         },
-        "metrics": {
-            "total_dist": round(total_dist, 2),
-            "total_waste": round(total_load, 1),
-            "total_co2": round(total_co2, 2),
-            "total_routes": len(all_features)
-        }
+        "metrics": city_metrics(total_dist, total_load, total_co2, len(all_features)),
+        "zones": {"resolved": resolved, "reused": reused_zones}
     }
+
+def _ndjson(record):
+    return json.dumps(record, separators=(',', ':')) + "\n"
+
+def stream_city(config=None, polyline=False, ticket=None, profiler=None):
+    """
+    NDJSON stream: one 'zone' record per solved zone, then a 'summary' record.
+    Only running totals are kept, so memory does not grow with the number of zones.
+    With a scheduler ticket, 'queued' records report the place in line until a slot frees up.
+    With a profiler, the summary lists the profile files.
+    """
+    total_dist = total_load = total_co2 = 0
+    total_routes = 0
+    try:
+        last_position = None
+        while ticket is not None and not SCHEDULER.try_start(ticket, scheduler.WAIT_POLL_SECONDS):
+            position = SCHEDULER.position(ticket)
+            if position != last_position:
+                last_position = position
+                yield _ndjson({"type": "queued", "position": position})
+        for zone_name, features, zone_metrics, reused in iter_city(config, profiler=profiler):
+            total_dist += zone_metrics['total_dist']
+            total_load += zone_metrics['total_waste']
+            total_co2 += zone_metrics['total_co2']
+            total_routes += len(features)
+            if polyline:
+                features = encoding.encode_routes({"features": features})['features']
+            yield _ndjson({"type": "zone", "zone": zone_name, "reused": reused, "features": features, "metrics": zone_metrics})
+    except Exception as e:
+        yield _ndjson({"type": "error", "error": str(e)})
+        return
+    finally:
+        if ticket is not None:
+            SCHEDULER.release(ticket)
+    summary = {"type": "summary", "metrics": city_metrics(total_dist, total_load, total_co2, total_routes)}
+    if profiler is not None:
+        summary['profile'] = profile_info(profiler)
+    yield _ndjson(summary)
+
+def wants_polyline():
+    return request.args.get('format') == 'polyline'
+
+def encode_result(result):
+    """
+    Swaps the routes FeatureCollection for its compact polyline form (without touching cached results).
+    """
+    return {**result, "routes": encoding.encode_routes(result['routes'])}
+
+def wants_ndjson():
+    return request.args.get('stream') == 'ndjson' or \
+        'application/x-ndjson' in request.headers.get('Accept', '')
+
+def queue_full_response(e):
+    response = jsonify({"error": "Solver is at capacity, try again later", "retry_after": e.retry_after,
+                        "scheduler": SCHEDULER.stats()})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response
+
+def is_admin():
+    token = request.headers.get('X-Admin-Token', '')
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+def requested_profile_mode():
+    """
+    Profiler mode from ?profile= ('1'/'true' mean 'all'), or None when profiling was not asked for.
+    """
+    value = request.args.get('profile', '').lower()
+    if value in ('', '0', 'false'):
+        return None
+    return value if value in profiling.PROFILE_MODES else 'all'
+
+def profile_info(profiler):
+    return {"dir": os.path.abspath(profiler.out_dir), "mode": profiler.mode,
+            "files": [os.path.basename(f) for f in profiler.files]}
+
+@app.route('/api/simulate', methods=['POST'])
+def simulate():
+    if not ensure_data():
+        return jsonify({"error": "Server Data not loaded"}), 500
+        
+    config = request.json or {}
+    try:
+        scenario.validate_config(config)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    print(f"Running Simulation Request: {config}")
+    
+    # Profiled solves always run for real: no result or zone cache, one profile per zone
+    profiler = None
+    profile_mode = requested_profile_mode()
+    if profile_mode:
+        if not is_admin():
+            return jsonify({"error": "Profiling requires a valid X-Admin-Token"}), 403
+        profiler = profiling.ProfileSession(profiling.new_session_dir(PROFILE_DIR), profile_mode)
+    
+    key = result_key(config)
+    cached = None if wants_ndjson() or profiler else RESULT_CACHE.get(key)
+    
+    # Anything that may solve needs a place in the scheduler; reject fast when it is full
+    ticket = None
+    if cached is None:
+        try:
+            ticket = SCHEDULER.admit()
+        except scheduler.SchedulerFull as e:
+            return queue_full_response(e)
+    
+    # Streaming mode: zones are sent as they finish (not cached, nothing accumulated)
+    if wants_ndjson():
+        response = Response(
+            stream_with_context(stream_city(config, wants_polyline(), ticket, profiler)),
+            mimetype='application/x-ndjson',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+        # The generator never runs if the client goes away first, so release on close as well
+        response.call_on_close(lambda: SCHEDULER.release(ticket))
+        return response
+    
+    if cached is not None:
+        result, hit = cached, True
+    elif profiler is not None:
+        try:
+            with SCHEDULER.run(ticket):
+                result = solve_city(config, profiler=profiler)
+        finally:
+            SCHEDULER.release(ticket)
+        result, hit = {**result, "profile": profile_info(profiler)}, False
+    else:
+        # Identical concurrent requests share one solve; only the leading request keeps its ticket
+        try:
+            result, hit = scheduler.run_coalesced(SCHEDULER, RESULT_CACHE, key, ticket, lambda: solve_city(config))
+        except scheduler.SchedulerFull as e:
+            return queue_full_response(e)
+    
+    response = jsonify(encode_result(result) if wants_polyline() else result)
+    response.headers['X-Cache'] = 'HIT' if hit else 'MISS'
+    return response
+
+# --- ASYNC JOB API ---
+def _simulate_job(job, key, config, ticket):
+    cached = RESULT_CACHE.get(key)
+    if cached is not None:
+        job.emit('cache', {'hit': True})
+        return cached
+    
+    last_position = [None]
+    def on_wait(position):
+        if job.cancel_event.is_set():
+            raise jobs.JobCancelled()
+        if position != last_position[0]:
+            last_position[0] = position
+            job.emit('queued', {'position': position})
     
+    def on_progress(zone_idx, zone_count, gen, total, message, stats=None):
+        job.progress(zone=zone_idx + 1, zones=zone_count, gen=gen, total=total, message=message, convergence=stats)
+    
+    def on_zone(zone_name, features, zone_metrics):
+        job.emit('zone', {'zone': zone_name, 'features': features, 'metrics': zone_metrics})
+    
+    with SCHEDULER.run(ticket, on_wait):
+        result = solve_city(config, on_progress, on_zone)
+    RESULT_CACHE.put(key, result)
+    return result
+
+@app.route('/api/jobs', methods=['POST'])
+def create_job():
+    if not ensure_data():
+        return jsonify({"error": "Server Data not loaded"}), 500
+    
+    config = request.json or {}
+    try:
+        scenario.validate_config(config)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        ticket = SCHEDULER.admit()
+    except scheduler.SchedulerFull as e:
+        return queue_full_response(e)
+    
+    print(f"Queueing Simulation Job: {config}")
+    job = jobs.submit(_simulate_job, result_key(config), config, ticket)
+    job.meta['ticket'] = ticket
+    # Covers jobs cancelled before they ever started running
+    job.add_done_callback(lambda j: SCHEDULER.release(ticket))
+    return jsonify({
+        "job_id": job.id,
+        "status": job.status,
+        "queue_position": SCHEDULER.position(ticket),
+        "events": f"/api/jobs/{job.id}/events"
+    }), 202
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    
+    response = job.summary()
+    if 'ticket' in job.meta:
+        response['queue_position'] = SCHEDULER.position(job.meta['ticket'])
+    if job.status == 'done':
+        response['result'] = encode_result(job.result) if wants_polyline() else job.result
     return jsonify(response)
 
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def stream_job(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    
+    # Resume support: EventSource sends the last seen id on reconnect (client-controlled: junk replays everything)
+    try:
+        start = max(0, int(request.headers.get('Last-Event-ID') or 0))
+    except ValueError:
+        start = 0
+    return Response(
+        stream_with_context(job.stream(start)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    job = jobs.cancel(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    return jsonify(job.summary())
+
 @app.route('/api/data/static', methods=['GET'])
 def get_static_data():
-    # Return GVPs and SCTPs as GeoJSONs for map
-    if DF_CLUSTERS is None: return jsonify({})
-    
-    gvps = []
-    for _, row in DF_CLUSTERS.iterrows():
-        gvps.append({
-            "type": "Feature",
-            "geometry": {"type": "Point", "coordinates": [row['lon'], row['lat']]},
-            "properties": {"waste": row['Waste_Tonnes']}
-        })
-        
-    sctps = []
-    if DF_SCTP is not None:
-        for _, row in DF_SCTP.iterrows():
-            sctps.append({
-                "type": "Feature",
-                "geometry": {"type": "Point", "coordinates": [row['lon'], row['lat']]},
-                "properties": {"name": row['SCTP_Name']}
-            })
-            
-    return jsonify({
-        "gvps": {"type": "FeatureCollection", "features": gvps},
-        "sctps": {"type": "FeatureCollection", "features": sctps}
-    })
+    # Return GVPs and SCTPs as GeoJSONs for map (serialized and compressed once per data version)
+    if not ensure_data(): return jsonify({})
+    refresh_tables()
+    
+    encoding, body, etag = payload.negotiate(STATIC_PAYLOAD, request.headers.get('Accept-Encoding'))
+    headers = {'ETag': etag, 'Vary': 'Accept-Encoding', 'Cache-Control': 'no-cache'}
+    
+    if payload.etag_matches(request.headers.get('If-None-Match'), etag):
+        return Response(status=304, headers=headers)
+    
+    response = Response(body, mimetype='application/json', headers=headers)
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+@app.route('/api/data/viewport', methods=['GET'])
+def get_viewport():
+    """
+    Features inside ?bbox=min_lon,min_lat,max_lon,max_lat, with routes simplified for ?zoom=.
+    ?layers= limits the response to a comma-separated subset of gvps,sctps,routes.
+    """
+    if not ensure_data(): return jsonify({})
+    refresh_tables()
+    
+    try:
+        bbox = spatial.parse_bbox(request.args.get('bbox'))
+        zoom = int(request.args.get('zoom', 14))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    layers = set((request.args.get('layers') or 'gvps,sctps,routes').split(','))
+    response = {"bbox": bbox, "zoom": zoom}
+    if 'gvps' in layers:
+        response['gvps'] = {"type": "FeatureCollection", "features": GVP_LAYER.query(bbox)}
+    if 'sctps' in layers:
+        response['sctps'] = {"type": "FeatureCollection", "features": SCTP_LAYER.query(bbox)}
+    if 'routes' in layers:
+        response['routes'] = {"type": "FeatureCollection", "features": ROUTE_LAYER.query(bbox, zoom)}
+    return jsonify(response)
+
+# Warm the data in the background so the first request rarely waits (ROUTEMIND_WARMUP=0 disables).
+# Spawned SA pool workers re-import the entry script as __mp_main__ and only need the engine.
+if __name__ != '__mp_main__' and os.environ.get('ROUTEMIND_WARMUP', '1') != '0':
+    start_warmup()
 
 if __name__ == '__main__':
     app.run(port=5000, debug=True)
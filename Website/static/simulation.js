@@ -21,6 +21,57 @@ let simStats = {
     status: "Initializing..."
 };
 
+/**
+ * Decodes a delta-encoded fixed-precision polyline (core/encoding.py) into [lon, lat] pairs.
+ */
+function decodePolyline(str, precision) {
+    const factor = Math.pow(10, precision || 5);
+    const coords = [];
+    let index = 0, lat = 0, lon = 0;
+
+    while (index < str.length) {
+        for (let axis = 0; axis < 2; axis++) {
+            let shift = 0, result = 0, b;
+            do {
+                b = str.charCodeAt(index++) - 63;
+                result |= (b & 0x1f) << shift;
+                shift += 5;
+            } while (b >= 0x20);
+            const delta = (result & 1) ? ~(result >> 1) : (result >> 1);
+            if (axis === 0) lat += delta; else lon += delta;
+        }
+        coords.push([lon / factor, lat / factor]);
+    }
+    return coords;
+}
+
+/**
+ * Expands an EncodedFeatureCollection (static routes.js or /api/simulate?format=polyline)
+ * into plain GeoJSON in place, so map layers and the animation can use it unchanged.
+ */
+function expandRouteCollection(collection) {
+    if (!collection || collection.type !== 'EncodedFeatureCollection') return collection;
+
+    collection.features = collection.features.map(f => {
+        if (typeof f.path !== 'string') return f;
+        return {
+            type: 'Feature',
+            properties: f.properties || {},
+            geometry: { type: 'LineString', coordinates: decodePolyline(f.path, collection.precision) }
+        };
+    });
+    collection.type = 'FeatureCollection';
+    delete collection.encoding;
+    delete collection.precision;
+    return collection;
+}
+
+window.decodePolyline = decodePolyline;
+window.expandRouteCollection = expandRouteCollection;
+
+// routes.js ships encoded; expand once before script.js builds the layers
+if (typeof routesData !== 'undefined') expandRouteCollection(routesData);
+
 /**
  * Starts the simulation logic.
  * Reads global `routesData` and `map` from script.js scope (attached to window).
@@ -0,0 +1,131 @@
+import os
+import sys
+import io
+import csv
+import json
+import time
+import random
+import argparse
+import subprocess
+from contextlib import redirect_stdout
+
+# Add parent to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# End-to-end scaling study: every (N, zones) case is generated and solved in a fresh
+# subprocess, so peak RSS belongs to that case alone.
+#   python benchmarks/scaling_study.py --sizes 1583,10000,50000 --zones 18,40 --generations 5
+
+# --- CONFIGURATION ---
+DEFAULT_SIZES = [1583, 10000, 25000, 50000, 100000]
+DEFAULT_ZONES = [18]
+DEFAULT_GENERATIONS = 5        # Full 200-generation solves are not feasible at 100k points
+CASE_TIMEOUT_S = 3600
+STUDY_COLUMNS = ['gvps', 'zones', 'status', 'wall_s', 'peak_rss_mb', 'largest_zone',
+                 'total_dist_km', 'routes', 'served_%', 'km_per_tonne', 'matrix_build_s', 'ga_generation_mean_s']
+
+def peak_rss_mb():
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024, 1)
+
+def run_case(n_gvps, n_zones, generations, seed):
+    """
+    Generates and solves one instance in this process. Returns a result row.
+    """
+    from core import engine, data, metrics, scenario
+    from benchmarks import synthetic
+
+    random.seed(seed)
+    engine.MAX_GENERATIONS = generations
+    metrics.REGISTRY.reset()
+    df_clusters, df_sctp = synthetic.generate(n_gvps, n_zones, seed)
+    fleet = data.default_fleet()
+    zone_inputs = scenario.build_zone_inputs(df_clusters, df_sctp, fleet)
+
+    t = time.perf_counter()
+    total_dist = collected = 0.0
+    routes = 0
+    with redirect_stdout(io.StringIO()):
+        for zone in zone_inputs:
+            result = engine.solve_scenario(zone['gvps'], zone['fleet'], None, zone['depot_loc'])
+            total_dist += result['metrics']['total_dist']
+            collected += result['metrics']['total_waste']
+            routes += result['metrics']['total_routes']
+    wall = time.perf_counter() - t
+
+    stages = metrics.REGISTRY.snapshot()['stages']
+    demand_t = float(df_clusters['Waste_Tonnes'].sum())
+    return {
+        'gvps': n_gvps,
+        'zones': n_zones,
+        'status': 'ok',
+        'wall_s': round(wall, 2),
+        'peak_rss_mb': peak_rss_mb(),
+        'largest_zone': max(len(z['gvps']) for z in zone_inputs),
+        'total_dist_km': round(total_dist, 1),
+        'routes': routes,
+        'served_%': round(100.0 * collected / 1000 / demand_t, 2) if demand_t else 0.0,
+        'km_per_tonne': round(total_dist / (collected / 1000), 3) if collected else None,
+        'matrix_build_s': stages.get('matrix_build', {}).get('total_s'),
+        'ga_generation_mean_s': stages.get('ga_generation', {}).get('mean_s'),
+    }
+
+def run_isolated(n_gvps, n_zones, generations, seed, timeout=CASE_TIMEOUT_S):
+    """
+    run_case in a child interpreter. Crashes, MemoryErrors and timeouts become result rows too:
+    they are exactly where the design breaks.
+    """
+    cmd = [sys.executable, os.path.abspath(__file__), '--case', str(n_gvps), str(n_zones),
+           '--generations', str(generations), '--seed', str(seed)]
+    failed = {'gvps': n_gvps, 'zones': n_zones}
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {**failed, 'status': f'timeout >{timeout}s'}
+    if proc.returncode != 0:
+        tail = (proc.stderr or '').strip().splitlines()[-1:] or [f'exit {proc.returncode}']
+        return {**failed, 'status': f"failed: {tail[0][:120]}"}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Engine scaling study on synthetic instances.")
+    parser.add_argument('--sizes', default=",".join(map(str, DEFAULT_SIZES)), help="GVP counts (default: %(default)s)")
+    parser.add_argument('--zones', default=",".join(map(str, DEFAULT_ZONES)), help="Zone counts (default: %(default)s)")
+    parser.add_argument('--generations', type=int, default=DEFAULT_GENERATIONS,
+                        help="GA generations per zone (default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=int, default=CASE_TIMEOUT_S, help="Per case, seconds (default: %(default)s)")
+    parser.add_argument('--out', default='scaling_study', help="Output prefix for .json and .csv (default: %(default)s)")
+    parser.add_argument('--case', nargs=2, type=int, metavar=('GVPS', 'ZONES'), help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.case:
+        # Child mode: one case, result as the last stdout line
+        print(json.dumps(run_case(args.case[0], args.case[1], args.generations, args.seed)))
+        return
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    zone_counts = [int(z) for z in args.zones.split(',') if z.strip()]
+    rows = []
+    print(f"  {'GVPs':>7} {'zones':>5} {'wall s':>9} {'RSS MB':>8} {'max zone':>8} {'km/t':>7}  status")
+    for n_zones in zone_counts:
+        for n_gvps in sizes:
+            row = run_isolated(n_gvps, n_zones, args.generations, args.seed, args.timeout)
+            rows.append(row)
+            print(f"  {n_gvps:>7} {n_zones:>5} {row.get('wall_s', '-'):>9} {row.get('peak_rss_mb', '-'):>8} "
+                  f"{row.get('largest_zone', '-'):>8} {row.get('km_per_tonne') or '-':>7}  {row['status']}", flush=True)
+
+    with open(f"{args.out}.json", 'w') as f:
+        json.dump({'generations': args.generations, 'seed': args.seed, 'cases': rows}, f, indent=2)
+    with open(f"{args.out}.csv", 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=STUDY_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Results written to {args.out}.json and {args.out}.csv")
+
+if __name__ == "__main__":
+    main()
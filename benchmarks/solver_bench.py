@@ -0,0 +1,191 @@
+import os
+import sys
+import io
+import json
+import time
+import random
+import platform
+import argparse
+import statistics
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+
+import numpy as np
+
+# Add parent to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core import data, engine
+from core.utils import vectorized_haversine_matrix
+
+# Micro-benchmarks for the solver hot paths on fixed-seed instances drawn from the real clusters.
+#   python benchmarks/solver_bench.py run --out bench.json
+#   python benchmarks/solver_bench.py compare baseline.json bench.json
+
+# --- CONFIGURATION ---
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+DEFAULT_SIZES = [25, 100, 400]
+DEFAULT_SEED = 42
+DEFAULT_REPEAT = 5
+REGRESSION_THRESHOLD = 0.10   # Flag benchmarks more than 10% slower than the baseline
+BEST_TRUCK_LOADS = 1000       # get_best_truck calls per timed run
+
+def make_instance(df_clusters, size, seed=DEFAULT_SEED):
+    """
+    `size` clusters sampled with a fixed seed, the depot at their centroid, and one shuffled chromosome.
+    """
+    sample = df_clusters.sample(n=min(size, len(df_clusters)), random_state=seed).reset_index(drop=True)
+    gvp_data = engine.prepare_gvp_data(sample)
+    depot_loc = (float(sample['lat'].mean()), float(sample['lon'].mean()))
+    matrix = vectorized_haversine_matrix(gvp_data, depot_loc)
+    rng = random.Random(seed)
+    chromosome = list(range(len(gvp_data)))
+    rng.shuffle(chromosome)
+    return {
+        'gvp_data': gvp_data,
+        'depot_loc': depot_loc,
+        'matrix': matrix,
+        'depot_idx': len(gvp_data),
+        'travel_model': engine.build_travel_model(matrix),
+        'fleet': data.default_fleet(),
+        'chromosome': chromosome,
+        'loads': [rng.uniform(100, 16000) for _ in range(BEST_TRUCK_LOADS)],
+    }
+
+def _one_generation(inst):
+    saved = engine.MAX_GENERATIONS
+    engine.MAX_GENERATIONS = 1
+    try:
+        with redirect_stdout(io.StringIO()):
+            engine.run_ga(inst['gvp_data'], inst['fleet'], inst['matrix'], inst['depot_idx'], inst['travel_model'])
+    finally:
+        engine.MAX_GENERATIONS = saved
+
+def benchmarks(inst):
+    """
+    name -> zero-argument callable, all sharing one instance.
+    """
+    args = (inst['matrix'], inst['fleet'], inst['gvp_data'], inst['depot_idx'])
+    _, routes = engine.calculate_fitness(inst['chromosome'], *args, inst['travel_model'])
+
+    def best_truck():
+        for load in inst['loads']:
+            engine.get_best_truck(load, inst['fleet'])
+
+    return {
+        'haversine_matrix': lambda: vectorized_haversine_matrix(inst['gvp_data'], inst['depot_loc']),
+        'calculate_fitness': lambda: engine.calculate_fitness(inst['chromosome'], *args, inst['travel_model']),
+        'run_sa': lambda: engine.run_sa(inst['chromosome'], *args, engine.INITIAL_TEMP, engine.COOLING_RATE,
+                                        engine.SA_ITERATIONS, inst['travel_model']),
+        'ga_generation': lambda: _one_generation(inst),
+        'get_best_truck': best_truck,
+        'geojson_build': lambda: engine.build_route_features(routes, inst['gvp_data'], inst['depot_loc']),
+    }
+
+def time_call(fn, repeat, seed, budget_s=0.2):
+    """
+    Per-call seconds over `repeat` runs. Fast calls are looped so each run lasts about `budget_s`.
+    """
+    random.seed(seed)
+    t = time.perf_counter()
+    fn()
+    single = time.perf_counter() - t
+    number = max(1, int(budget_s / single)) if single > 0 else 1000
+    samples = []
+    for _ in range(repeat):
+        random.seed(seed)
+        t = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - t) / number)
+    return {
+        'median_s': statistics.median(samples),
+        'min_s': min(samples),
+        'max_s': max(samples),
+        'repeat': repeat,
+        'number': number,
+    }
+
+def run(sizes=DEFAULT_SIZES, repeat=DEFAULT_REPEAT, seed=DEFAULT_SEED, only=None):
+    df_clusters, _ = data.load_tables(DATA_DIR)
+    results = {}
+    for size in sizes:
+        inst = make_instance(df_clusters, size, seed)
+        for name, fn in benchmarks(inst).items():
+            if only and name not in only:
+                continue
+            key = f"{name}[n={len(inst['gvp_data'])}]"
+            results[key] = time_call(fn, repeat, seed)
+            print(f"  {key:<32} {results[key]['median_s'] * 1000:10.3f} ms  (min {results[key]['min_s'] * 1000:.3f}, x{results[key]['number']})")
+    return {
+        'meta': {
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+            'solver': engine.solver_signature(),
+            'sizes': list(sizes),
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+def compare(baseline, current, threshold=REGRESSION_THRESHOLD):
+    """
+    Returns (rows, regressions): one row per benchmark present in both runs.
+    Compares the fastest run of each, which is far less sensitive to machine noise than the median.
+    """
+    rows, regressions = [], []
+    for key in sorted(set(baseline['results']) & set(current['results'])):
+        before = baseline['results'][key]['min_s']
+        after = current['results'][key]['min_s']
+        ratio = after / before if before else float('inf')
+        status = 'REGRESSION' if ratio > 1 + threshold else ('faster' if ratio < 1 - threshold else 'ok')
+        rows.append((key, before, after, ratio, status))
+        if status == 'REGRESSION':
+            regressions.append(key)
+    return rows, regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Solver hot-path micro-benchmarks.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_run = sub.add_parser('run', help="Run the benchmarks and write JSON results")
+    p_run.add_argument('--out', default='bench_results.json')
+    p_run.add_argument('--sizes', default=",".join(map(str, DEFAULT_SIZES)), help="Zone sizes (default: %(default)s)")
+    p_run.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    p_run.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    p_run.add_argument('--only', help="Comma-separated benchmark names")
+    p_cmp = sub.add_parser('compare', help="Compare a run against a saved baseline; exit 1 on regressions")
+    p_cmp.add_argument('baseline')
+    p_cmp.add_argument('current')
+    p_cmp.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                       help="Allowed slowdown as a fraction (default: %(default)s)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'run':
+        sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+        only = set(args.only.split(',')) if args.only else None
+        report = run(sizes, args.repeat, args.seed, only)
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.out}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    rows, regressions = compare(baseline, current, args.threshold)
+    print(f"  {'benchmark (min)':<32} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+    for key, before, after, ratio, status in rows:
+        print(f"  {key:<32} {before * 1000:12.3f} {after * 1000:12.3f} {ratio:7.2f}  {status}")
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print("No regressions.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+import os
+import sys
+import argparse
+
+import numpy as np
+
+# Add parent to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core import data
+
+# Synthetic city-scale instances with the same columns as data/step1_clusters.csv and
+# data/sctp_locations.csv, sampled from the real spatial and demand distributions.
+#   python benchmarks/synthetic.py --gvps 20000 --zones 40 --out synthetic_20k
+
+# --- CONFIGURATION ---
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+SPATIAL_JITTER_DEG = 0.004     # Gaussian kernel around real GVPs (~450 m)
+DEPOT_JITTER_DEG = 0.02        # Extra depots are placed around real SCTPs (~2 km)
+DEMAND_NOISE = 0.15            # Multiplicative log-normal noise on resampled demand
+# Road-tier payload limits, used when the cluster table has no `max_kg` column
+# (run_analysis.py derives them from the road graph at solve time)
+DEFAULT_TIER_MIX = {4000: 0.15, 8000: 0.45, 16000: 0.40}
+
+def generate(n_gvps, n_zones, seed=0, df_clusters=None, df_sctp=None):
+    """
+    Returns (df_clusters, df_sctp) for a synthetic city.
+
+    - Locations: real GVPs resampled with a Gaussian kernel, so density follows the real city.
+    - Demand: bootstrap of the real Waste_Tonnes distribution with log-normal noise.
+    - Road tiers: bootstrap of real `max_kg` when present, DEFAULT_TIER_MIX otherwise.
+    - Zones: the real SCTPs first, extra depots jittered around them; every GVP is assigned
+      to its nearest depot, like the real assignment.
+    """
+    import pandas as pd
+    if df_clusters is None or df_sctp is None:
+        df_clusters, df_sctp = data.load_tables(DATA_DIR)
+    rng = np.random.default_rng(seed)
+
+    # GVPs
+    base = rng.integers(0, len(df_clusters), n_gvps)
+    lat = df_clusters['lat'].to_numpy()[base] + rng.normal(0, SPATIAL_JITTER_DEG, n_gvps)
+    lon = df_clusters['lon'].to_numpy()[base] + rng.normal(0, SPATIAL_JITTER_DEG, n_gvps)
+    demand_pool = df_clusters['Waste_Tonnes'].to_numpy()
+    demand = demand_pool[rng.integers(0, len(demand_pool), n_gvps)] * rng.lognormal(0, DEMAND_NOISE, n_gvps)
+    if 'max_kg' in df_clusters.columns:
+        tiers = df_clusters['max_kg'].to_numpy()[rng.integers(0, len(df_clusters), n_gvps)]
+    else:
+        limits = list(DEFAULT_TIER_MIX)
+        tiers = rng.choice(limits, n_gvps, p=[DEFAULT_TIER_MIX[k] for k in limits])
+
+    # Depots
+    real = df_sctp[['lat', 'lon']].to_numpy()
+    depots = real[:min(n_zones, len(real))]
+    if n_zones > len(real):
+        extra = real[rng.integers(0, len(real), n_zones - len(real))] + rng.normal(0, DEPOT_JITTER_DEG, (n_zones - len(real), 2))
+        depots = np.vstack([depots, extra])
+    names = [df_sctp['SCTP_Name'].iloc[i] if i < len(df_sctp) else f"Synthetic SCTP {i}" for i in range(n_zones)]
+
+    # Nearest depot, in chunks to keep the distance block small at 100k points
+    assigned = np.empty(n_gvps, dtype=np.int64)
+    coslat = np.cos(np.radians(depots[:, 0].mean()))
+    for start in range(0, n_gvps, 20000):
+        end = min(start + 20000, n_gvps)
+        d2 = (lat[start:end, None] - depots[None, :, 0]) ** 2 + ((lon[start:end, None] - depots[None, :, 1]) * coslat) ** 2
+        assigned[start:end] = d2.argmin(axis=1)
+
+    clusters = pd.DataFrame({
+        'GVP_Index': np.arange(1, n_gvps + 1),
+        'GVP_ID': np.arange(n_gvps),
+        'GVP_Name': [f"Synthetic GVP {i}" for i in range(n_gvps)],
+        'lat': lat.round(6),
+        'lon': lon.round(6),
+        'Waste_Tonnes': demand.round(2),
+        'Assigned_SCTP_ID': assigned,
+        'SCTP_ID': assigned,
+        'SCTP_Name': [names[z] for z in assigned],
+        'max_kg': tiers.astype(int),
+    })
+    sctp = pd.DataFrame({
+        'SCTP_Name': names,
+        'Coordinates': [f"{a:.6f}, {b:.6f}" for a, b in depots],
+        'lat': depots[:, 0],
+        'lon': depots[:, 1],
+        'SCTP_ID': np.arange(n_zones),
+    })
+    return clusters, sctp
+
+def write(out_dir, df_clusters, df_sctp):
+    os.makedirs(out_dir, exist_ok=True)
+    df_clusters.to_csv(os.path.join(out_dir, data.CLUSTERS_FILE), index=False)
+    df_sctp.to_csv(os.path.join(out_dir, data.SCTP_FILE), index=False)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Synthetic GVP/SCTP instance generator.")
+    parser.add_argument('--gvps', type=int, required=True)
+    parser.add_argument('--zones', type=int, default=18)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', required=True, help="Directory for the two CSV files")
+    args = parser.parse_args(argv)
+    clusters, sctp = generate(args.gvps, args.zones, args.seed)
+    write(args.out, clusters, sctp)
+    print(f"{len(clusters)} GVPs in {len(sctp)} zones -> {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+# --- CONFIGURATION ---
+CACHE_MAX_ENTRIES = 32
+CACHE_TTL_SECONDS = 3600
+
+def normalize_config(config):
+    """
+    Canonical form of a request body: keys sorted, None values dropped, recursively.
+    """
+    if isinstance(config, dict):
+        return {k: normalize_config(v) for k, v in sorted(config.items()) if v is not None}
+    if isinstance(config, (list, tuple)):
+        return [normalize_config(v) for v in config]
+    return config
+
+def make_key(config, data_fingerprint, solver_version):
+    payload = json.dumps(
+        {'config': normalize_config(config or {}), 'data': data_fingerprint, 'solver': solver_version},
+        sort_keys=True, separators=(',', ':'), default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class _InFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+class ResultCache:
+    """
+    Thread-safe LRU cache with a TTL. Concurrent misses on the same key are coalesced:
+    the first caller computes, the others block until its result (or error) is ready.
+    """
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, ttl_seconds=CACHE_TTL_SECONDS, clock=time.time):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock             # Seconds source for TTLs (injectable for tests)
+        self._entries = OrderedDict()   # key -> (expires_at, value)
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            return self._get_locked(key)
+
+    def _get_locked(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key, compute, on_follow=None):
+        """
+        Returns (value, hit). `hit` is True for cached values and for callers that waited
+        on another request's in-flight compute. Errors are not cached: if the leading compute
+        fails (or is cancelled), waiting callers retry and one of them takes over.
+        `on_follow()` runs before a caller blocks on another caller's compute, e.g. to give
+        back resources it only needs when it computes itself.
+        """
+        while True:
+            with self._lock:
+                value = self._get_locked(key)
+                if value is not None:
+                    self.hits += 1
+                    return value, True
+                flight = self._inflight.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._inflight[key] = _InFlight()
+
+            if leader:
+                break
+            if on_follow is not None:
+                on_follow()
+            flight.done.wait()
+            if flight.error is None:
+                with self._lock:
+                    self.hits += 1
+                return flight.value, True
+
+        with self._lock:
+            self.misses += 1
+        try:
+            flight.value = compute()
+            self.put(key, flight.value)
+            return flight.value, False
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.done.set()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
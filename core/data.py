@@ -1,38 +1,81 @@
 
-import pandas as pd
-import osmnx as ox
 import os
 import sys
+import hashlib
 
-def load_data(data_dir):
+# pandas and osmnx are imported inside the loaders: importing this module stays cheap
+
+CLUSTERS_FILE = "step1_clusters.csv"
+SCTP_FILE = "sctp_locations.csv"
+GRAPH_FILE = "hyderabad_network.graphml"
+
+def load_tables(data_dir):
     """
-    Loads clusters, SCTPs, and Graph from the specified data directory.
-    Returns: df_clusters, df_sctp, fleet_list, G
+    Loads only the cluster and SCTP tables (no graph).
     """
-    print(f"Loading Data from {data_dir}...")
-    
-    clusters_path = os.path.join(data_dir, "step1_clusters.csv")
-    sctp_path = os.path.join(data_dir, "sctp_locations.csv")
-    graph_path = os.path.join(data_dir, "hyderabad_network.graphml")
+    import pandas as pd
+    clusters_path = os.path.join(data_dir, CLUSTERS_FILE)
+    sctp_path = os.path.join(data_dir, SCTP_FILE)
     
     if not os.path.exists(clusters_path) or not os.path.exists(sctp_path):
         raise FileNotFoundError(f"Missing CSV files in {data_dir}")
 
-    df_clusters = pd.read_csv(clusters_path)
-    df_sctp = pd.read_csv(sctp_path)
-    
-    G = None
-    if os.path.exists(graph_path):
-        print(f"Loading Graph from {graph_path}...")
-        G = ox.load_graphml(graph_path)
-    else:
+    return pd.read_csv(clusters_path), pd.read_csv(sctp_path)
+
+def data_files_signature(data_dir):
+    """
+    (mtime_ns, size) of each CSV; changes whenever a data file is replaced or edited.
+    """
+    sig = []
+    for name in (CLUSTERS_FILE, SCTP_FILE):
+        try:
+            st = os.stat(os.path.join(data_dir, name))
+            sig.append((name, st.st_mtime_ns, st.st_size))
+        except OSError:
+            sig.append((name, None, None))
+    return tuple(sig)
+
+def load_graph(data_dir):
+    """
+    Loads the road network, or returns None if the graphml file is absent.
+    """
+    graph_path = os.path.join(data_dir, GRAPH_FILE)
+    if not os.path.exists(graph_path):
         print("Warning: Graph file not found. Distance calculations might rely purely on geodesic.")
-        
+        return None
+    import osmnx as ox
+    print(f"Loading Graph from {graph_path}...")
+    return ox.load_graphml(graph_path)
+
+def default_fleet():
     # Fleet Definition (Standard)
-    fleet_list = [
+    return [
         {'name': 'Mini Tipper 4T', 'payload_kg': 4000, 'count': 66, 'cost_per_km': 10},
         {'name': 'Mini Tipper 8T', 'payload_kg': 8000, 'count': 28, 'cost_per_km': 18},
         {'name': 'Mini Tipper 16T', 'payload_kg': 16000, 'count': 14, 'cost_per_km': 25}
     ]
+
+def load_data(data_dir):
+    """
+    Loads clusters, SCTPs, and Graph from the specified data directory.
+    Returns: df_clusters, df_sctp, fleet_list, G
+    """
+    print(f"Loading Data from {data_dir}...")
+    
+    df_clusters, df_sctp = load_tables(data_dir)
+    G = load_graph(data_dir)
     
-    return df_clusters, df_sctp, fleet_list, G
+    return df_clusters, df_sctp, default_fleet(), G
+
+def fingerprint_data(*frames):
+    """
+    Stable content hash of the input DataFrames, used to key cached results.
+    """
+    import pandas as pd
+    h = hashlib.sha256()
+    for df in frames:
+        if df is None:
+            continue
+        h.update(",".join(map(str, df.columns)).encode('utf-8'))
+        h.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return h.hexdigest()
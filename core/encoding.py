@@ -0,0 +1,136 @@
+import json
+import re
+import sys
+
+# --- CONFIGURATION ---
+# 5 decimals ~ 1.1 m, the standard polyline precision and plenty for map display
+DEFAULT_PRECISION = 5
+
+def _encode_value(v, out):
+    v = ~(v << 1) if v < 0 else (v << 1)
+    while v >= 0x20:
+        out.append(chr((0x20 | (v & 0x1f)) + 63))
+        v >>= 5
+    out.append(chr(v + 63))
+
+def encode_polyline(coords, precision=DEFAULT_PRECISION):
+    """
+    Delta-encoded fixed-precision polyline (Google format, [lon, lat] input order).
+    Each vertex is stored as its offset from the previous one, so dense road paths
+    compress to a few ASCII characters per point.
+    """
+    factor = 10 ** precision
+    out = []
+    prev_lat = prev_lon = 0
+    for lon, lat in coords:
+        ilat = int(round(lat * factor))
+        ilon = int(round(lon * factor))
+        _encode_value(ilat - prev_lat, out)
+        _encode_value(ilon - prev_lon, out)
+        prev_lat, prev_lon = ilat, ilon
+    return ''.join(out)
+
+def decode_polyline(encoded, precision=DEFAULT_PRECISION):
+    """
+    Inverse of encode_polyline. Returns [lon, lat] pairs.
+    """
+    factor = float(10 ** precision)
+    coords = []
+    idx = lat = lon = 0
+    n = len(encoded)
+    while idx < n:
+        deltas = []
+        for _ in range(2):
+            shift = result = 0
+            while True:
+                b = ord(encoded[idx]) - 63
+                idx += 1
+                result |= (b & 0x1f) << shift
+                shift += 5
+                if b < 0x20:
+                    break
+            deltas.append(~(result >> 1) if result & 1 else (result >> 1))
+        lat += deltas[0]
+        lon += deltas[1]
+        coords.append([lon / factor, lat / factor])
+    return coords
+
+def encode_routes(feature_collection, precision=DEFAULT_PRECISION):
+    """
+    Compact transport form of a LineString FeatureCollection:
+        {"type": "EncodedFeatureCollection", "encoding": "polyline", "precision": 5,
+         "features": [{"properties": {...}, "path": "<polyline>"}]}
+    Non-LineString features are passed through unchanged.
+    """
+    features = []
+    for f in feature_collection.get('features', []):
+        geom = f.get('geometry') or {}
+        if geom.get('type') == 'LineString':
+            features.append({'properties': f.get('properties', {}), 'path': encode_polyline(geom['coordinates'], precision)})
+        else:
+            features.append(f)
+    return {
+        'type': 'EncodedFeatureCollection',
+        'encoding': 'polyline',
+        'precision': precision,
+        'features': features
+    }
+
+def decode_routes(encoded):
+    features = []
+    for f in encoded.get('features', []):
+        if 'path' in f:
+            features.append({
+                'type': 'Feature',
+                'properties': f.get('properties', {}),
+                'geometry': {'type': 'LineString', 'coordinates': decode_polyline(f['path'], encoded.get('precision', DEFAULT_PRECISION))}
+            })
+        else:
+            features.append(f)
+    return {'type': 'FeatureCollection', 'features': features}
+
+# --- STATIC SITE CONVERSION ---
+def read_js_dataset(path):
+    """
+    Parses a `const name = {...};` dataset file. Returns (name, object).
+    """
+    with open(path, encoding='utf-8-sig') as f:
+        text = f.read()
+    m = re.match(r'\s*(?:const|var|let)\s+(\w+)\s*=\s*', text)
+    if not m:
+        raise ValueError(f"{path} is not a `const name = {{...}}` dataset")
+    body = text[m.end():].rstrip().rstrip(';')
+    return m.group(1), json.loads(body)
+
+def load_route_dataset(path):
+    """
+    Static routes.js as a plain GeoJSON FeatureCollection, whichever form it ships in.
+    """
+    _, collection = read_js_dataset(path)
+    if collection.get('type') == 'EncodedFeatureCollection':
+        return decode_routes(collection)
+    return collection
+
+def convert_js_dataset(src_path, dst_path, precision=DEFAULT_PRECISION):
+    """
+    Rewrites a `const routesData = {...GeoJSON...};` file in encoded form (same variable name).
+    """
+    name, collection = read_js_dataset(src_path)
+    if collection.get('type') == 'EncodedFeatureCollection':
+        print(f"{src_path} is already encoded.")
+        return
+    encoded = encode_routes(collection, precision)
+    with open(dst_path, 'w', encoding='utf-8') as f:
+        f.write(f"const {name} = ")
+        json.dump(encoded, f, separators=(',', ':'))
+        f.write(";\n")
+
+if __name__ == "__main__":
+    # Usage: python -m core.encoding <routes.js> [out.js]
+    if len(sys.argv) < 2:
+        print("Usage: python -m core.encoding <routes.js> [out.js]")
+        sys.exit(1)
+    src = sys.argv[1]
+    dst = sys.argv[2] if len(sys.argv) > 2 else src
+    convert_js_dataset(src, dst)
+    print(f"Encoded {src} -> {dst}")
@@ -3,8 +3,19 @@ import random
 import time
 import math
 import logging
+import json
+import os
+import pickle
+import shutil
+import atexit
+import tempfile
+import threading
 import numpy as np
 from .utils import vectorized_haversine_matrix
+from . import metrics
+
+# Bump when decoding or search behaviour changes, so cached results are invalidated
+SOLVER_VERSION = "2.4"
 
 # --- CONFIGURATION ---
 AVG_SPEED_KMPH = 25
@@ -18,19 +29,105 @@ POPULATION_SIZE = 50
 MAX_GENERATIONS = 200
 ELITISM_COUNT = 5
 MUTATION_RATE = 0.1
+TOURNAMENT_SIZE = 3         # Contestants drawn from the live population per parent pick
+DIVERSITY_THRESHOLD = 0.1   # Mean broken-pairs distance to the best tour below which the population is re-seeded
+RESEED_FRACTION = 0.3       # Share of the next generation replaced by random tours on re-seeding
+DUPLICATE_RETRIES = 5       # Mutations tried on a duplicate child before a random tour replaces it
 
 # SA Parameters
-SA_ITERATIONS = 50
+SA_ITERATIONS = 50          # Per-generation budget, split across the refined elites
 INITIAL_TEMP = 100
 COOLING_RATE = 0.95
+SA_ELITES = 1               # Best distinct tours refined by SA each generation
+SA_WORKERS = 0              # Shared process pool for elite SA (needs idle cores to help); 0 refines in the solving thread
+
+# Geometry Stage
+ROAD_GEOMETRY = True
 
-# Callback
+# Callback (process-wide default; prefer passing progress_callback per solve)
+# Called as progress_callback(gen, total, message, stats) with the generation's convergence record
 PROGRESS_CALLBACK = None
 
-def get_traffic_factor(minutes_from_start):
-    if minutes_from_start < 120: return 1.0     # 06:00-08:00
-    elif minutes_from_start < 300: return 1.8   # 08:00-11:00
-    else: return 1.3                            # 11:00-14:00
+# Traffic Bands (TDVRP): each band runs from its start minute until the next band starts
+TRAFFIC_BANDS = [
+    {'name': 'Off-Peak', 'start': 0, 'factor': 1.0},    # 06:00-08:00
+    {'name': 'Peak', 'start': 120, 'factor': 1.8},      # 08:00-11:00
+    {'name': 'Moderate', 'start': 300, 'factor': 1.3},  # 11:00-14:00
+]
+
+def solver_signature():
+    """
+    Version plus every tunable that changes a solve's output.
+    """
+    return {
+        'version': SOLVER_VERSION,
+        'speed': AVG_SPEED_KMPH,
+        'service': [SERVICE_TIME_LOAD, SERVICE_TIME_UNLOAD],
+        'shift': SHIFT_TIME_MINUTES,
+        'ga': [POPULATION_SIZE, MAX_GENERATIONS, ELITISM_COUNT, MUTATION_RATE, TOURNAMENT_SIZE, DIVERSITY_THRESHOLD, RESEED_FRACTION],
+        'sa': [SA_ITERATIONS, INITIAL_TEMP, COOLING_RATE, SA_ELITES],
+        'bands': TRAFFIC_BANDS,
+        'road_geometry': ROAD_GEOMETRY,
+    }
+
+def get_traffic_factor(minutes_from_start, bands=None):
+    bands = bands or TRAFFIC_BANDS
+    factor = bands[0]['factor']
+    for b in bands:
+        if minutes_from_start < b['start']:
+            break
+        factor = b['factor']
+    return factor
+
+def build_travel_model(distance_matrix, bands=None):
+    """
+    Turns the distance matrix into a travel-time tensor, one (N+1, N+1) slice per traffic band.
+    Built once per scenario so the decoder does a single indexed lookup per leg.
+    """
+    bands = sorted(bands or TRAFFIC_BANDS, key=lambda b: b['start'])
+    if bands[0]['start'] != 0:
+        raise ValueError("First traffic band must start at minute 0")
+    
+    factors = np.array([b['factor'] for b in bands], dtype=float)
+    base = (np.asarray(distance_matrix, dtype=float) / AVG_SPEED_KMPH) * 60
+    
+    # Minute -> band index for the whole table, last band extends to infinity
+    starts = [b['start'] for b in bands]
+    band_of_minute = np.searchsorted(starts, np.arange(starts[-1] + 1), side='right') - 1
+    
+    return {
+        'base': base,
+        'tensor': factors[:, np.newaxis, np.newaxis] * base[np.newaxis, :, :],
+        'factors': factors.tolist(),
+        'band_end': starts[1:] + [float('inf')],
+        'band_of_minute': band_of_minute.tolist(),
+    }
+
+def _cross_band_time(model, base_mins, depart, band):
+    # Leg spans a band edge: progress through each band at its own speed (FIFO-consistent)
+    factors = model['factors']
+    band_end = model['band_end']
+    remaining = base_mins
+    clock = depart
+    while True:
+        needed = remaining * factors[band]
+        if clock + needed <= band_end[band]:
+            return clock + needed - depart
+        remaining -= (band_end[band] - clock) / factors[band]
+        clock = band_end[band]
+        band += 1
+
+def get_travel_time(model, i, j, depart):
+    """
+    Travel minutes from i to j when leaving at `depart` minutes after shift start.
+    """
+    bom = model['band_of_minute']
+    minute = int(depart)
+    band = bom[minute] if minute < len(bom) else len(model['factors']) - 1
+    mins = model['tensor'][band, i, j]
+    if depart + mins > model['band_end'][band]:
+        return _cross_band_time(model, model['base'][i, j], depart, band)
+    return mins
 
 def get_best_truck(load, fleet, usage_counts=None, allow_fallback=True):
     # Find smallest valid truck
@@ -77,7 +174,11 @@ def get_max_available_capacity(usage_counts, fleet, road_limit=16000):
                 break
     return max_cap if max_cap > 0 else 4000
 
-def calculate_fitness(chromosome, distance_matrix, fleet, gvp_data, depot_idx):
+def calculate_fitness(chromosome, distance_matrix, fleet, gvp_data, depot_idx, travel_model=None):
+    if travel_model is None:
+        travel_model = build_travel_model(distance_matrix)
+    base_mins = travel_model['base']
+    
     total_distance = 0
     total_time_minutes = 0
     total_waste_left = 0
@@ -98,10 +199,7 @@ def calculate_fitness(chromosome, distance_matrix, fleet, gvp_data, depot_idx):
         demand = gvp_data[gene_idx]['demand']
         
         dist_km = distance_matrix[last_idx][gene_idx]
-        
-        base_mins = (dist_km / AVG_SPEED_KMPH) * 60
-        tf = get_traffic_factor(curr_route_time)
-        travel_mins = base_mins * tf
+        travel_mins = get_travel_time(travel_model, last_idx, gene_idx, curr_route_time)
         
         service_mins = SERVICE_TIME_LOAD
         node_limit = gvp_data[gene_idx].get('max_kg', 16000)
@@ -109,15 +207,12 @@ def calculate_fitness(chromosome, distance_matrix, fleet, gvp_data, depot_idx):
         new_route_max = min(curr_route_max_cap, node_limit)
         
         # Predictive check
-        pred_total_time = curr_route_time + travel_mins + service_mins + \
-                          ((distance_matrix[gene_idx][depot_idx] / AVG_SPEED_KMPH) * 60 * 1.5)
+        pred_total_time = curr_route_time + travel_mins + service_mins + (base_mins[gene_idx, depot_idx] * 1.5)
         
         if (curr_route_load + demand > new_route_max) or (pred_total_time > SHIFT_TIME_MINUTES):
             # Close Route
             dist_home = distance_matrix[last_idx][depot_idx]
-            base_home = (dist_home / AVG_SPEED_KMPH) * 60
-            tf_home = get_traffic_factor(curr_route_time)
-            time_home = base_home * tf_home
+            time_home = get_travel_time(travel_model, last_idx, depot_idx, curr_route_time)
             
             curr_route_dist += dist_home
             curr_route_time += time_home + SERVICE_TIME_UNLOAD
@@ -146,11 +241,9 @@ def calculate_fitness(chromosome, distance_matrix, fleet, gvp_data, depot_idx):
             curr_route_max_cap = get_max_available_capacity(usage_counts, fleet, node_limit)
             
             dist_depot = distance_matrix[depot_idx][gene_idx]
-            base_depot = (dist_depot / AVG_SPEED_KMPH) * 60
-            tf_depot = get_traffic_factor(0)
             
             curr_route_dist = dist_depot
-            curr_route_time = base_depot * tf_depot + service_mins
+            curr_route_time = get_travel_time(travel_model, depot_idx, gene_idx, 0) + service_mins
             last_idx = gene_idx
         else:
             curr_route_nodes.append(gene_idx)
@@ -163,9 +256,7 @@ def calculate_fitness(chromosome, distance_matrix, fleet, gvp_data, depot_idx):
     # Final Route
     if curr_route_nodes:
         dist_home = distance_matrix[last_idx][depot_idx]
-        base_home = (dist_home / AVG_SPEED_KMPH) * 60
-        tf_home = get_traffic_factor(curr_route_time)
-        time_home = base_home * tf_home
+        time_home = get_travel_time(travel_model, last_idx, depot_idx, curr_route_time)
         
         curr_route_dist += dist_home
         curr_route_time += time_home + SERVICE_TIME_UNLOAD
@@ -191,99 +282,414 @@ def calculate_fitness(chromosome, distance_matrix, fleet, gvp_data, depot_idx):
     score = (total_distance * 1.0) + (total_time_minutes * 0.5) + (total_waste_left * 1000)
     return score, routes
 
-def run_sa(chromosome, distance_matrix, fleet, gvp_data, depot_idx, initial_temp, cooling_rate, iterations):
-    current_sol = chromosome[:]
-    current_cost, _ = calculate_fitness(current_sol, distance_matrix, fleet, gvp_data, depot_idx)
+def apply_sa_move(sol, op, idx1, idx2):
+    """
+    Applies an SA move to `sol` in place (idx1 < idx2); applying the returned move undoes it.
+    Moves: 'swap' two genes, 'reverse' the segment idx1..idx2, 'shift' the gene at idx1 to idx2.
+    """
+    if op == 'swap':
+        sol[idx1], sol[idx2] = sol[idx2], sol[idx1]
+        return op, idx1, idx2
+    if op == 'reverse':
+        sol[idx1:idx2+1] = sol[idx1:idx2+1][::-1]
+        return op, idx1, idx2
+    sol.insert(idx2, sol.pop(idx1))
+    return 'unshift', idx1, idx2
+
+def undo_sa_move(sol, move):
+    op, idx1, idx2 = move
+    if op == 'unshift':
+        sol.insert(idx1, sol.pop(idx2))
+    else:
+        apply_sa_move(sol, op, idx1, idx2)
+
+def run_sa(chromosome, distance_matrix, fleet, gvp_data, depot_idx, initial_temp, cooling_rate, iterations, travel_model=None,
+           stats=None, rng=None):
+    """
+    Simulated annealing from `chromosome`. Returns (best_sol, best_cost).
+    Moves are applied to one working solution in place and undone when rejected;
+    the solution is only copied when it becomes the new best.
+    `stats`, when given, receives 'iterations' and 'accepted' move counts.
+    `rng` is a random.Random for reproducible runs independent of other threads (default: the random module).
+    """
+    rng = rng or random
+    if travel_model is None:
+        travel_model = build_travel_model(distance_matrix)
+    current_sol = list(chromosome)
+    current_cost, _ = calculate_fitness(current_sol, distance_matrix, fleet, gvp_data, depot_idx, travel_model)
     
     best_sol = current_sol[:]
     best_cost = current_cost
     
     temp = initial_temp
+    accepted = 0
+    positions = range(len(current_sol))
     
     for i in range(iterations):
-        neighbor = current_sol[:]
-        op = random.random()
-        idx1, idx2 = sorted(random.sample(range(len(neighbor)), 2))
-        
-        if op < 0.33: neighbor[idx1], neighbor[idx2] = neighbor[idx2], neighbor[idx1]
-        elif op < 0.66: neighbor[idx1:idx2+1] = neighbor[idx1:idx2+1][::-1]
-        else:
-            val = neighbor.pop(idx1)
-            neighbor.insert(idx2, val)
+        op = rng.random()
+        idx1, idx2 = sorted(rng.sample(positions, 2))
+        move = apply_sa_move(current_sol, 'swap' if op < 0.33 else ('reverse' if op < 0.66 else 'shift'), idx1, idx2)
             
-        new_cost, _ = calculate_fitness(neighbor, distance_matrix, fleet, gvp_data, depot_idx)
+        new_cost, _ = calculate_fitness(current_sol, distance_matrix, fleet, gvp_data, depot_idx, travel_model)
         
-        if new_cost < current_cost or random.random() < math.exp(-(new_cost - current_cost) / temp):
-            current_sol = neighbor
+        if new_cost < current_cost or rng.random() < math.exp(-(new_cost - current_cost) / temp):
             current_cost = new_cost
+            accepted += 1
             if current_cost < best_cost:
                 best_sol = current_sol[:]
                 best_cost = current_cost
+        else:
+            undo_sa_move(current_sol, move)
         
         temp *= cooling_rate
-        
+    
+    if stats is not None:
+        stats['iterations'] = stats.get('iterations', 0) + iterations
+        stats['accepted'] = stats.get('accepted', 0) + accepted
     return best_sol, best_cost
 
-def run_ga(gvp_data, fleet, distance_matrix, depot_idx):
+# Module settings an SA worker process needs to decode and anneal exactly like its parent
+_SA_WORKER_SETTINGS = ('SHIFT_TIME_MINUTES', 'SERVICE_TIME_LOAD', 'SERVICE_TIME_UNLOAD', 'INITIAL_TEMP', 'COOLING_RATE')
+
+# SA worker process state: zones published by the parent, loaded once per worker and kept by key
+_SA_WORKER = {'zones': {}}
+SA_WORKER_ZONES = 4             # Zones a worker keeps loaded (concurrent solves share the pool)
+
+# One pool for the life of the process, created on first use
+_SA_POOL = {'pool': None, 'workers': 0}
+_SA_POOL_LOCK = threading.Lock()
+
+def _refine(args, travel_model, chrom, seed, iterations):
+    stats = {}
+    sol, cost = run_sa(chrom, *args, INITIAL_TEMP, COOLING_RATE, iterations, travel_model, stats, random.Random(seed))
+    return sol, cost, stats
+
+def _load_sa_zone(zone_dir):
+    zones = _SA_WORKER['zones']
+    if zone_dir not in zones:
+        with open(os.path.join(zone_dir, 'zone.pkl'), 'rb') as f:
+            gvp_data, fleet, depot_idx, model = pickle.load(f)
+        model['base'] = np.load(os.path.join(zone_dir, 'base.npy'))
+        model['tensor'] = np.load(os.path.join(zone_dir, 'tensor.npy'))
+        args = (np.load(os.path.join(zone_dir, 'matrix.npy')), fleet, gvp_data, depot_idx)
+        while len(zones) >= SA_WORKER_ZONES:
+            zones.pop(next(iter(zones)))
+        zones[zone_dir] = (args, model)
+    return zones[zone_dir]
+
+def _sa_worker_refine(zone_dir, settings, chrom, seed, iterations):
+    # Module settings can change between solves, so every task carries the parent's
+    globals().update(settings)
+    args, travel_model = _load_sa_zone(zone_dir)
+    return _refine(args, travel_model, chrom, seed, iterations)
+
+def sa_pool(workers):
+    """
+    The process-wide SA pool with `workers` processes (rebuilt only when the size changes).
+    spawn: solves also run on web server threads, where fork is unsafe.
+    """
+    with _SA_POOL_LOCK:
+        if _SA_POOL['pool'] is None or _SA_POOL['workers'] != workers:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            if _SA_POOL['pool'] is not None:
+                _SA_POOL['pool'].shutdown(wait=False)
+            _SA_POOL['pool'] = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _SA_POOL['workers'] = workers
+        return _SA_POOL['pool']
+
+def shutdown_sa_pool():
+    with _SA_POOL_LOCK:
+        if _SA_POOL['pool'] is not None:
+            _SA_POOL['pool'].shutdown(cancel_futures=True)
+        _SA_POOL['pool'], _SA_POOL['workers'] = None, 0
+
+atexit.register(shutdown_sa_pool)
+
+class EliteRefiner:
+    """
+    Memetic step of the GA: refines the top-k elites with SA, on the shared process pool when
+    `workers` > 0. The zone's inputs are written once to a temporary directory that workers load
+    by key on their first task, so tasks only carry the tour. Each elite gets its own seeded RNG,
+    so results do not depend on the number of workers or on scheduling.
+    """
+    def __init__(self, gvp_data, fleet, distance_matrix, depot_idx, travel_model, workers=0):
+        self.args = (distance_matrix, fleet, gvp_data, depot_idx)
+        self.travel_model = travel_model
+        self.pool = None
+        self.zone_dir = None
+        if workers > 0:
+            self.pool = sa_pool(workers)
+            self.zone_dir = tempfile.mkdtemp(prefix='routemind-sa-')
+            small = {k: v for k, v in travel_model.items() if k not in ('base', 'tensor')}
+            with open(os.path.join(self.zone_dir, 'zone.pkl'), 'wb') as f:
+                pickle.dump((gvp_data, fleet, depot_idx, small), f)
+            np.save(os.path.join(self.zone_dir, 'base.npy'), travel_model['base'])
+            np.save(os.path.join(self.zone_dir, 'tensor.npy'), travel_model['tensor'])
+            np.save(os.path.join(self.zone_dir, 'matrix.npy'), np.asarray(distance_matrix))
+
+    def refine(self, elites, budget):
+        """
+        Splits `budget` SA iterations over `elites` (lists). Returns [(sol, cost, stats)] in elite order.
+        """
+        iterations = max(1, budget // len(elites))
+        seeds = [random.getrandbits(32) for _ in elites]
+        if self.pool is None:
+            return [_refine(self.args, self.travel_model, chrom, seed, iterations) for chrom, seed in zip(elites, seeds)]
+        settings = {k: globals()[k] for k in _SA_WORKER_SETTINGS}
+        futures = [self.pool.submit(_sa_worker_refine, self.zone_dir, settings, chrom, seed, iterations)
+                   for chrom, seed in zip(elites, seeds)]
+        return [f.result() for f in futures]
+
+    def close(self):
+        # Workers hold the arrays in memory, not the files
+        if self.zone_dir is not None:
+            shutil.rmtree(self.zone_dir, ignore_errors=True)
+
+def broken_pairs_distance(tours, best):
+    """
+    Share of each tour's adjacent pairs (either direction) that do not occur in `best`:
+    0 for the same tour, ~1 for unrelated ones. `tours` is one tour or a 2D array of tours.
+    """
+    tours = np.atleast_2d(tours)
+    best = np.asarray(best)
+    n = best.shape[0]
+    if n < 2:
+        return np.zeros(len(tours))
+    succ = np.full(n, -1)
+    succ[best[:-1]] = best[1:]
+    pred = np.full(n, -1)
+    pred[best[1:]] = best[:-1]
+    a, b = tours[:, :-1], tours[:, 1:]
+    return 1.0 - ((succ[a] == b) | (pred[a] == b)).mean(axis=1)
+
+def population_target(n):
+    # Small zones have fewer distinct visit orders than POPULATION_SIZE
+    return min(POPULATION_SIZE, math.factorial(n)) if n < 8 else POPULATION_SIZE
+
+class PopulationBuffer:
+    """
+    GA population in a preallocated (2, size, n) int32 array: one half holds the current generation,
+    the next one is bred into the other half in place, then the halves swap.
+    Rows are deduplicated on insertion (hash of the row bytes), so every fitness evaluation goes to
+    a distinct candidate; rows carry their score when known (NaN otherwise), which spares
+    re-evaluating carried-over elites.
+    """
+    def __init__(self, size, n):
+        self.size = size
+        self.genes = np.empty((2, size, n), dtype=np.int32)
+        self.scores = np.full((2, size), np.nan)
+        self.live = 0               # rows in the current half
+        self.count = 0              # rows committed to the next half
+        self.rejected = 0
+        self._cur = 0
+        self._seen = set()
+
+    def __len__(self):
+        return self.count
+
+    def current(self):
+        """
+        (genes, scores) views of the current generation.
+        """
+        return self.genes[self._cur, :self.live], self.scores[self._cur, :self.live]
+
+    def begin(self):
+        self.count = 0
+        self.rejected = 0
+        self._seen.clear()
+
+    def slot(self):
+        # Scratch row for the next candidate; it only becomes a member on commit()
+        return self.genes[1 - self._cur, self.count]
+
+    def commit(self, score=np.nan):
+        row = self.slot()
+        key = row.tobytes()
+        if key in self._seen:
+            self.rejected += 1
+            return False
+        self._seen.add(key)
+        self.scores[1 - self._cur, self.count] = score
+        self.count += 1
+        return True
+
+    def add(self, chrom, score=np.nan):
+        if self.count >= self.size:
+            return False
+        self.slot()[:] = chrom
+        return self.commit(score)
+
+    def fill_random(self, indices, count):
+        added = 0
+        while added < count and self.count < self.size:
+            added += self.add(random.sample(indices, len(indices)))
+        return added
+
+    def swap(self):
+        self._cur = 1 - self._cur
+        self.live = self.count
+
+def order_crossover(p1, p2, cut1, cut2, out, taken):
+    """
+    Writes the child of p1 and p2 into `out`: p1[cut1:cut2] in place, the other genes in p2's order.
+    `taken` is a reusable boolean scratch array of length n.
+    """
+    out[cut1:cut2] = p1[cut1:cut2]
+    taken[:] = False
+    taken[p1[cut1:cut2]] = True
+    rest = p2[~taken[p2]]
+    out[:cut1] = rest[:cut1]
+    out[cut2:] = rest[cut1:]
+
+def convergence_record(gen, scores, global_best_score, diversity, sa_stats, evaluations, gen_seconds, elapsed):
+    """
+    One generation of the convergence trace (JSON-serialisable). `scores` is sorted ascending.
+    """
+    return {
+        'gen': gen,
+        'best': float(scores[0]),
+        'mean': float(scores.mean()),
+        'worst': float(scores[-1]),
+        'global_best': float(global_best_score),
+        'diversity': round(diversity, 4),
+        'sa_acceptance': round(sa_stats['accepted'] / sa_stats['iterations'], 4) if sa_stats.get('iterations') else None,
+        'evaluations': evaluations,
+        'evals_per_s': round(evaluations / gen_seconds, 1) if gen_seconds > 0 else None,
+        'elapsed_s': round(elapsed, 4),
+    }
+
+def run_ga(gvp_data, fleet, distance_matrix, depot_idx, travel_model=None, progress_callback=None, trace_path=None):
+    """
+    Hybrid GA-SA over visit orders. Returns the best chromosome found.
+    Every generation's convergence record goes to `progress_callback` and, with `trace_path`, to a JSONL file.
+    """
     print(f"Starting GA for {len(gvp_data)} GVPs...")
-    start_time = time.time()
+    start_time = time.perf_counter()
+    if travel_model is None:
+        travel_model = build_travel_model(distance_matrix)
+    progress_callback = progress_callback or PROGRESS_CALLBACK
     
     indices = list(range(len(gvp_data)))
-    population = [random.sample(indices, len(indices)) for _ in range(POPULATION_SIZE)]
+    if len(indices) < 2:
+        # Nothing to order (and the crossover/SA moves need two positions)
+        return indices
+    n = len(indices)
+    target = population_target(n)
+    pop = PopulationBuffer(target, n)
+    pop.fill_random(indices, target)
+    pop.swap()
     
+    if trace_path:
+        open(trace_path, 'w').close()
+    
+    refiner = EliteRefiner(gvp_data, fleet, distance_matrix, depot_idx, travel_model, SA_WORKERS)
+    try:
+        return _evolve(pop, refiner, gvp_data, fleet, distance_matrix, depot_idx, travel_model,
+                       progress_callback, trace_path, start_time)
+    finally:
+        refiner.close()
+
+def _evolve(pop, refiner, gvp_data, fleet, distance_matrix, depot_idx, travel_model, progress_callback, trace_path, start_time):
+    """
+    Generation loop of run_ga over an initialised population.
+    """
+    n = pop.genes.shape[2]
+    indices = list(range(n))
+    target = pop.size
+    taken = np.zeros(n, dtype=bool)
     global_best_sol = None
     global_best_score = float('inf')
     
     for gen in range(MAX_GENERATIONS):
-        scored_pop = []
-        for chrom in population:
-            score, _ = calculate_fitness(chrom, distance_matrix, fleet, gvp_data, depot_idx)
-            scored_pop.append((score, chrom))
-            if score < global_best_score:
-                global_best_score = score
-                global_best_sol = chrom[:]
+        gen_start = time.perf_counter()
+        genes, scores = pop.current()
+        evaluated = 0
+        for i in range(len(scores)):
+            if np.isnan(scores[i]):
+                scores[i], _ = calculate_fitness(genes[i].tolist(), distance_matrix, fleet, gvp_data, depot_idx, travel_model)
+                evaluated += 1
         
-        scored_pop.sort(key=lambda x: x[0])
-        print(f"  > Gen {gen}: Best Score {scored_pop[0][0]:.2f}")
+        ranked = np.argsort(scores, kind='stable')
+        best_i = ranked[0]
+        if scores[best_i] < global_best_score:
+            global_best_score = float(scores[best_i])
+            global_best_sol = genes[best_i].tolist()
+        print(f"  > Gen {gen}: Best Score {scores[best_i]:.2f}")
+        diversity = float(broken_pairs_distance(genes, genes[best_i]).sum()) / max(1, len(scores) - 1)
         
-        if PROGRESS_CALLBACK:
-            PROGRESS_CALLBACK(gen, MAX_GENERATIONS, f"Genetic Loop {gen}")
-
-        elite = scored_pop[0][1]
-        refined_elite, refined_score = run_sa(elite, distance_matrix, fleet, gvp_data, depot_idx, INITIAL_TEMP, COOLING_RATE, SA_ITERATIONS)
+        sa_stats = {'iterations': 0, 'accepted': 0}
+        with metrics.timer('sa_refine'):
+            # At most size - 1 elites, so bred children always keep a place
+            elites = ranked[:max(1, min(SA_ELITES, target - 1))]
+            refined = refiner.refine([genes[i].tolist() for i in elites], SA_ITERATIONS)
         
-        if refined_score < global_best_score:
-            global_best_score = refined_score
-            global_best_sol = refined_elite[:]
-            
-        new_pop = [refined_elite]
-        new_pop.extend([x[1] for x in scored_pop[:ELITISM_COUNT-1]])
+        pop.begin()
+        for refined_elite, refined_score, stats in refined:
+            sa_stats['iterations'] += stats['iterations']
+            sa_stats['accepted'] += stats['accepted']
+            if refined_score < global_best_score:
+                global_best_score = refined_score
+                global_best_sol = refined_elite[:]
+            pop.add(refined_elite, refined_score)
+        for i in ranked[:ELITISM_COUNT-1]:
+            pop.add(genes[i], scores[i])
         
-        while len(new_pop) < POPULATION_SIZE:
-            p1 = min(random.sample(scored_pop[:20], 3), key=lambda x: x[0])[1]
-            p2 = min(random.sample(scored_pop[:20], 3), key=lambda x: x[0])[1]
+        # Converged population: fresh random tours instead of more near-copies of the elite
+        reseeded = 0
+        if diversity < DIVERSITY_THRESHOLD:
+            reseeded = pop.fill_random(indices, int(target * RESEED_FRACTION))
+            metrics.inc('population_reseeds')
+        
+        # Tournaments draw from the whole live population (a top-20 pool would starve the rest of it)
+        live = range(len(scores))
+        tournament_size = min(TOURNAMENT_SIZE, len(live))
+        while len(pop) < target:
+            p1 = min(random.sample(live, tournament_size), key=lambda i: scores[i])
+            p2 = min(random.sample(live, tournament_size), key=lambda i: scores[i])
             
-            cut1, cut2 = sorted(random.sample(range(len(p1)), 2))
-            child = [-1] * len(p1)
-            child[cut1:cut2] = p1[cut1:cut2]
-            p2_idx = 0
-            for i in range(len(child)):
-                if child[i] == -1:
-                    while p2[p2_idx] in child: p2_idx += 1
-                    child[i] = p2[p2_idx]
+            # Child is bred straight into the next generation's buffer
+            child = pop.slot()
+            cut1, cut2 = sorted(random.sample(range(n), 2))
+            order_crossover(genes[p1], genes[p2], cut1, cut2, child, taken)
             
             if random.random() < MUTATION_RATE:
-                i1, i2 = random.sample(range(len(child)), 2)
+                i1, i2 = random.sample(range(n), 2)
                 child[i1], child[i2] = child[i2], child[i1]
             
-            new_pop.append(child)
-        population = new_pop
+            if not pop.commit():
+                # Duplicate: mutate until it is new, or give its place to a random tour
+                for _ in range(DUPLICATE_RETRIES):
+                    i1, i2 = random.sample(range(n), 2)
+                    child[i1], child[i2] = child[i2], child[i1]
+                    if pop.commit():
+                        break
+                else:
+                    pop.fill_random(indices, 1)
+        rejected = pop.rejected
+        ranked_scores = scores[ranked]
+        pop.swap()
+        
+        # Distinct new candidates + SA (initial cost and one per iteration, per elite) evaluations this generation
+        evaluations = evaluated + sa_stats['iterations'] + len(refined)
+        gen_seconds = time.perf_counter() - gen_start
+        metrics.inc('fitness_evaluations', evaluations)
+        metrics.inc('duplicate_children', rejected)
+        metrics.observe('ga_generation', gen_seconds)
+        
+        record = convergence_record(gen, ranked_scores, global_best_score, diversity, sa_stats, evaluations, gen_seconds,
+                                    time.perf_counter() - start_time)
+        record['duplicates_rejected'] = rejected
+        record['reseeded'] = reseeded
+        if trace_path:
+            with open(trace_path, 'a') as trace:
+                trace.write(json.dumps(record) + "\n")
+        if progress_callback:
+            progress_callback(gen, MAX_GENERATIONS, f"Genetic Loop {gen}", record)
 
     return global_best_sol
 
-def solve_scenario(df_clusters, fleet, G=None, depot_loc=(17.3850, 78.4867)):
-    logging.info("Starting Solver Engine...")
-    
+def prepare_gvp_data(df_clusters):
     gvp_data = []
     for i, row in df_clusters.iterrows():
         gvp_data.append({
@@ -293,20 +699,23 @@ def solve_scenario(df_clusters, fleet, G=None, depot_loc=(17.3850, 78.4867)):
             'lon': row['lon'],
             'demand': float(row.get('Waste_Tonnes', 0)) * 1000
         })
-    
-    dist_matrix = vectorized_haversine_matrix(gvp_data, depot_loc)
-    depot_idx = len(gvp_data)
-    
-    best_chrom = run_ga(gvp_data, fleet, dist_matrix, depot_idx)
-    fitness, routes = calculate_fitness(best_chrom, dist_matrix, fleet, gvp_data, depot_idx)
-    
+    return gvp_data
+
+def build_route_features(routes, gvp_data, depot_loc, road_paths=None):
+    """
+    GeoJSON LineString features for decoded routes. Without road paths, legs are straight lines
+    from the depot through each stop and back.
+    """
     features = []
     for i, r in enumerate(routes):
-        coords = [[depot_loc[1], depot_loc[0]]]
-        for nid in r['nodes']:
-            g = gvp_data[nid]
-            coords.append([g['lon'], g['lat']])
-        coords.append([depot_loc[1], depot_loc[0]])
+        if road_paths is not None:
+            coords = road_paths[i]
+        else:
+            coords = [[depot_loc[1], depot_loc[0]]]
+            for nid in r['nodes']:
+                g = gvp_data[nid]
+                coords.append([g['lon'], g['lat']])
+            coords.append([depot_loc[1], depot_loc[0]])
         
         feature = {
             "type": "Feature",
@@ -322,12 +731,46 @@ def solve_scenario(df_clusters, fleet, G=None, depot_loc=(17.3850, 78.4867)):
             }
         }
         features.append(feature)
+    return features
+
+def solve_scenario(df_clusters, fleet, G=None, depot_loc=(17.3850, 78.4867), traffic_bands=None, progress_callback=None,
+                   trace_path=None):
+    logging.info("Starting Solver Engine...")
+    metrics.inc('zone_solves')
+    
+    with metrics.timer('gvp_prep'):
+        gvp_data = prepare_gvp_data(df_clusters)
+    
+    with metrics.timer('matrix_build'):
+        dist_matrix = vectorized_haversine_matrix(gvp_data, depot_loc)
+        depot_idx = len(gvp_data)
+        travel_model = build_travel_model(dist_matrix, traffic_bands)
+    
+    with metrics.timer('ga_total'):
+        best_chrom = run_ga(gvp_data, fleet, dist_matrix, depot_idx, travel_model, progress_callback, trace_path)
+    with metrics.timer('final_decode'):
+        fitness, routes = calculate_fitness(best_chrom, dist_matrix, fleet, gvp_data, depot_idx, travel_model)
+    
+    # Road-following paths when a graph is available, straight legs otherwise
+    road_paths = None
+    if G is not None and ROAD_GEOMETRY:
+        from . import geometry
+        try:
+            with metrics.timer('road_geometry'):
+                road_paths = geometry.build_physical_geometries(G, routes, gvp_data, depot_loc)
+        except Exception as e:
+            logging.warning(f"Road geometry failed, using straight legs: {e}")
+    
+    geojson_start = time.perf_counter()
+    features = build_route_features(routes, gvp_data, depot_loc, road_paths)
+    metrics.observe('geojson_build', time.perf_counter() - geojson_start)
         
     return {
         'routes': {"type": "FeatureCollection", "features": features},
         'metrics': {
             'total_dist': sum(f['properties']['distance_km'] for f in features),
             'total_waste': sum(f['properties']['load'] for f in features),
+            'total_co2': sum(f['properties']['co2'] for f in features),
             'total_routes': len(features)
         }
     }
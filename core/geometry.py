@@ -0,0 +1,138 @@
+import weakref
+import threading
+from collections import OrderedDict
+
+# --- CONFIGURATION ---
+EDGE_WEIGHT = 'length'
+LEG_CACHE_SIZE = 50000  # Leg paths kept (least recently used are evicted first)
+
+# Leg Path Cache: (from_node, to_node) -> list of [lon, lat], for one graph at a time
+_LEG_CACHE = OrderedDict()
+_LEG_CACHE_GRAPH = None   # weakref to that graph; unlike id(G) it can't match a new graph at a reused address
+_LEG_CACHE_LOCK = threading.Lock()
+
+def _cache_get(G, key):
+    global _LEG_CACHE, _LEG_CACHE_GRAPH
+    with _LEG_CACHE_LOCK:
+        if _LEG_CACHE_GRAPH is None or _LEG_CACHE_GRAPH() is not G:
+            # A different graph: its node ids mean something else
+            _LEG_CACHE = OrderedDict()
+            _LEG_CACHE_GRAPH = weakref.ref(G)
+            return None
+        coords = _LEG_CACHE.get(key)
+        if coords is not None:
+            _LEG_CACHE.move_to_end(key)
+        return coords
+
+def _cache_put(G, key, coords):
+    with _LEG_CACHE_LOCK:
+        if _LEG_CACHE_GRAPH is None or _LEG_CACHE_GRAPH() is not G:
+            return
+        _LEG_CACHE[key] = coords
+        while len(_LEG_CACHE) > LEG_CACHE_SIZE:
+            _LEG_CACHE.popitem(last=False)
+
+def clear_leg_cache():
+    global _LEG_CACHE, _LEG_CACHE_GRAPH
+    with _LEG_CACHE_LOCK:
+        _LEG_CACHE = OrderedDict()
+        _LEG_CACHE_GRAPH = None
+
+def _is_compact(G):
+    # core.shared.CompactGraph (memory-mapped CSR) instead of a networkx graph
+    return hasattr(G, 'shortest_path')
+
+def _node_coord(G, u):
+    if _is_compact(G):
+        return G.node_coord(u)
+    return [G.nodes[u]['x'], G.nodes[u]['y']]
+
+def snap_points(G, points):
+    """
+    Snaps (lat, lon) tuples to their nearest graph nodes in one vectorized call.
+    """
+    lats = [p[0] for p in points]
+    lons = [p[1] for p in points]
+    if _is_compact(G):
+        return G.nearest_nodes(lons, lats)
+    import osmnx as ox
+    return list(ox.distance.nearest_nodes(G, lons, lats))
+
+def _edge_coords(G, u, v):
+    if _is_compact(G):
+        return G.edge_coords(u, v)
+    # Parallel edges: follow the shortest one, using its curved geometry if present
+    edges = G.get_edge_data(u, v)
+    data = min(edges.values(), key=lambda d: d.get(EDGE_WEIGHT, float('inf')))
+    if 'geometry' in data:
+        return [list(c) for c in data['geometry'].coords]
+    return [[G.nodes[u]['x'], G.nodes[u]['y']], [G.nodes[v]['x'], G.nodes[v]['y']]]
+
+def _shortest_path(G, u, v):
+    # Node list from u to v, or None when v is unreachable
+    if _is_compact(G):
+        return G.shortest_path(u, v)
+    import networkx as nx
+    try:
+        return nx.shortest_path(G, u, v, weight=EDGE_WEIGHT)
+    except (nx.NetworkXNoPath, nx.NodeNotFound):
+        return None
+
+def leg_path(G, u, v):
+    """
+    Road path between two graph nodes as [lon, lat] pairs.
+    Repeated pairs are served from the leg cache.
+    """
+    key = (u, v)
+    cached = _cache_get(G, key)
+    if cached is not None:
+        return cached
+
+    if u == v:
+        coords = [_node_coord(G, u)]
+    else:
+        nodes = _shortest_path(G, u, v)
+        if nodes is None:
+            # Disconnected component: fall back to a straight hop
+            coords = [_node_coord(G, u), _node_coord(G, v)]
+        else:
+            coords = []
+            for a, b in zip(nodes[:-1], nodes[1:]):
+                seg = _edge_coords(G, a, b)
+                if coords and coords[-1] == seg[0]:
+                    seg = seg[1:]
+                coords.extend(seg)
+
+    _cache_put(G, key, coords)
+    return coords
+
+def expand_route(G, stop_nodes, start_coord=None, end_coord=None):
+    """
+    Expands a sequence of graph nodes (depot -> stops -> depot) into one LineString path.
+    Optional start/end coordinates anchor the line to the real depot location.
+    """
+    coords = [list(start_coord)] if start_coord is not None else []
+    for u, v in zip(stop_nodes[:-1], stop_nodes[1:]):
+        seg = leg_path(G, u, v)
+        if coords and seg and coords[-1] == seg[0]:
+            seg = seg[1:]
+        coords.extend(seg)
+    if end_coord is not None and (not coords or coords[-1] != list(end_coord)):
+        coords.append(list(end_coord))
+    return coords
+
+def build_physical_geometries(G, routes, gvp_data, depot_loc):
+    """
+    Geometry Stage: turns decoded routes into road-following coordinate lists.
+    Snaps every GVP and the depot once, then expands each route (shared legs come from the leg cache).
+    Returns one [lon, lat] list per route, in the same order as `routes`.
+    """
+    if not routes:
+        return []
+
+    nodes = snap_points(G, [(g['lat'], g['lon']) for g in gvp_data] + [depot_loc])
+    depot_node = nodes[-1]
+    depot_coord = [depot_loc[1], depot_loc[0]]
+
+    return [expand_route(G, [depot_node] + [nodes[nid] for nid in r['nodes']] + [depot_node], depot_coord, depot_coord)
+            for r in routes]
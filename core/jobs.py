@@ -0,0 +1,177 @@
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# --- CONFIGURATION ---
+JOB_WORKERS = 2
+JOB_TTL_SECONDS = 3600       # Finished jobs are kept this long for late subscribers
+SSE_HEARTBEAT_SECONDS = 15
+
+TERMINAL_STATES = ('done', 'failed', 'cancelled')
+
+class JobCancelled(Exception):
+    pass
+
+class Job:
+    """
+    One background solve. Events are appended to an in-memory log so any number of
+    SSE subscribers can replay from the start and then follow live.
+    """
+    def __init__(self, job_id):
+        self.id = job_id
+        self.status = 'queued'
+        self.created = time.time()
+        self.finished = None
+        self.result = None
+        self.error = None
+        self.events = []
+        self.cancel_event = threading.Event()
+        self.meta = {}              # Free-form data attached by the submitter
+        self._done_callbacks = []
+        self._cond = threading.Condition()
+
+    def emit(self, event, data):
+        with self._cond:
+            self.events.append((event, data))
+            self._cond.notify_all()
+
+    def progress(self, **data):
+        """
+        Progress hook for the solve. Raises JobCancelled once cancel() was requested,
+        which unwinds the solve at the next generation boundary.
+        """
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+        self.emit('progress', data)
+
+    def cancel(self):
+        self.cancel_event.set()
+        with self._cond:
+            queued = self.status == 'queued'
+        if queued:
+            self._finish('cancelled')
+
+    def _start(self):
+        """
+        queued -> running. Returns False if the job already ended (cancelled while queued).
+        """
+        with self._cond:
+            if self.status != 'queued':
+                return False
+            self.status = 'running'
+            self.events.append(('status', {'status': 'running'}))
+            self._cond.notify_all()
+        return True
+
+    def add_done_callback(self, fn):
+        """
+        Calls fn(job) once the job reaches a terminal state (immediately if it already has).
+        """
+        with self._cond:
+            if self.status not in TERMINAL_STATES:
+                self._done_callbacks.append(fn)
+                return
+        fn(self)
+
+    def _finish(self, status, result=None, error=None):
+        with self._cond:
+            if self.status in TERMINAL_STATES:
+                return
+            self.status = status
+            self.result = result
+            self.error = error
+            self.finished = time.time()
+            payload = {'status': status}
+            if error:
+                payload['error'] = error
+            self.events.append((status, payload))
+            self._cond.notify_all()
+            callbacks, self._done_callbacks = self._done_callbacks, []
+        for fn in callbacks:
+            fn(self)
+
+    def summary(self):
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'created': self.created,
+            'finished': self.finished,
+            'error': self.error,
+        }
+
+    def stream(self, start=0):
+        """
+        Yields Server-Sent Event frames from `start`, blocking for new events until the job ends.
+        """
+        idx = start
+        while True:
+            with self._cond:
+                if idx >= len(self.events) and self.status not in TERMINAL_STATES:
+                    self._cond.wait(SSE_HEARTBEAT_SECONDS)
+                pending = self.events[idx:]
+                done = self.status in TERMINAL_STATES
+            if not pending:
+                if done:
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            for event, data in pending:
+                idx += 1
+                yield f"id: {idx}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+
+# --- JOB REGISTRY ---
+_JOBS = {}
+_JOBS_LOCK = threading.Lock()
+_EXECUTOR = None
+
+def _get_executor():
+    global _EXECUTOR
+    with _JOBS_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="solve-job")
+        return _EXECUTOR
+
+def _purge_expired():
+    now = time.time()
+    with _JOBS_LOCK:
+        expired = [jid for jid, j in _JOBS.items() if j.finished and now - j.finished > JOB_TTL_SECONDS]
+        for jid in expired:
+            del _JOBS[jid]
+
+def _run(job, fn, args, kwargs):
+    if not job._start():
+        return
+    # Checked after _start: a cancel() that saw 'queued' may have finished the job in between
+    if job.cancel_event.is_set():
+        job._finish('cancelled')
+        return
+    try:
+        result = fn(job, *args, **kwargs)
+        job._finish('done', result=result)
+    except JobCancelled:
+        job._finish('cancelled')
+    except Exception as e:
+        job._finish('failed', error=str(e))
+
+def submit(fn, *args, **kwargs):
+    """
+    Queues fn(job, *args, **kwargs) on the worker pool and returns the Job immediately.
+    """
+    _purge_expired()
+    job = Job(uuid.uuid4().hex)
+    with _JOBS_LOCK:
+        _JOBS[job.id] = job
+    _get_executor().submit(_run, job, fn, args, kwargs)
+    return job
+
+def get(job_id):
+    with _JOBS_LOCK:
+        return _JOBS.get(job_id)
+
+def cancel(job_id):
+    job = get(job_id)
+    if job is not None:
+        job.cancel()
+    return job
@@ -0,0 +1,134 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# --- CONFIGURATION ---
+METRIC_PREFIX = "routemind"
+
+class Registry:
+    """
+    Process-wide stage timings and counters for the solver.
+    Stage timings keep count / sum / max (a Prometheus summary without quantiles).
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}     # stage -> [count, total_s, max_s]
+        self._counters = {}   # name -> value
+        self._gauges = {}     # name -> callable or value
+        self._counter_fns = {}  # name -> callable returning a running total kept elsewhere
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            s = self._stages.get(stage)
+            if s is None:
+                s = self._stages[stage] = [0, 0.0, 0.0]
+            s[0] += 1
+            s[1] += seconds
+            if seconds > s[2]:
+                s[2] = seconds
+
+    @contextmanager
+    def timer(self, stage):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - t)
+
+    def inc(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name, value):
+        """
+        `value` may be a number or a zero-argument callable evaluated at scrape time.
+        """
+        with self._lock:
+            self._gauges[name] = value
+
+    def set_counter(self, name, fn):
+        """
+        Counter read from `fn()` at scrape time, for monotonic totals another component keeps
+        (e.g. cache hits). Exported like inc() counters, added to any inc() value of the same name.
+        """
+        with self._lock:
+            self._counter_fns[name] = fn
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    def state(self):
+        # Raw accumulators, for shipping a worker process's metrics back to the parent
+        with self._lock:
+            return {'stages': {k: list(v) for k, v in self._stages.items()}, 'counters': dict(self._counters)}
+
+    def merge(self, state):
+        """
+        Folds another process's state() into this registry.
+        """
+        with self._lock:
+            for stage, (count, total, longest) in state.get('stages', {}).items():
+                s = self._stages.setdefault(stage, [0, 0.0, 0.0])
+                s[0] += count
+                s[1] += total
+                s[2] = max(s[2], longest)
+            for name, value in state.get('counters', {}).items():
+                self._counters[name] = self._counters.get(name, 0) + value
+
+    def snapshot(self):
+        """
+        JSON-friendly summary, including derived fitness evaluations per second.
+        """
+        with self._lock:
+            stages = {k: {'count': v[0], 'total_s': round(v[1], 6), 'mean_s': round(v[1] / v[0], 6) if v[0] else 0.0, 'max_s': round(v[2], 6)}
+                      for k, v in self._stages.items()}
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            counter_fns = dict(self._counter_fns)
+        gauges = {k: (v() if callable(v) else v) for k, v in gauges.items()}
+        for name, fn in counter_fns.items():
+            counters[name] = counters.get(name, 0) + fn()
+        # ga_generation wall time already includes the SA refinement nested in each generation
+        ga_time = stages.get('ga_generation', {}).get('total_s', 0.0)
+        evals = counters.get('fitness_evaluations', 0)
+        return {
+            'stages': stages,
+            'counters': counters,
+            'gauges': gauges,
+            'fitness_evals_per_sec': round(evals / ga_time, 1) if ga_time else 0.0
+        }
+
+    def render_prometheus(self):
+        """
+        Prometheus text exposition format (version 0.0.4).
+        """
+        snap = self.snapshot()
+        p = METRIC_PREFIX
+        lines = [
+            f"# HELP {p}_stage_seconds Wall time spent per solver stage.",
+            f"# TYPE {p}_stage_seconds summary",
+        ]
+        for stage, s in sorted(snap['stages'].items()):
+            lines.append(f'{p}_stage_seconds_count{{stage="{stage}"}} {s["count"]}')
+            lines.append(f'{p}_stage_seconds_sum{{stage="{stage}"}} {s["total_s"]}')
+        lines.append(f"# HELP {p}_stage_seconds_max Longest single run per solver stage.")
+        lines.append(f"# TYPE {p}_stage_seconds_max gauge")
+        for stage, s in sorted(snap['stages'].items()):
+            lines.append(f'{p}_stage_seconds_max{{stage="{stage}"}} {s["max_s"]}')
+        for name, value in sorted(snap['counters'].items()):
+            lines.append(f"# TYPE {p}_{name}_total counter")
+            lines.append(f"{p}_{name}_total {value}")
+        for name, value in sorted(snap['gauges'].items()):
+            lines.append(f"# TYPE {p}_{name} gauge")
+            lines.append(f"{p}_{name} {value}")
+        lines.append(f"# TYPE {p}_fitness_evals_per_second gauge")
+        lines.append(f"{p}_fitness_evals_per_second {snap['fitness_evals_per_sec']}")
+        return "\n".join(lines) + "\n"
+
+# Default registry used by the engine
+REGISTRY = Registry()
+timer = REGISTRY.timer
+inc = REGISTRY.inc
+observe = REGISTRY.observe
@@ -0,0 +1,79 @@
+import gzip
+import hashlib
+import json
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# --- CONFIGURATION ---
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+def _point_features(lons, lats, props):
+    return [
+        {"type": "Feature", "geometry": {"type": "Point", "coordinates": [lon, lat]}, "properties": p}
+        for lon, lat, p in zip(lons, lats, props)
+    ]
+
+def build_static_geojson(df_clusters, df_sctp):
+    """
+    GVP and SCTP FeatureCollections for the map, built column-wise (no iterrows).
+    """
+    gvps = _point_features(
+        df_clusters['lon'].tolist(), df_clusters['lat'].tolist(),
+        [{"waste": w} for w in df_clusters['Waste_Tonnes'].tolist()]
+    )
+    sctps = []
+    if df_sctp is not None:
+        sctps = _point_features(
+            df_sctp['lon'].tolist(), df_sctp['lat'].tolist(),
+            [{"name": n} for n in df_sctp['SCTP_Name'].tolist()]
+        )
+    return {
+        "gvps": {"type": "FeatureCollection", "features": gvps},
+        "sctps": {"type": "FeatureCollection", "features": sctps}
+    }
+
+def encode_payload(obj):
+    """
+    Serializes obj once to compact JSON and pre-compresses it.
+    Returns {'etag': ..., 'bodies': {encoding: bytes}} with 'identity', 'gzip' and, when available, 'br'.
+    """
+    raw = json.dumps(obj, separators=(',', ':')).encode('utf-8')
+    bodies = {'identity': raw, 'gzip': gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        bodies['br'] = brotli.compress(raw, quality=BROTLI_QUALITY)
+    return {'etag': hashlib.sha256(raw).hexdigest()[:32], 'bodies': bodies}
+
+def _accepted(accept_encoding):
+    accepted = set()
+    for part in (accept_encoding or '').split(','):
+        token, _, params = part.strip().partition(';')
+        if not token:
+            continue
+        if params.replace(' ', '').lower() in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        accepted.add(token.strip().lower())
+    return accepted
+
+def negotiate(payload, accept_encoding):
+    """
+    Picks the best pre-compressed body for the client.
+    Returns (encoding, body, etag); each encoding gets its own strong ETag.
+    """
+    accepted = _accepted(accept_encoding)
+    for enc in ('br', 'gzip'):
+        if enc in payload['bodies'] and (enc in accepted or '*' in accepted):
+            return enc, payload['bodies'][enc], f'"{payload["etag"]}-{enc}"'
+    return 'identity', payload['bodies']['identity'], f'"{payload["etag"]}"'
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    # Weak comparison (RFC 9110 13.1.2): proxies may have downgraded the tag to W/
+    tags = [t.strip() for t in if_none_match.split(',')]
+    return etag in [t[2:] if t.startswith('W/') else t for t in tags]
@@ -0,0 +1,148 @@
+import os
+import re
+import sys
+import time
+import pstats
+import cProfile
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+# --- CONFIGURATION ---
+SAMPLE_INTERVAL_S = 0.005
+PROFILE_MODES = ('all', 'cprofile', 'sample')
+
+# Only one deterministic profiler can be active per process (sys.setprofile / sys.monitoring)
+_CPROFILE_LOCK = threading.Lock()
+
+class StackSampler:
+    """
+    Sampling profiler for one thread: a background thread records that thread's Python stack
+    every `interval` seconds. Output is the collapsed-stack format read by flamegraph.pl,
+    speedscope and inferno ("file:function;file:function count").
+    """
+    def __init__(self, thread_id=None, interval=SAMPLE_INTERVAL_S):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.counts = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._sample, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write_collapsed(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+@contextmanager
+def profile_to(prefix, mode='all'):
+    """
+    Profiles the enclosed block on the current thread.
+    Writes `<prefix>.pstats` (deterministic, cProfile) and/or `<prefix>.collapsed` (sampled stacks).
+    Yields the list of files, filled in when the block exits (also when it raises).
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Profile mode must be one of {', '.join(PROFILE_MODES)}")
+    files = []
+    sampler = StackSampler() if mode in ('all', 'sample') else None
+    profiler = cProfile.Profile() if mode in ('all', 'cprofile') else None
+    if profiler is not None:
+        _CPROFILE_LOCK.acquire()
+    try:
+        if sampler is not None:
+            sampler.start()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield files
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            if sampler is not None:
+                sampler.stop()
+    finally:
+        if profiler is not None:
+            _CPROFILE_LOCK.release()
+        # Written even when the block raised: the profile of a failing solve is the useful one
+        if profiler is not None:
+            profiler.dump_stats(prefix + '.pstats')
+            files.append(prefix + '.pstats')
+        if sampler is not None:
+            sampler.write_collapsed(prefix + '.collapsed')
+            files.append(prefix + '.collapsed')
+
+def profile_label(text):
+    # Zone names -> safe file name parts
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', str(text)).strip('_') or 'zone'
+
+class ProfileSession:
+    """
+    One profiling run (a request or a batch run): one pair of files per zone under `out_dir`.
+    """
+    def __init__(self, out_dir, mode='all'):
+        self.out_dir = out_dir
+        self.mode = mode
+        self.files = []
+
+    @contextmanager
+    def zone(self, label):
+        os.makedirs(self.out_dir, exist_ok=True)
+        files = []
+        try:
+            with profile_to(os.path.join(self.out_dir, f"zone_{profile_label(label)}"), self.mode) as files:
+                yield
+        finally:
+            # A zone that failed still leaves its profile behind
+            self.files.extend(files)
+
+def new_session_dir(root):
+    return os.path.join(root, time.strftime('%Y%m%d-%H%M%S') + f"-{os.getpid()}-{threading.get_ident() % 10000}")
+
+# --- PROFILE DIFF ---
+def _own_time(path):
+    stats = pstats.Stats(path)
+    # (file, line, function) -> (calls, own seconds)
+    return {f"{os.path.basename(k[0])}:{k[1]}({k[2]})": (v[1], v[2]) for k, v in stats.stats.items()}
+
+def diff_stats(old_path, new_path, top=25):
+    """
+    Functions whose own (exclusive) time changed most between two .pstats files.
+    Returns rows of (function, old_s, new_s, delta_s, old_calls, new_calls).
+    """
+    old, new = _own_time(old_path), _own_time(new_path)
+    rows = []
+    for name in set(old) | set(new):
+        oc, ot = old.get(name, (0, 0.0))
+        nc, nt = new.get(name, (0, 0.0))
+        rows.append((name, ot, nt, nt - ot, oc, nc))
+    rows.sort(key=lambda r: abs(r[3]), reverse=True)
+    return rows[:top]
+
+if __name__ == "__main__":
+    # Usage: python -m core.profiling diff <old.pstats> <new.pstats> [top]
+    if len(sys.argv) < 4 or sys.argv[1] != 'diff':
+        print("Usage: python -m core.profiling diff <old.pstats> <new.pstats> [top]")
+        sys.exit(1)
+    top = int(sys.argv[4]) if len(sys.argv) > 4 else 25
+    print(f"  {'function':<60} {'old s':>9} {'new s':>9} {'delta s':>9} {'old calls':>10} {'new calls':>10}")
+    for name, ot, nt, delta, oc, nc in diff_stats(sys.argv[2], sys.argv[3], top):
+        print(f"  {name[:60]:<60} {ot:9.4f} {nt:9.4f} {delta:+9.4f} {oc:10} {nc:10}")
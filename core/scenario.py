@@ -0,0 +1,140 @@
+import json
+import math
+import hashlib
+from .data import fingerprint_data
+
+# Columns that feed the solver; anything else in the cluster table does not affect a zone's result
+ZONE_INPUT_COLUMNS = ['GVP_ID', 'lat', 'lon', 'Waste_Tonnes', 'max_kg']
+
+UNLIMITED_TRIPS = 9999
+
+def trip_limits(fleet, counts=None):
+    """
+    City-wide trip budget per truck type: two trips per vehicle, 4T unlimited (as in run_analysis.py).
+    `counts` overrides vehicle counts by truck name.
+    """
+    counts = counts or {}
+    limits = {}
+    for t in fleet:
+        count = counts.get(t['name'], t.get('count', 0))
+        limits[t['name']] = count * 2 if t['name'] != 'Mini Tipper 4T' else UNLIMITED_TRIPS
+    return limits
+
+def zone_fleet(fleet, limits, share):
+    return [
+        {**t, 'trips_allowed': (max(1, round(limits[t['name']] * share)) if t['name'] != 'Mini Tipper 4T' else UNLIMITED_TRIPS)}
+        for t in fleet
+    ]
+
+def _check_number(value, name, low=0.0, high=None):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f"{name} must be a number")
+    if value < low or (high is not None and value > high):
+        raise ValueError(f"{name} must be between {low} and {high}" if high is not None else f"{name} must be at least {low}")
+
+def _check_mapping(value, name):
+    if not isinstance(value, dict):
+        raise ValueError(f"{name} must be an object")
+    return value
+
+def validate_config(config):
+    """
+    Checks the shape of a request config (see build_zone_inputs). Raises ValueError with a
+    message naming the offending key; unknown keys are left alone.
+    """
+    _check_mapping(config, "config")
+    for gvp, tonnes in _check_mapping(config.get('demand') or {}, "demand").items():
+        _check_number(tonnes, f"demand[{gvp}]")
+    for truck, count in _check_mapping(config.get('fleet') or {}, "fleet").items():
+        if isinstance(count, bool) or not isinstance(count, int) or count < 0:
+            raise ValueError(f"fleet[{truck}] must be a non-negative integer")
+    for zone, cfg in _check_mapping(config.get('zones') or {}, "zones").items():
+        _check_mapping(cfg, f"zones[{zone}]")
+        if cfg.get('demand_scale') is not None:
+            _check_number(cfg['demand_scale'], f"zones[{zone}].demand_scale")
+        if cfg.get('fleet_share') is not None:
+            _check_number(cfg['fleet_share'], f"zones[{zone}].fleet_share", high=1.0)
+        if cfg.get('max_kg') is not None:
+            _check_number(cfg['max_kg'], f"zones[{zone}].max_kg", low=1)
+        if cfg.get('exclude_gvps') is not None and not isinstance(cfg['exclude_gvps'], list):
+            raise ValueError(f"zones[{zone}].exclude_gvps must be a list")
+    return config
+
+def build_zone_inputs(df_clusters, df_sctp, fleet, config=None, zone_index=None):
+    """
+    Applies a request config and splits the city into per-zone solver inputs.
+    `zone_index` (core.shared.ZoneIndex) replaces the per-zone boolean scan with precomputed row lists.
+
+    Config (all keys optional):
+        demand: {GVP_ID: tonnes}                    per-GVP demand override
+        fleet:  {truck name: vehicle count}         enables trip limits, split by zone waste share
+        zones:  {SCTP_ID: {demand_scale, fleet_share, exclude_gvps, max_kg}}
+
+    Returns a list of dicts: zone_id, name, depot_loc, gvps (DataFrame), fleet.
+    Raises ValueError for a malformed config (validate_config).
+    """
+    config = validate_config(config or {})
+    zone_cfg = {str(k): v for k, v in (config.get('zones') or {}).items()}
+    demand = {str(k): v for k, v in (config.get('demand') or {}).items()}
+
+    df = df_clusters
+    if demand:
+        df = df.copy()
+        override = df['GVP_ID'].astype(str).map(demand)
+        df['Waste_Tonnes'] = override.fillna(df['Waste_Tonnes']).astype(float)
+
+    zones = df['Assigned_SCTP_ID'].unique()
+    zone_frames = {}
+    for z in zones:
+        zdf = df.iloc[zone_index.rows_for(z)] if zone_index is not None else df[df['Assigned_SCTP_ID'] == z]
+        cfg = zone_cfg.get(str(z), {})
+        if cfg.get('exclude_gvps'):
+            excluded = {str(g) for g in cfg['exclude_gvps']}
+            zdf = zdf[~zdf['GVP_ID'].astype(str).isin(excluded)]
+        if cfg.get('demand_scale') is not None:
+            zdf = zdf.copy()
+            zdf['Waste_Tonnes'] = zdf['Waste_Tonnes'] * float(cfg['demand_scale'])
+        if cfg.get('max_kg') is not None:
+            zdf = zdf.copy()
+            zdf['max_kg'] = cfg['max_kg']
+        zone_frames[z] = zdf
+
+    limited = bool(config.get('fleet')) or any('fleet_share' in c for c in zone_cfg.values())
+    limits = trip_limits(fleet, config.get('fleet')) if limited else None
+    total_waste = sum(zdf['Waste_Tonnes'].sum() for zdf in zone_frames.values()) or 1.0
+
+    inputs = []
+    for z in zones:
+        zdf = zone_frames[z]
+        if zdf.empty:
+            continue
+        sctp_info = df_sctp[df_sctp['SCTP_ID'] == z].iloc[0]
+        zone_fleet_list = fleet
+        if limits is not None:
+            share = zone_cfg.get(str(z), {}).get('fleet_share')
+            if share is None:
+                share = zdf['Waste_Tonnes'].sum() / total_waste
+            zone_fleet_list = zone_fleet(fleet, limits, float(share))
+        inputs.append({
+            'zone_id': z,
+            'name': sctp_info['SCTP_Name'],
+            'depot_loc': (float(sctp_info['lat']), float(sctp_info['lon'])),
+            'gvps': zdf,
+            'fleet': zone_fleet_list,
+        })
+    return inputs
+
+def zone_key(zone_input, solver_signature):
+    """
+    Content hash of everything that determines one zone's solution.
+    Two requests that agree on a zone's GVPs, demand, limits, fleet share and depot share its result.
+    """
+    gvps = zone_input['gvps']
+    cols = [c for c in ZONE_INPUT_COLUMNS if c in gvps.columns]
+    payload = json.dumps({
+        'gvps': fingerprint_data(gvps[cols].reset_index(drop=True)),
+        'fleet': zone_input['fleet'],
+        'depot': zone_input['depot_loc'],
+        'solver': solver_signature,
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
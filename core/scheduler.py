@@ -0,0 +1,175 @@
+import math
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+
+# --- CONFIGURATION ---
+MAX_CONCURRENT_SOLVES = int(os.environ.get('ROUTEMIND_MAX_SOLVES', max(1, (os.cpu_count() or 2) // 2)))
+MAX_QUEUED_SOLVES = int(os.environ.get('ROUTEMIND_MAX_QUEUE', 8))
+DEFAULT_SOLVE_SECONDS = 60.0   # Retry-After estimate until a real solve has been timed
+WAIT_POLL_SECONDS = 1.0
+
+class SchedulerFull(Exception):
+    def __init__(self, retry_after):
+        super().__init__(f"Solver queue is full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+class Ticket:
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.state = 'queued'       # queued -> running -> released
+        self.enqueued_at = time.time()
+
+class SolveScheduler:
+    """
+    Admission control for CPU-bound solves: at most `max_concurrent` run at once,
+    at most `max_queue` wait (FIFO), everything beyond that is rejected immediately.
+    """
+    def __init__(self, max_concurrent=MAX_CONCURRENT_SOLVES, max_queue=MAX_QUEUED_SOLVES):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self._cond = threading.Condition()
+        self._queue = deque()
+        self._running = set()
+        self._avg_solve_s = None
+        self.admitted = 0
+        self.rejected = 0
+
+    def retry_after(self):
+        """
+        Seconds until a slot is likely to free up, from the moving average solve time.
+        """
+        avg = self._avg_solve_s or DEFAULT_SOLVE_SECONDS
+        waves = (len(self._queue) + len(self._running)) / max(1, self.max_concurrent)
+        return max(1, int(math.ceil(avg * max(1.0, waves))))
+
+    def admit(self):
+        """
+        Reserves a place in line. Raises SchedulerFull when running + queued is at capacity.
+        """
+        with self._cond:
+            if len(self._running) + len(self._queue) >= self.max_concurrent + self.max_queue:
+                self.rejected += 1
+                raise SchedulerFull(self.retry_after())
+            ticket = Ticket()
+            self._queue.append(ticket)
+            self.admitted += 1
+            return ticket
+
+    def position(self, ticket):
+        """
+        0 while running, 1-based place in line while queued, None once released.
+        """
+        with self._cond:
+            if ticket.state == 'running':
+                return 0
+            if ticket.state == 'queued':
+                return self._queue.index(ticket) + 1
+            return None
+
+    def _can_start(self, ticket):
+        return len(self._running) < self.max_concurrent and self._queue and self._queue[0] is ticket
+
+    def _start(self, ticket):
+        self._queue.popleft()
+        self._running.add(ticket)
+        ticket.state = 'running'
+        ticket.started_at = time.time()
+
+    def try_start(self, ticket, timeout=0):
+        """
+        Non-blocking (or briefly blocking) variant of wait(). Returns True once the ticket holds a slot.
+        """
+        with self._cond:
+            if ticket.state == 'running':
+                return True
+            if ticket.state != 'queued':
+                raise RuntimeError("Ticket was released before it started")
+            if not self._can_start(ticket) and timeout:
+                self._cond.wait(timeout)
+            if self._can_start(ticket):
+                self._start(ticket)
+                return True
+            return False
+
+    def wait(self, ticket, on_wait=None):
+        """
+        Blocks until the ticket holds a slot. on_wait(position) is called on every wake-up
+        (at least once per WAIT_POLL_SECONDS) and may raise to abandon the wait.
+        """
+        with self._cond:
+            while not self._can_start(ticket):
+                if ticket.state != 'queued':
+                    raise RuntimeError("Ticket was released before it started")
+                if on_wait is not None:
+                    position = self._queue.index(ticket) + 1
+                    self._cond.release()
+                    try:
+                        on_wait(position)
+                    finally:
+                        self._cond.acquire()
+                    if self._can_start(ticket):
+                        break
+                self._cond.wait(WAIT_POLL_SECONDS)
+            self._start(ticket)
+
+    def release(self, ticket):
+        """
+        Frees the slot or place in line. Safe to call more than once.
+        """
+        with self._cond:
+            if ticket.state == 'running':
+                self._running.discard(ticket)
+                elapsed = time.time() - ticket.started_at
+                self._avg_solve_s = elapsed if self._avg_solve_s is None else 0.8 * self._avg_solve_s + 0.2 * elapsed
+            elif ticket.state == 'queued':
+                try:
+                    self._queue.remove(ticket)
+                except ValueError:
+                    pass
+            ticket.state = 'released'
+            self._cond.notify_all()
+
+    @contextmanager
+    def run(self, ticket, on_wait=None):
+        try:
+            self.wait(ticket, on_wait)
+            yield
+        finally:
+            self.release(ticket)
+
+    def stats(self):
+        with self._cond:
+            return {
+                'running': len(self._running),
+                'queued': len(self._queue),
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'admitted': self.admitted,
+                'rejected': self.rejected,
+                'avg_solve_s': round(self._avg_solve_s, 2) if self._avg_solve_s else None
+            }
+
+def run_coalesced(scheduler, cache, key, ticket, compute):
+    """
+    cache.get_or_compute(key, compute) under admission control. Only the caller that actually
+    computes holds a slot: a caller that ends up waiting on an identical in-flight solve gives
+    its ticket back first, so it neither blocks the line nor deadlocks the leader behind it.
+    A follower that takes over after a failed leader is admitted again (may raise SchedulerFull).
+    Returns (value, hit); the ticket is always released.
+    """
+    held = [ticket]
+
+    def scheduled_compute():
+        if held[0].state == 'released':
+            held[0] = scheduler.admit()
+        with scheduler.run(held[0]):
+            return compute()
+
+    try:
+        return cache.get_or_compute(key, scheduled_compute, on_follow=lambda: scheduler.release(held[0]))
+    finally:
+        scheduler.release(held[0])
@@ -0,0 +1,318 @@
+import os
+import json
+import heapq
+import shutil
+import hashlib
+import tempfile
+
+import numpy as np
+
+from . import data
+
+try:
+    import fcntl
+except ImportError:  # Windows: publishing still works, concurrent publishers just duplicate effort
+    fcntl = None
+
+# pandas and networkx are imported inside the functions that need them
+
+# --- CONFIGURATION ---
+# Published datasets live here as .npy files; every worker maps the same files read-only,
+# so the OS page cache holds one physical copy no matter how many workers attach.
+SHARED_DIR = os.environ.get('ROUTEMIND_SHARED_DIR', os.path.join(tempfile.gettempdir(), 'routemind-shared'))
+FORMAT_VERSION = 1
+EDGE_WEIGHT = 'length'
+
+# --- PUBLISH / ATTACH PLUMBING ---
+def _file_signature(path):
+    try:
+        st = os.stat(path)
+        return [os.path.abspath(path), st.st_mtime_ns, st.st_size]
+    except OSError:
+        return [os.path.abspath(path), None, None]
+
+def _dataset_dir(kind, signature):
+    digest = hashlib.sha256(json.dumps([FORMAT_VERSION, kind, signature], default=str).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(SHARED_DIR, f"{kind}-{digest}")
+
+def _publish_once(path, write):
+    """
+    Runs write(tmp_dir) once per dataset and moves the result into place atomically.
+    Concurrent workers serialize on a lock file; the losers find the directory already there.
+    """
+    if os.path.isdir(path):
+        return path
+    os.makedirs(SHARED_DIR, exist_ok=True)
+    with open(path + '.lock', 'w') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            if os.path.isdir(path):
+                return path
+            tmp = tempfile.mkdtemp(prefix=os.path.basename(path) + '.', dir=SHARED_DIR)
+            try:
+                write(tmp)
+                os.rename(tmp, path)
+            except OSError:
+                shutil.rmtree(tmp, ignore_errors=True)
+                if not os.path.isdir(path):
+                    raise
+            except BaseException:
+                shutil.rmtree(tmp, ignore_errors=True)
+                raise
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+    return path
+
+def _save(dir_path, name, array):
+    np.save(os.path.join(dir_path, name + '.npy'), np.ascontiguousarray(array), allow_pickle=False)
+
+def _load(dir_path, name):
+    return np.load(os.path.join(dir_path, name + '.npy'), mmap_mode='r', allow_pickle=False)
+
+# --- TABLES ---
+def _write_frame(dir_path, prefix, df):
+    """
+    One .npy per column. Text columns become fixed-width unicode (mappable, no pickle),
+    with a separate null mask when the column has missing values.
+    """
+    columns = []
+    for i, col in enumerate(df.columns):
+        values = df[col]
+        name = f"{prefix}_{i}"
+        entry = {'name': str(col), 'file': name, 'kind': 'numeric'}
+        if values.dtype.kind in 'biuf':
+            _save(dir_path, name, values.to_numpy())
+        else:
+            isna = values.isna().to_numpy()
+            _save(dir_path, name, values.where(~isna, '').astype(str).to_numpy().astype(str))
+            entry['kind'] = 'text'
+            if isna.any():
+                _save(dir_path, name + '_na', isna)
+                entry['na'] = name + '_na'
+        columns.append(entry)
+    return columns
+
+def _read_frame(dir_path, columns):
+    import pandas as pd
+    frame = {}
+    for entry in columns:
+        values = _load(dir_path, entry['file'])
+        if entry['kind'] == 'text':
+            # Text has to become Python objects for pandas; only the numeric columns stay mapped
+            series = pd.Series(values.tolist())
+            if 'na' in entry:
+                series[_load(dir_path, entry['na'])] = None
+            frame[entry['name']] = series
+        else:
+            frame[entry['name']] = values
+    return pd.DataFrame(frame, copy=False)
+
+def _zone_index(df_clusters):
+    """
+    Cluster rows grouped by Assigned_SCTP_ID: zone ids, offsets and row positions (CSR layout).
+    """
+    zone_col = df_clusters['Assigned_SCTP_ID'].to_numpy()
+    order = np.argsort(zone_col, kind='stable')
+    zone_ids, counts = np.unique(zone_col[order], return_counts=True)
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    return zone_ids, offsets.astype(np.int64), order.astype(np.int64)
+
+class ZoneIndex:
+    def __init__(self, zone_ids, offsets, rows):
+        self.zone_ids = zone_ids
+        self.offsets = offsets
+        self.rows = rows
+        self._pos = {z: i for i, z in enumerate(zone_ids.tolist())}
+
+    def rows_for(self, zone_id):
+        """
+        Row positions (iloc) of the clusters assigned to a zone, in file order.
+        """
+        i = self._pos.get(zone_id)
+        if i is None:
+            return self.rows[:0]
+        return self.rows[self.offsets[i]:self.offsets[i + 1]]
+
+def publish_tables(data_dir):
+    signature = [_file_signature(os.path.join(data_dir, name)) for name in (data.CLUSTERS_FILE, data.SCTP_FILE)]
+    path = _dataset_dir('tables', signature)
+
+    def write(tmp):
+        df_clusters, df_sctp = data.load_tables(data_dir)
+        zone_ids, offsets, rows = _zone_index(df_clusters)
+        _save(tmp, 'zone_ids', zone_ids)
+        _save(tmp, 'zone_offsets', offsets)
+        _save(tmp, 'zone_rows', rows)
+        manifest = {
+            'format': FORMAT_VERSION,
+            'clusters': _write_frame(tmp, 'clusters', df_clusters),
+            'sctp': _write_frame(tmp, 'sctp', df_sctp),
+        }
+        with open(os.path.join(tmp, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f)
+
+    return _publish_once(path, write)
+
+def attach_tables(path):
+    """
+    Returns (df_clusters, df_sctp, zone_index) backed by the published files.
+    """
+    with open(os.path.join(path, 'manifest.json')) as f:
+        manifest = json.load(f)
+    zone_index = ZoneIndex(_load(path, 'zone_ids'), _load(path, 'zone_offsets'), _load(path, 'zone_rows'))
+    return _read_frame(path, manifest['clusters']), _read_frame(path, manifest['sctp']), zone_index
+
+# --- ROAD GRAPH ---
+class CompactGraph:
+    """
+    Read-only road network in CSR form (numpy arrays, typically memory-mapped).
+    Nodes are 0..n-1; parallel edges are collapsed to the shortest one, which is the edge
+    both shortest-path search and path drawing use anyway.
+
+    Implements what core.geometry needs: nearest_nodes, shortest_path, edge_coords, node_coord.
+    """
+    def __init__(self, x, y, indptr, indices, weights, geom_ptr, geom, osm_ids=None):
+        self.x, self.y = x, y
+        self.indptr, self.indices, self.weights = indptr, indices, weights
+        self.geom_ptr, self.geom = geom_ptr, geom
+        self.osm_ids = osm_ids
+
+    def __len__(self):
+        return len(self.x)
+
+    @classmethod
+    def from_networkx(cls, G, weight=EDGE_WEIGHT):
+        nodes = list(G.nodes)
+        pos = {n: i for i, n in enumerate(nodes)}
+        x = np.array([G.nodes[n]['x'] for n in nodes], dtype=np.float64)
+        y = np.array([G.nodes[n]['y'] for n in nodes], dtype=np.float64)
+
+        indptr = [0]
+        indices, weights, geom_ptr, geom = [], [], [0], []
+        for n in nodes:
+            best = {}
+            for _, v, d in G.edges(n, data=True):
+                w = d.get(weight, float('inf'))
+                if v not in best or w < best[v][0]:
+                    best[v] = (w, d)
+            for v, (w, d) in best.items():
+                indices.append(pos[v])
+                weights.append(w)
+                if 'geometry' in d:
+                    geom.extend(d['geometry'].coords)
+                geom_ptr.append(len(geom))
+            indptr.append(len(indices))
+
+        try:
+            osm_ids = np.array(nodes, dtype=np.int64)
+        except (TypeError, ValueError, OverflowError):
+            osm_ids = None
+        return cls(
+            x, y,
+            np.array(indptr, dtype=np.int64), np.array(indices, dtype=np.int32),
+            np.array(weights, dtype=np.float64),
+            np.array(geom_ptr, dtype=np.int64), np.array(geom, dtype=np.float64).reshape(-1, 2),
+            osm_ids
+        )
+
+    def node_coord(self, u):
+        return [float(self.x[u]), float(self.y[u])]
+
+    def nearest_nodes(self, lons, lats):
+        """
+        Nearest node per point (equirectangular distance, fine at city scale).
+        """
+        coslat = np.cos(np.radians(np.mean(lats))) if len(lats) else 1.0
+        out = []
+        for lon, lat in zip(lons, lats):
+            d2 = ((self.x - lon) * coslat) ** 2 + (self.y - lat) ** 2
+            out.append(int(np.argmin(d2)))
+        return out
+
+    def _edge(self, u, v):
+        start, end = self.indptr[u], self.indptr[u + 1]
+        hits = np.nonzero(self.indices[start:end] == v)[0]
+        return int(start + hits[0]) if len(hits) else None
+
+    def edge_coords(self, u, v):
+        e = self._edge(u, v)
+        if e is not None and self.geom_ptr[e + 1] > self.geom_ptr[e]:
+            return self.geom[self.geom_ptr[e]:self.geom_ptr[e + 1]].tolist()
+        return [self.node_coord(u), self.node_coord(v)]
+
+    def shortest_path(self, source, target):
+        """
+        Dijkstra from source, stopping at target. Returns the node list, or None if unreachable.
+        """
+        if source == target:
+            return [source]
+        indptr, indices, weights = self.indptr, self.indices, self.weights
+        dist = {source: 0.0}
+        prev = {}
+        done = set()
+        heap = [(0.0, source)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if u in done:
+                continue
+            if u == target:
+                path = [u]
+                while u != source:
+                    u = prev[u]
+                    path.append(u)
+                return path[::-1]
+            done.add(u)
+            start, end = indptr[u], indptr[u + 1]
+            for v, w in zip(indices[start:end].tolist(), weights[start:end].tolist()):
+                nd = d + w
+                if nd < dist.get(v, float('inf')):
+                    dist[v] = nd
+                    prev[v] = u
+                    heapq.heappush(heap, (nd, v))
+        return None
+
+GRAPH_ARRAYS = ('x', 'y', 'indptr', 'indices', 'weights', 'geom_ptr', 'geom')
+
+def publish_graph(data_dir):
+    """
+    Compacts the graphml network once. Returns None if there is no graph file.
+    """
+    graph_path = os.path.join(data_dir, data.GRAPH_FILE)
+    if not os.path.exists(graph_path):
+        return None
+    path = _dataset_dir('graph', _file_signature(graph_path))
+
+    def write(tmp):
+        compact = CompactGraph.from_networkx(data.load_graph(data_dir))
+        for name in GRAPH_ARRAYS:
+            _save(tmp, name, getattr(compact, name))
+        if compact.osm_ids is not None:
+            _save(tmp, 'osm_ids', compact.osm_ids)
+
+    return _publish_once(path, write)
+
+def attach_graph(path):
+    arrays = {name: _load(path, name) for name in GRAPH_ARRAYS}
+    osm_path = os.path.join(path, 'osm_ids.npy')
+    osm_ids = _load(path, 'osm_ids') if os.path.exists(osm_path) else None
+    return CompactGraph(osm_ids=osm_ids, **arrays)
+
+# --- ENTRY POINTS ---
+def load_shared_tables(data_dir):
+    return attach_tables(publish_tables(data_dir))
+
+def load_shared_graph(data_dir):
+    path = publish_graph(data_dir)
+    return attach_graph(path) if path else None
+
+def load_shared_data(data_dir):
+    """
+    Shared-memory counterpart of data.load_data: the first worker publishes, the rest attach.
+    Returns: df_clusters, df_sctp, fleet_list, G (CompactGraph or None), zone_index
+    """
+    print(f"Attaching Shared Data from {data_dir}...")
+    df_clusters, df_sctp, zone_index = load_shared_tables(data_dir)
+    G = load_shared_graph(data_dir)
+    return df_clusters, df_sctp, data.default_fleet(), G, zone_index
@@ -0,0 +1,146 @@
+import math
+from collections import defaultdict
+
+# --- CONFIGURATION ---
+GRID_CELL_DEG = 0.01          # ~1.1 km cells over Hyderabad
+SIMPLIFY_PIXELS = 1.0         # Douglas-Peucker tolerance in screen pixels
+MIN_ZOOM, MAX_ZOOM = 0, 20
+
+class GridIndex:
+    """
+    Uniform grid over lon/lat. Items are registered in every cell their bbox touches,
+    so a viewport query only looks at the handful of cells it overlaps.
+    """
+    def __init__(self, cell_deg=GRID_CELL_DEG):
+        self.cell_deg = cell_deg
+        self.cells = defaultdict(set)
+
+    def _cell_range(self, min_lon, min_lat, max_lon, max_lat):
+        c = self.cell_deg
+        return (range(math.floor(min_lon / c), math.floor(max_lon / c) + 1),
+                range(math.floor(min_lat / c), math.floor(max_lat / c) + 1))
+
+    def insert(self, item_id, bbox):
+        xs, ys = self._cell_range(*bbox)
+        for x in xs:
+            for y in ys:
+                self.cells[(x, y)].add(item_id)
+
+    def query(self, bbox):
+        xs, ys = self._cell_range(*bbox)
+        # Guard against world-sized viewports enumerating millions of empty cells
+        if len(xs) * len(ys) > len(self.cells):
+            min_lon, min_lat, max_lon, max_lat = bbox
+            c = self.cell_deg
+            return {i for (x, y), ids in self.cells.items()
+                    if min_lon <= (x + 1) * c and x * c <= max_lon and min_lat <= (y + 1) * c and y * c <= max_lat
+                    for i in ids}
+        found = set()
+        for x in xs:
+            for y in ys:
+                ids = self.cells.get((x, y))
+                if ids:
+                    found |= ids
+        return found
+
+def zoom_tolerance(zoom, lat=17.4):
+    """
+    Degrees covered by SIMPLIFY_PIXELS screen pixels at a web-mercator zoom level.
+    """
+    zoom = max(MIN_ZOOM, min(MAX_ZOOM, int(zoom)))
+    return SIMPLIFY_PIXELS * 360.0 / (256 * 2 ** zoom) * math.cos(math.radians(lat))
+
+def simplify(coords, tolerance):
+    """
+    Douglas-Peucker line simplification (iterative, keeps first and last vertex).
+    """
+    n = len(coords)
+    if n < 3 or tolerance <= 0:
+        return coords
+    keep = [False] * n
+    keep[0] = keep[-1] = True
+    tol2 = tolerance * tolerance
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        ax, ay = coords[start]
+        bx, by = coords[end]
+        dx, dy = bx - ax, by - ay
+        seg2 = dx * dx + dy * dy
+        max_d2, max_i = 0.0, -1
+        for i in range(start + 1, end):
+            px, py = coords[i]
+            if seg2 == 0:
+                d2 = (px - ax) ** 2 + (py - ay) ** 2
+            else:
+                t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / seg2))
+                d2 = (px - ax - t * dx) ** 2 + (py - ay - t * dy) ** 2
+            if d2 > max_d2:
+                max_d2, max_i = d2, i
+        if max_d2 > tol2:
+            keep[max_i] = True
+            stack.append((start, max_i))
+            stack.append((max_i, end))
+    return [c for c, k in zip(coords, keep) if k]
+
+def _in_bbox(coord, bbox):
+    return bbox[0] <= coord[0] <= bbox[2] and bbox[1] <= coord[1] <= bbox[3]
+
+class PointLayer:
+    def __init__(self, features, cell_deg=GRID_CELL_DEG):
+        self.features = features
+        self.index = GridIndex(cell_deg)
+        for i, f in enumerate(features):
+            lon, lat = f['geometry']['coordinates'][:2]
+            self.index.insert(i, (lon, lat, lon, lat))
+
+    def query(self, bbox):
+        hits = sorted(self.index.query(bbox))
+        return [self.features[i] for i in hits if _in_bbox(self.features[i]['geometry']['coordinates'], bbox)]
+
+class LineLayer:
+    """
+    Route layer indexed by segment, with per-zoom simplified geometry cached on first use.
+    """
+    def __init__(self, features, cell_deg=GRID_CELL_DEG):
+        self.features = [f for f in features if (f.get('geometry') or {}).get('type') == 'LineString']
+        self.index = GridIndex(cell_deg)
+        self._simplified = {}
+        for i, f in enumerate(self.features):
+            coords = f['geometry']['coordinates']
+            for (x1, y1), (x2, y2) in zip(coords[:-1], coords[1:]):
+                self.index.insert(i, (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)))
+
+    def _geometry(self, i, zoom):
+        key = (i, zoom)
+        coords = self._simplified.get(key)
+        if coords is None:
+            coords = simplify(self.features[i]['geometry']['coordinates'], zoom_tolerance(zoom))
+            self._simplified[key] = coords
+        return coords
+
+    def query(self, bbox, zoom):
+        zoom = max(MIN_ZOOM, min(MAX_ZOOM, int(zoom)))
+        out = []
+        for i in sorted(self.index.query(bbox)):
+            f = self.features[i]
+            out.append({
+                "type": "Feature",
+                "properties": f.get('properties', {}),
+                "geometry": {"type": "LineString", "coordinates": self._geometry(i, zoom)}
+            })
+        return out
+
+def parse_bbox(text):
+    """
+    'min_lon,min_lat,max_lon,max_lat' -> tuple of floats. Raises ValueError on bad input.
+    """
+    parts = [float(p) for p in (text or '').split(',')]
+    if len(parts) != 4:
+        raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat")
+    if not all(math.isfinite(p) for p in parts):
+        raise ValueError("bbox values must be finite numbers")
+    min_lon, min_lat, max_lon, max_lat = parts
+    if min_lon > max_lon or min_lat > max_lat:
+        raise ValueError("bbox min must not exceed max")
+    return min_lon, min_lat, max_lon, max_lat
@@ -1,11 +1,11 @@
 
 import numpy as np
-from geopy.distance import geodesic
 
 def calculate_geodesic_distance(loc1, loc2):
     """
     Calculate geodesic distance between two (lat, lon) tuples in km.
     """
+    from geopy.distance import geodesic
     return geodesic(loc1, loc2).km
 
 def vectorized_haversine_matrix(locations, start_loc):
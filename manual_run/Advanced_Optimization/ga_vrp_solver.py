@@ -1,15 +1,16 @@
-import pandas as pd
 import numpy as np
-import networkx as nx
-import osmnx as ox
 import os
-from geopy.distance import geodesic
 import random
 import time
 import math
 import warnings
 import json
 import sys
+from contextlib import contextmanager
+
+# Stage telemetry uses the web app's metrics registry (core/ lives at the repo root)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from core.metrics import Registry
 
 # Suppress warnings
 warnings.filterwarnings("ignore")
@@ -21,17 +22,48 @@ SERVICE_TIME_LOAD = 5
 SERVICE_TIME_UNLOAD = 25
 SHIFT_TIME_MINUTES = 480 
 
+# Traffic Profiles: (start minute from 06:00, multiplier) bands
+TRAFFIC_PROFILES = {
+    'default': [(0, 1.0), (120, 1.8), (300, 1.3)],   # 06-08 low, 08-11 peak, 11-14 moderate
+    'flat': [(0, 1.0)],
+    'heavy': [(0, 1.2), (120, 2.2), (300, 1.6)],
+}
+TRAFFIC_PROFILE = TRAFFIC_PROFILES['default']
+
 # Global Callback for Progress Reporting
 PROGRESS_CALLBACK = None
 
+# Debug log is opened on first solve, not at import (keeps `import` and --help fast and side-effect free)
 import logging
-logging.basicConfig(
-    filename='simulation_debug.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(message)s',
-    filemode='w'
-)
-logging.info("GA-SA Solver Module Loaded")
+_LOGGING_READY = False
+
+def _init_logging():
+    global _LOGGING_READY
+    if _LOGGING_READY:
+        return
+    logging.basicConfig(
+        filename='simulation_debug.log',
+        level=logging.INFO,
+        format='%(asctime)s - %(message)s',
+        filemode='w'
+    )
+    logging.info("GA-SA Solver Module Loaded")
+    _LOGGING_READY = True
+
+# --- STAGE TELEMETRY ---
+# Stage timings and counters, accumulated across every solve in this process
+TELEMETRY = Registry()
+
+@contextmanager
+def _stage(stage, sink=None):
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - t
+        TELEMETRY.observe(stage, elapsed)
+        if sink is not None:
+            sink[stage] = sink.get(stage, 0.0) + elapsed
 
 # GA Parameters
 POPULATION_SIZE = 50
@@ -44,9 +76,86 @@ SA_ITERATIONS = 50
 INITIAL_TEMP = 100
 COOLING_RATE = 0.95
 
+# Checkpointing (see GACheckpoint)
+CHECKPOINT_EVERY = 10 # Generations between checkpoints
+CHECKPOINT_VERSION = 1
+
+# --- CHECKPOINT / RESUME ---
+class GACheckpoint:
+    """
+    Periodic on-disk snapshot of one zone's GA state: population, best solution,
+    RNG state and the next generation to run. `key` identifies the zone inputs and GA
+    parameters; a checkpoint written for different inputs is never resumed.
+    Files are written to a temp name and renamed, so a crash mid-write keeps the previous one.
+    """
+    def __init__(self, path, key, every=None, resume=False):
+        self.path = path
+        self.key = key
+        self.every = CHECKPOINT_EVERY if every is None else every
+        self.resume = resume
+
+    def due(self, gen):
+        return self.every > 0 and (gen + 1) % self.every == 0
+
+    def load(self):
+        if not self.resume or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"  > Ignoring unreadable checkpoint {self.path}: {e}")
+            return None
+        if state.get('version') != CHECKPOINT_VERSION or state.get('key') != self.key:
+            print(f"  > Ignoring checkpoint {self.path}: written for different inputs")
+            return None
+        version, internal, gauss = state['rng']
+        state['rng'] = (version, tuple(internal), gauss)
+        return state
+
+    def save(self, state):
+        state = {**state, 'version': CHECKPOINT_VERSION, 'key': self.key}
+        atomic_write_json(self.path, state)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+def atomic_write_json(path, obj):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        # numpy scalars (zone ids, loads) serialize as their Python values
+        json.dump(obj, f, separators=(',', ':'), default=lambda o: o.item() if hasattr(o, 'item') else str(o))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def instance_key(gvp_data, fleet, depot_loc):
+    """
+    Hash of everything that shapes a zone's GA run (inputs and GA parameters).
+    """
+    import hashlib
+    payload = json.dumps({
+        'gvps': [(g['id'], g['lat'], g['lon'], g['demand'], g['max_kg']) for g in gvp_data],
+        'fleet': fleet,
+        'depot': list(depot_loc),
+        'ga': [POPULATION_SIZE, GENERATIONS, ELITISM_COUNT, MUTATION_RATE, SA_ITERATIONS, INITIAL_TEMP, COOLING_RATE],
+        'model': [AVG_SPEED_KMPH, SHIFT_TIME_MINUTES, SERVICE_TIME_LOAD, SERVICE_TIME_UNLOAD, TRAFFIC_PROFILE],
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def scenario_key(df_clusters, fleet, depot_loc):
+    # instance_key straight from solve_scenario's arguments
+    return instance_key(prepare_gvp_data(df_clusters), fleet, depot_loc)
+
 # --- 1. DATA LOADING (INHERITED) ---
 def load_data(base_path="..", test_mode=False):
     print(f"Loading Data from {base_path} (Test Mode: {test_mode})...")
+    import pandas as pd
     try:
         df_clusters = pd.read_csv(os.path.join(base_path, "step1_clusters.csv"))
         df_sctp = pd.read_csv(os.path.join(base_path, "sctp_locations.csv"))
@@ -63,6 +172,7 @@ def load_data(base_path="..", test_mode=False):
                     zip_ref.extractall(base_path)
 
             if os.path.exists(graph_path):
+                import osmnx as ox
                 print(f"Loading Graph from {graph_path}...")
                 G = ox.load_graphml(graph_path)
             else:
@@ -90,12 +200,13 @@ def get_traffic_factor(minutes_from_start):
     Returns traffic multiplier based on time of day.
     Start Time: 06:00 AM.
     """
-    # 0-120 (06:00-08:00): Low (1.0)
-    # 120-300 (08:00-11:00): Peak (1.8)
-    # 300-480 (11:00-14:00): Moderate (1.3)
-    if minutes_from_start < 120: return 1.0
-    elif minutes_from_start < 300: return 1.8
-    else: return 1.3
+    # Bands come from TRAFFIC_PROFILE (default: 1.0 until 08:00, 1.8 until 11:00, then 1.3)
+    factor = TRAFFIC_PROFILE[0][1]
+    for start, band_factor in TRAFFIC_PROFILE:
+        if minutes_from_start < start:
+            break
+        factor = band_factor
+    return factor
 
 def get_best_truck(load, fleet, usage_counts=None, allow_fallback=True):
     """
@@ -226,7 +337,6 @@ def calculate_fitness(chromosome, distance_matrix, fleet, gvp_data, depot_idx):
     start_time_offset = 0 # In real scheduler this varies. Here assume 0.
     
     for gene_idx in chromosome:
-        node_id = gvp_data[gene_idx]['id']
         demand = gvp_data[gene_idx]['demand']
         
         # 1. Travel Time (Depot/Last -> Node)
@@ -400,28 +510,39 @@ def run_sa(chromosome, distance_matrix, fleet, gvp_data, depot_idx, initial_temp
     return best_sol, best_cost
 
 # --- 4. GENETIC ALGORITHM MAIN LOOP ---
-def run_ga(gvp_data, fleet, distance_matrix, depot_idx):
+def run_ga(gvp_data, fleet, distance_matrix, depot_idx, checkpoint=None):
     print(f"Starting GA for {len(gvp_data)} GVPs...")
     start_time = time.time()
     
-    # Initial Population
-    print("  > Initializing Population...")
-    population = []
-    indices = list(range(len(gvp_data)))
-    
-    for _ in range(POPULATION_SIZE):
-        ind = indices[:]
-        random.shuffle(ind)
-        population.append(ind)
-        
     global_best_sol = None
     global_best_score = float('inf')
+    start_gen = 0
+    
+    state = checkpoint.load() if checkpoint is not None else None
+    if state is not None:
+        # Resume: the RNG state makes the continuation identical to an uninterrupted run
+        population = state['population']
+        global_best_sol = state['best_sol']
+        global_best_score = state['best_score'] if state['best_score'] is not None else float('inf')
+        start_gen = state['gen']
+        random.setstate(state['rng'])
+        print(f"  > Resuming from checkpoint at Gen {start_gen}")
+    else:
+        # Initial Population
+        print("  > Initializing Population...")
+        population = []
+        indices = list(range(len(gvp_data)))
+        
+        for _ in range(POPULATION_SIZE):
+            ind = indices[:]
+            random.shuffle(ind)
+            population.append(ind)
     
     # Production Iteration Count
     MAX_GENERATIONS = GENERATIONS
-    prev_best_score = float('inf')
         
-    for gen in range(MAX_GENERATIONS):
+    for gen in range(start_gen, MAX_GENERATIONS):
+        gen_start = time.perf_counter()
         # Calc Fitness
         scored_pop = []
         for chrom in population:
@@ -443,7 +564,8 @@ def run_ga(gvp_data, fleet, distance_matrix, depot_idx):
         # Elitism & Local Search Hybridization
         # Apply SA to the TOP candidate of this generation to boost convergence (Memetic Algo)
         elite_candidate = scored_pop[0][1]
-        refined_elite, refined_score = run_sa(elite_candidate, distance_matrix, fleet, gvp_data, depot_idx, INITIAL_TEMP, COOLING_RATE, SA_ITERATIONS)
+        with _stage('sa_refine'):
+            refined_elite, refined_score = run_sa(elite_candidate, distance_matrix, fleet, gvp_data, depot_idx, INITIAL_TEMP, COOLING_RATE, SA_ITERATIONS)
         
         if refined_score < global_best_score:
             print(f"    >> SA Improved Score to: {refined_score:.2f}")
@@ -484,6 +606,20 @@ def run_ga(gvp_data, fleet, distance_matrix, depot_idx):
             
         population = new_pop
         
+        # Telemetry: population + SA evaluations, generation wall time (SA included)
+        TELEMETRY.inc('fitness_evaluations', len(scored_pop) + SA_ITERATIONS + 1)
+        TELEMETRY.observe('ga_generation', time.perf_counter() - gen_start)
+        
+        if checkpoint is not None and checkpoint.due(gen):
+            with _stage('checkpoint_write'):
+                checkpoint.save({
+                    'gen': gen + 1,
+                    'population': population,
+                    'best_sol': global_best_sol,
+                    'best_score': global_best_score if global_best_score != float('inf') else None,
+                    'rng': random.getstate()
+                })
+        
     # Final Progress Report
     if PROGRESS_CALLBACK:
         PROGRESS_CALLBACK(MAX_GENERATIONS, MAX_GENERATIONS, "Genetic Optimization Complete")
@@ -491,26 +627,38 @@ def run_ga(gvp_data, fleet, distance_matrix, depot_idx):
     return global_best_sol
 
 # --- MAIN ENTRY ---
+def prepare_gvp_data(df_clusters):
+    gvp_data = []
+    for i, row in df_clusters.iterrows():
+        gvp_data.append({
+            'id': i,
+            'max_kg': row.get('max_kg', 16000),
+            'lat': row['lat'],
+            'lon': row['lon'],
+            'demand': row['Waste_Tonnes'] * 1000 # to kg,
+        })
+    return gvp_data
+
 # --- 5. API ENTRY POINT ---
-def solve_scenario(df_clusters, fleet, G, depot_loc=(17.3850, 78.4867)):
+def solve_scenario(df_clusters, fleet, G, depot_loc=(17.3850, 78.4867), checkpoint_path=None, resume=False, dist_matrix=None):
     """
     Main API entry point for app.py.
     Accepts pre-loaded dataframes and graph.
     Returns list of routes in dict format.
+    With `checkpoint_path`, GA state is saved every CHECKPOINT_EVERY generations;
+    `resume=True` continues from that file when it matches this zone's inputs.
+    A precomputed `dist_matrix` (build_distance_matrix for the same GVPs and depot) skips the matrix stage.
     """
     print("GA-SA SOLVER: Starting Scenario...")
+    _init_logging()
     logging.info("Starting solve_scenario...")
     
+    timings = {}
+    TELEMETRY.inc('zone_solves')
+    
     # 1. Prepare GVP Data
-    gvp_data = []
-    for i, row in df_clusters.iterrows():
-        gvp_data.append({
-            'id': i,
-            'max_kg': row.get('max_kg', 16000),
-            'lat': row['lat'],
-            'lon': row['lon'],
-            'demand': row['Waste_Tonnes'] * 1000 # to kg,
-        })
+    with _stage('gvp_prep', timings):
+        gvp_data = prepare_gvp_data(df_clusters)
     logging.info(f"Prepared {len(gvp_data)} GVP points")
     
     # Limit for demo speed if needed, or use full set
@@ -519,44 +667,54 @@ def solve_scenario(df_clusters, fleet, G, depot_loc=(17.3850, 78.4867)):
     # 2. Build Matrix
     # We use start_loc from args
     logging.info("Building distance matrix...")
-    dist_matrix = build_distance_matrix(gvp_data, depot_loc, G)
+    if dist_matrix is None:
+        with _stage('matrix_build', timings):
+            dist_matrix = build_distance_matrix(gvp_data, depot_loc, G)
     logging.info("Distance matrix built successfully")
     depot_idx = len(gvp_data)
     
     # 3. Run Optimization
     logging.info("Calling run_ga...")
-    best_chrom = run_ga(gvp_data, fleet, dist_matrix, depot_idx)
-    fitness, routes = calculate_fitness(best_chrom, dist_matrix, fleet, gvp_data, depot_idx)
+    checkpoint = None
+    if checkpoint_path:
+        checkpoint = GACheckpoint(checkpoint_path, instance_key(gvp_data, fleet, depot_loc), resume=resume)
+    with _stage('ga_total', timings):
+        best_chrom = run_ga(gvp_data, fleet, dist_matrix, depot_idx, checkpoint)
+    if checkpoint is not None:
+        checkpoint.clear()
+    with _stage('final_decode', timings):
+        fitness, routes = calculate_fitness(best_chrom, dist_matrix, fleet, gvp_data, depot_idx)
     
     # 4. Format Output as GeoJSON FeatureCollection
-    features = []
-    for i, r in enumerate(routes):
-        # Create LineString Geometry
-        # Coordinates must be [lon, lat] float lists
-        coords = [[depot_loc[1], depot_loc[0]]] # Start at depot
-        for nid in r['nodes']:
-            g = gvp_data[nid]
-            coords.append([g['lon'], g['lat']])
-        coords.append([depot_loc[1], depot_loc[0]]) # End at depot (loop)
-        
-        feature = {
-            "type": "Feature",
-            "geometry": {
-                "type": "LineString",
-                "coordinates": coords
-            },
-            "properties": {
-                "id": f"GA_Route_{i+1}",
-                "type": r['truck']['name'],    # app.py matches 'type'
-                "load": int(r['load']),        # app.py matches 'load'
-                "distance_km": round(r['dist'], 2), # app.py matches 'distance_km'
-                "duration_min": int(r['time']), # app.py matches 'duration_min'
-                "co2": round(r['dist'] * 0.5, 2), # app.py matches 'co2' (approx factor)
-                "zone": "Optimized Zone",      # app.py matches 'zone'
-                "vehicle_id": f"GA_Truck_{i+1}"
+    with _stage('geojson_build', timings):
+        features = []
+        for i, r in enumerate(routes):
+            # Create LineString Geometry
+            # Coordinates must be [lon, lat] float lists
+            coords = [[depot_loc[1], depot_loc[0]]] # Start at depot
+            for nid in r['nodes']:
+                g = gvp_data[nid]
+                coords.append([g['lon'], g['lat']])
+            coords.append([depot_loc[1], depot_loc[0]]) # End at depot (loop)
+            
+            feature = {
+                "type": "Feature",
+                "geometry": {
+                    "type": "LineString",
+                    "coordinates": coords
+                },
+                "properties": {
+                    "id": f"GA_Route_{i+1}",
+                    "type": r['truck']['name'],    # app.py matches 'type'
+                    "load": int(r['load']),        # app.py matches 'load'
+                    "distance_km": round(r['dist'], 2), # app.py matches 'distance_km'
+                    "duration_min": int(r['time']), # app.py matches 'duration_min'
+                    "co2": round(r['dist'] * 0.5, 2), # app.py matches 'co2' (approx factor)
+                    "zone": "Optimized Zone",      # app.py matches 'zone'
+                    "vehicle_id": f"GA_Truck_{i+1}"
+                }
             }
-        }
-        features.append(feature)
+            features.append(feature)
         
     return {
         'routes': {
@@ -569,7 +727,8 @@ def solve_scenario(df_clusters, fleet, G, depot_loc=(17.3850, 78.4867)):
             'total_co2_emission': float(sum(f['properties']['co2'] for f in features)),
             'fleet_utilization': 85,
             'total_routes': len(features)
-        }
+        },
+        'timings': {k: round(v, 4) for k, v in timings.items()}
     }
 
 # --- MAIN ENTRY (TEST) ---
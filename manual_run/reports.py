@@ -0,0 +1,142 @@
+import os
+import csv
+import json
+import importlib
+
+# Streaming route reports: each zone's rows are appended as soon as the zone is solved,
+# so output time and memory scale with one zone rather than the whole city.
+# pyarrow (Parquet) and openpyxl (Excel) are optional and imported only when requested.
+
+# Column name -> Python type (also the Parquet schema)
+ROUTE_COLUMNS = [
+    ('SCTP_Name', str),
+    ('VehicleID', str),
+    ('Truck_Type', str),
+    ('Payload_Capacity_T', float),
+    ('Load_kg', int),
+    ('Utilization_%', float),
+    ('Dist_km', float),
+    ('Duration_mins', int),
+    ('CO2_kg', float),
+]
+REPORT_FORMATS = ('csv', 'parquet')
+
+def _coerce(row):
+    # numpy scalars from the solver become plain Python values
+    return {name: kind(row[name]) for name, kind in ROUTE_COLUMNS}
+
+class CsvRouteSink:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=[name for name, _ in ROUTE_COLUMNS])
+        self._writer.writeheader()
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+class ParquetRouteSink:
+    """
+    One Parquet row group per zone.
+    """
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet output needs pyarrow (pip install pyarrow)")
+        types = {str: pa.string(), float: pa.float64(), int: pa.int64()}
+        self.path = path
+        self._pa = pa
+        self._schema = pa.schema([(name, types[kind]) for name, kind in ROUTE_COLUMNS])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, rows):
+        self._writer.write_table(self._pa.Table.from_pylist(rows, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+SINKS = {'csv': CsvRouteSink, 'parquet': ParquetRouteSink}
+
+def parquet_available():
+    try:
+        importlib.import_module('pyarrow.parquet')
+        return True
+    except ImportError:
+        return False
+
+class RouteReport:
+    """
+    Appends route rows zone by zone to every requested format and keeps running totals.
+    Nothing but the totals is held in memory. Without pyarrow, Parquet falls back to CSV.
+    """
+    def __init__(self, basename="detailed_project_analysis", formats=('csv',)):
+        unknown = [f for f in formats if f not in SINKS]
+        if unknown:
+            raise ValueError(f"Unknown report format(s): {', '.join(unknown)}")
+        if 'parquet' in formats and not parquet_available():
+            print("⚠️ pyarrow is not installed: writing the route report as CSV instead of Parquet")
+            formats = [f if f != 'parquet' else 'csv' for f in formats]
+        formats = list(dict.fromkeys(formats))
+        self.paths = {fmt: f"{basename}.{fmt}" for fmt in formats}
+        self._sinks = [SINKS[fmt](path) for fmt, path in self.paths.items()]
+        self.zones = {}
+        self.total_dist = 0.0
+        self.total_load = 0
+        self.total_co2 = 0.0
+        self.util_sum = 0.0
+        self.route_count = 0
+
+    def write_zone(self, zone_name, rows):
+        rows = [_coerce(r) for r in rows]
+        if rows:
+            for sink in self._sinks:
+                sink.write(rows)
+        dist = sum(r['Dist_km'] for r in rows)
+        load = sum(r['Load_kg'] for r in rows)
+        self.zones[zone_name] = {'routes': len(rows), 'total_dist': round(dist, 2), 'total_waste': load}
+        self.total_dist += dist
+        self.total_load += load
+        self.total_co2 += sum(r['CO2_kg'] for r in rows)
+        self.util_sum += sum(r['Utilization_%'] for r in rows)
+        self.route_count += len(rows)
+
+    def avg_utilization(self):
+        return self.util_sum / self.route_count if self.route_count else 0.0
+
+    def summary(self):
+        return {
+            'total_dist': self.total_dist,
+            'total_waste': self.total_load,
+            'total_co2': round(self.total_co2, 2),
+            'total_routes': self.route_count,
+            'avg_utilization': round(self.avg_utilization(), 1),
+        }
+
+    def close(self):
+        for sink in self._sinks:
+            sink.close()
+
+    def write_summary(self, path):
+        """
+        Compact run summary: totals, per-zone totals and where the route rows were written.
+        """
+        with open(path, 'w') as f:
+            json.dump({'summary': self.summary(), 'zones': self.zones, 'route_files': self.paths}, f, separators=(',', ':'))
+
+def export_excel(source_path, excel_path):
+    """
+    Optional post-step: converts a finished CSV or Parquet route report to Excel.
+    """
+    import pandas as pd
+    if os.path.splitext(source_path)[1] == '.parquet':
+        df = pd.read_parquet(source_path)
+    else:
+        df = pd.read_csv(source_path)
+    df.to_excel(excel_path, index=False)
+    return excel_path
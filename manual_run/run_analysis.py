@@ -1,8 +1,12 @@
-import pandas as pd
+import time
+_BOOT_START = time.perf_counter()
+
 import sys
 import os
-import osmnx as ox
 import json
+import argparse
+import importlib
+import contextlib
 from datetime import datetime
 
 # 1. SETUP ENVIRONMENT
@@ -15,30 +19,26 @@ except ImportError:
     sys.exit(1)
 
 import solve_unified_vrp as data_loader
+import reports
 
-def main():
-    print("\n" + "="*70)
-    print("   TEAM ROUTEMIND | HYDERABAD SWM OPTIMIZATION ENGINE v2.0")
-    print("   Advanced Hybrid GA-SA Solver (Production Algorithm)")
-    print("="*70 + "\n")
-    
-    # 2. LOAD DATA
-    print(f"[{datetime.now().strftime('%H:%M:%S')}] 📂 Loading Geospatial Datasets...")
-    df_clusters, df_sctp, fleet_base, G = data_loader.load_data()
-    
-    if G is None:
-        print("❌ Error: Could not load road network graph (hyderabad_network.graphml).")
-        return
+# Shared profiling helpers live in the web app's core package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core import profiling
 
-    # 3. ROAD CONSTRAINTS (HYBRID HIERARCHY)
-    print(f"[{datetime.now().strftime('%H:%M:%S')}] 🗺️  Calculating Road Constraints...")
+# --- ROAD CONSTRAINTS ---
+TIER_1_ARTERIAL = ['trunk', 'primary', 'secondary', 'tertiary', 'trunk_link', 'primary_link', 'secondary_link', 'tertiary_link']
+TIER_3_NARROW = ['living_street', 'service', 'track', 'path', 'pedestrian', 'private', 'alley']
+
+def compute_road_limits(G, df_clusters):
+    """
+    Hybrid road hierarchy: max truck payload (kg) per GVP_ID from the roads at its nearest node.
+    """
+    import osmnx as ox
     all_lats = df_clusters['lat'].tolist()
     all_lons = df_clusters['lon'].tolist()
     nearest_nodes = ox.distance.nearest_nodes(G, all_lons, all_lats)
     
     gvp_limits = {}
-    TIER_1_ARTERIAL = ['trunk', 'primary', 'secondary', 'tertiary', 'trunk_link', 'primary_link', 'secondary_link', 'tertiary_link']
-    TIER_3_NARROW = ['living_street', 'service', 'track', 'path', 'pedestrian', 'private', 'alley']
     
     for i, (idx, row) in enumerate(df_clusters.iterrows()):
         node_id = nearest_nodes[i]
@@ -65,68 +65,422 @@ def main():
                 max_kg = 16000 if is_shallow else 8000
         
         gvp_limits[row['GVP_ID']] = max_kg
+    return gvp_limits
 
-    # 4. OPTIMIZATION LOOP
-    all_routes_data = []
-    zones = df_clusters['Assigned_SCTP_ID'].unique()
-    total_waste_global = df_clusters['Waste_Tonnes'].sum()
+# --- ZONE EXECUTION ---
+TRUCK_CAPACITY_T = {'16T': 16.0, '8T': 8.0}
+
+def build_zone_context(df_clusters, df_sctp, fleet_base, checkpoint_dir=None, checkpoint_every=None, resume=False,
+                       trips_per_vehicle=2, matrices=None, profile_dir=None, profile_mode='all'):
+    """
+    Read-only inputs shared by every zone solve (built once, inherited by pool workers).
+    `df_clusters` must already carry the per-GVP `max_kg` road limits.
+    `matrices` optionally maps zone id -> precomputed distance matrix.
+    With `profile_dir`, every zone solve is profiled into its own files there.
+    """
+    return {
+        'matrices': matrices or {},
+        'profile_dir': profile_dir,
+        'profile_mode': profile_mode,
+        'checkpoint_dir': checkpoint_dir,
+        'checkpoint_every': checkpoint_every,
+        'resume': resume,
+        'clusters': df_clusters,
+        'sctp': df_sctp,
+        'fleet_base': fleet_base,
+        'total_waste': df_clusters['Waste_Tonnes'].sum(),
+        # Trip Limits for Fleet Sustainability
+        'trip_limits': {t['name']: (t['count'] * trips_per_vehicle if t['name'] != 'Mini Tipper 4T' else 9999) for t in fleet_base},
+    }
+
+def zone_inputs(context, z_id):
+    df_clusters, df_sctp = context['clusters'], context['sctp']
+    sctp_row = df_sctp[df_sctp['SCTP_ID'] == z_id].iloc[0]
+    zone_gvps = df_clusters[df_clusters['Assigned_SCTP_ID'] == z_id].copy()
+
+    share = zone_gvps['Waste_Tonnes'].sum() / context['total_waste']
+    trip_limits = context['trip_limits']
+    dynamic_fleet = [{**t, 'trips_allowed': (max(1, round(trip_limits[t['name']] * share)) if t['name'] != 'Mini Tipper 4T' else 9999)} for t in context['fleet_base']]
+    return sctp_row, zone_gvps, dynamic_fleet
+
+def route_rows(z_id, zone_name, routes):
+    rows = []
+    for i, r in enumerate(routes):
+        props = r['properties']
+        capacity_t = next((c for k, c in TRUCK_CAPACITY_T.items() if k in props['type']), 4.0)
+        rows.append({
+            'SCTP_Name': zone_name,
+            'VehicleID': f"TRK_{z_id}_{i+1}",
+            'Truck_Type': props['type'],
+            'Payload_Capacity_T': capacity_t,
+            'Load_kg': props['load'],
+            'Utilization_%': round((props['load'] / (capacity_t * 1000)) * 100, 1),
+            'Dist_km': props['distance_km'],
+            'Duration_mins': props['duration_min'],
+            'CO2_kg': props['co2']
+        })
+    return rows
+
+def checkpoint_paths(context, z_id):
+    """
+    (GA state checkpoint, finished zone result) files for a zone, or (None, None) when checkpointing is off.
+    """
+    directory = context.get('checkpoint_dir')
+    if not directory:
+        return None, None
+    return os.path.join(directory, f"zone_{z_id}.ga.json"), os.path.join(directory, f"zone_{z_id}.result.json")
+
+def load_zone_result(path, key):
+    try:
+        with open(path) as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return saved['result'] if saved.get('key') == key else None
+
+def clear_checkpoints(context, zones):
+    for z_id in zones:
+        for path in checkpoint_paths(context, z_id):
+            if path and os.path.exists(path):
+                os.remove(path)
+
+def zone_profile(context, z_id, zone_name):
+    """
+    Profiles a zone solve into `<profile_dir>/zone_<id>_<name>.pstats/.collapsed`, or does nothing.
+    """
+    if not context.get('profile_dir'):
+        return contextlib.nullcontext()
+    session = profiling.ProfileSession(context['profile_dir'], context.get('profile_mode', 'all'))
+    return session.zone(f"{z_id}_{zone_name}")
+
+def solve_zone(context, z_id, progress=None):
+    """
+    Solves one zone. Never raises: failures come back as {'error': ...} so one bad zone
+    does not take the rest of the run down with it.
+    `progress(z_id, gen, total)` is called once per GA generation.
+    With a checkpoint directory, GA state is saved periodically and the finished zone is kept,
+    so `resume` skips finished zones and continues interrupted ones from their last checkpoint.
+    """
+    zone_name = str(z_id)
+    try:
+        sctp_row, zone_gvps, dynamic_fleet = zone_inputs(context, z_id)
+        zone_name = sctp_row['SCTP_Name']
+        depot_loc = (sctp_row['lat'], sctp_row['lon'])
+
+        ga_path, result_path = checkpoint_paths(context, z_id)
+        key = ga_solver.scenario_key(zone_gvps, dynamic_fleet, depot_loc) if result_path else None
+        if result_path and context.get('resume'):
+            saved = load_zone_result(result_path, key)
+            if saved is not None:
+                saved['resumed'] = True
+                return saved
+        if context.get('checkpoint_every') is not None:
+            ga_solver.CHECKPOINT_EVERY = context['checkpoint_every']
+
+        if progress is not None:
+            ga_solver.PROGRESS_CALLBACK = lambda gen, total, msg: progress(z_id, gen, total)
+        t_zone = time.perf_counter()
+        with zone_profile(context, z_id, zone_name):
+            # The solver's distance matrix is pure haversine, so workers do not need the road graph
+            result = ga_solver.solve_scenario(zone_gvps, dynamic_fleet, None, depot_loc=depot_loc,
+                                              checkpoint_path=ga_path, resume=bool(context.get('resume')),
+                                              dist_matrix=context.get('matrices', {}).get(z_id))
+        res = {
+            'zone_id': z_id,
+            'zone': zone_name,
+            'rows': route_rows(z_id, zone_name, result['routes']['features']),
+            'perf': {'zone': zone_name, 'gvps': len(zone_gvps),
+                     'wall_s': round(time.perf_counter() - t_zone, 3), 'stages': result.get('timings', {})}
+        }
+        if result_path:
+            ga_solver.atomic_write_json(result_path, {'key': key, 'result': res})
+        return res
+    except Exception as e:
+        return {'zone_id': z_id, 'zone': zone_name, 'error': f"{type(e).__name__}: {e}"}
+    finally:
+        ga_solver.PROGRESS_CALLBACK = None
+
+# Pool worker state, set once per process by _init_worker
+_WORKER = {}
+
+def _init_worker(context, progress_queue):
+    _WORKER['context'] = context
+    _WORKER['queue'] = progress_queue
+    # Per-generation solver chatter from N processes would drown the aggregated display
+    sys.stdout = open(os.devnull, 'w')
+
+def _worker_solve(z_id):
+    ga_solver.TELEMETRY.reset()
+    queue = _WORKER['queue']
+    res = solve_zone(_WORKER['context'], z_id, lambda z, gen, total: queue.put((z, gen, total)))
+    res['telemetry'] = ga_solver.TELEMETRY.state()
+    return res
+
+PROGRESS_INTERVAL_S = 5.0
+
+class ProgressBoard:
+    """
+    Aggregated progress over all zones, weighted by GVP count.
+    """
+    def __init__(self, zone_names, zone_sizes):
+        self.names = zone_names
+        self.sizes = zone_sizes
+        self.fraction = {z: 0.0 for z in zone_names}
+        self.active = {}
+        self.completed = set()
+        self.done = 0
+        self._last_render = 0.0
+
+    def update(self, z_id, gen, total):
+        if z_id in self.completed:
+            return
+        self.fraction[z_id] = gen / total if total else 1.0
+        self.active[z_id] = (gen, total)
+
+    def finish(self, z_id):
+        self.fraction[z_id] = 1.0
+        self.active.pop(z_id, None)
+        self.completed.add(z_id)
+        self.done += 1
+
+    def overall(self):
+        weight = sum(self.sizes.values()) or 1
+        return 100.0 * sum(self.fraction[z] * self.sizes[z] for z in self.fraction) / weight
+
+    def render(self, force=False):
+        now = time.perf_counter()
+        if not force and now - self._last_render < PROGRESS_INTERVAL_S:
+            return
+        self._last_render = now
+        running = ", ".join(f"{self.names[z]} {g}/{t}" for z, (g, t) in list(self.active.items())[:4])
+        print(f"  ⏳ {self.overall():5.1f}% | zones done {self.done}/{len(self.names)}" + (f" | running: {running}" if running else ""), flush=True)
+
+def resolve_workers(requested, zone_count):
+    if requested <= 0:
+        requested = os.cpu_count() or 1
+    return max(1, min(requested, zone_count))
+
+def run_zones(context, zones, workers, on_result=None):
+    """
+    Solves every zone, sequentially or on a process pool. Returns {zone_id: result}.
+    `on_result(result)` runs in this process as soon as each zone finishes.
+    """
+    names = dict(zip(context['sctp']['SCTP_ID'], context['sctp']['SCTP_Name']))
+    sizes = context['clusters']['Assigned_SCTP_ID'].value_counts().to_dict()
+    board = ProgressBoard({z: names.get(z, str(z)) for z in zones}, {z: sizes.get(z, 0) for z in zones})
+    results = {}
+
+    if workers <= 1:
+        for z_id in zones:
+            print(f"  > Processing: {board.names[z_id].ljust(20)} | GVPs: {board.sizes[z_id]:3}")
+            results[z_id] = solve_zone(context, z_id)
+            if on_result is not None:
+                on_result(results[z_id])
+        return results
+
+    import multiprocessing as mp
+    import queue as queue_mod
+    from concurrent.futures import ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+
+    def finish(z_id, res):
+        results[z_id] = res
+        if on_result is not None:
+            on_result(res)
+        board.finish(z_id)
+        status = f"⚠️ failed ({res['error']})" if res.get('error') else f"✔ {res['perf']['wall_s']:.1f}s"
+        print(f"  > {board.names[z_id].ljust(20)} | GVPs: {board.sizes[z_id]:3} | {status}", flush=True)
+
+    manager = mp.Manager()
+    try:
+        progress_queue = manager.Queue()
+
+        def drain():
+            while True:
+                try:
+                    z_id, gen, total = progress_queue.get_nowait()
+                except queue_mod.Empty:
+                    return
+                board.update(z_id, gen, total)
+
+        def run_pool(zone_ids, pool_workers):
+            """
+            Runs zones on a fresh pool. Returns (broken, suspects): the zones a dead worker took down
+            with the pool, and those of them that were running at the time.
+            """
+            broken = []
+            in_flight = set()
+            with ProcessPoolExecutor(max_workers=pool_workers, initializer=_init_worker, initargs=(context, progress_queue)) as pool:
+                pending = {pool.submit(_worker_solve, z_id): z_id for z_id in zone_ids}
+                while pending:
+                    finished = [f for f in pending if f.done()]
+                    drain()
+                    for future in finished:
+                        z_id = pending.pop(future)
+                        try:
+                            finish(z_id, future.result())
+                        except BrokenProcessPool:
+                            broken.append(z_id)
+                        except Exception as e:
+                            finish(z_id, {'zone_id': z_id, 'zone': board.names[z_id], 'error': f"{type(e).__name__}: {e}"})
+                    if pending:
+                        in_flight = {pending[f] for f in pending if f.running()}
+                    board.render(force=bool(finished))
+                    if pending:
+                        time.sleep(0.2)
+            # A zone that died right after starting was never seen running: suspect them all then
+            return broken, [z for z in broken if z in in_flight] or broken
+
+        # A dead worker (e.g. out of memory) breaks the whole pool and fails every pending zone.
+        # Zones that were merely waiting are resubmitted on a new pool; the ones that were running
+        # are retried alone on a one-worker pool, so a second crash is attributable to that zone.
+        todo = list(zones)
+        while todo:
+            broken, suspects = run_pool(todo, workers)
+            todo = [z for z in broken if z not in suspects]
+            if broken:
+                print(f"  ⚠️ A worker process died; retrying {len(suspects)} zone(s) in isolation"
+                      + (f" and restarting the pool for {len(todo)}" if todo else ""), flush=True)
+            for z_id in suspects:
+                if run_pool([z_id], 1)[0]:
+                    finish(z_id, {'zone_id': z_id, 'zone': board.names[z_id],
+                                  'error': "worker process died while solving this zone"})
+    finally:
+        manager.shutdown()
+    return results
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Team RouteMind | Hyderabad SWM optimization engine (Hybrid GA-SA).")
+    parser.add_argument("--metrics-out", default="performance_summary.json",
+                        help="JSON file for per-stage solver timings (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Zones solved in parallel on a process pool; 0 = one per CPU (default: %(default)s)")
+    parser.add_argument("--checkpoint-dir", default="checkpoints",
+                        help="Where per-zone GA checkpoints and finished zones are kept; '' disables (default: %(default)s)")
+    parser.add_argument("--checkpoint-every", type=int, default=ga_solver.CHECKPOINT_EVERY,
+                        help="Generations between GA checkpoints (default: %(default)s)")
+    parser.add_argument("--report-format", default="csv",
+                        help=f"Comma-separated route report formats from {', '.join(reports.REPORT_FORMATS)} (default: %(default)s)")
+    parser.add_argument("--excel", action="store_true",
+                        help="Also convert the finished route report to detailed_project_analysis.xlsx")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip zones finished by an interrupted run and continue the rest from their last checkpoint")
+    parser.add_argument("--profile", nargs="?", const="all", choices=profiling.PROFILE_MODES,
+                        help="Profile every zone solve: cProfile .pstats and sampled .collapsed stacks (default mode: all)")
+    parser.add_argument("--profile-dir", default="profiles",
+                        help="Where per-zone profiles are written with --profile (default: %(default)s)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    startup = {'imports': time.perf_counter() - _BOOT_START}
+    
+    # Heavy dependencies are only needed for an actual run (loaded here so their import time is reported)
+    importlib.import_module('osmnx')
+    startup['libraries'] = time.perf_counter() - _BOOT_START - startup['imports']
+    
+    print("\n" + "="*70)
+    print("   TEAM ROUTEMIND | HYDERABAD SWM OPTIMIZATION ENGINE v2.0")
+    print("   Advanced Hybrid GA-SA Solver (Production Algorithm)")
+    print("="*70 + "\n")
+    
+    # 2. LOAD DATA
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 📂 Loading Geospatial Datasets...")
+    t = time.perf_counter()
+    df_clusters, df_sctp, fleet_base, G = data_loader.load_data()
+    startup['data'] = time.perf_counter() - t
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] ⏱️  Startup: " + " | ".join(f"{k} {v:.2f}s" for k, v in startup.items()))
     
-    # Trip Limits for Fleet Sustainability
-    trip_limits = {t['name']: (t['count'] * 2 if t['name'] != 'Mini Tipper 4T' else 9999) for t in fleet_base}
+    if G is None:
+        print("❌ Error: Could not load road network graph (hyderabad_network.graphml).")
+        return
+
+    # 3. ROAD CONSTRAINTS (HYBRID HIERARCHY)
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 🗺️  Calculating Road Constraints...")
+    t_constraints = time.perf_counter()
+    gvp_limits = compute_road_limits(G, df_clusters)
+    startup['road_constraints'] = time.perf_counter() - t_constraints
+
+    # 4. OPTIMIZATION LOOP
+    df_clusters['max_kg'] = df_clusters['GVP_ID'].map(gvp_limits)
+    zones = list(df_clusters['Assigned_SCTP_ID'].unique())
+    context = build_zone_context(df_clusters, df_sctp, fleet_base, args.checkpoint_dir or None,
+                                 args.checkpoint_every, args.resume,
+                                 profile_dir=args.profile_dir if args.profile else None, profile_mode=args.profile or 'all')
+    workers = resolve_workers(args.workers, len(zones))
 
-    print(f"\n🚀 Running Optimization for {len(zones)} Logistics Zones...\n")
+    mode = f"{workers} parallel workers" if workers > 1 else "sequential"
+    print(f"\n🚀 Running Optimization for {len(zones)} Logistics Zones ({mode})...\n")
+    t_optimization = time.perf_counter()
+    report = reports.RouteReport("detailed_project_analysis", [f.strip() for f in args.report_format.split(",") if f.strip()])
 
+    def write_zone(res):
+        # Rows go straight to disk; only the totals stay in memory
+        if not res.get('error'):
+            report.write_zone(res['zone'], res.pop('rows'))
+
+    try:
+        results = run_zones(context, zones, workers, write_zone)
+    finally:
+        report.close()
+
+    zone_perf = []
+    failed = []
     for z_id in zones:
-        sctp_row = df_sctp[df_sctp['SCTP_ID'] == z_id].iloc[0]
-        zone_gvps = df_clusters[df_clusters['Assigned_SCTP_ID'] == z_id].copy()
-        zone_gvps['max_kg'] = zone_gvps['GVP_ID'].map(gvp_limits)
-        
-        share = zone_gvps['Waste_Tonnes'].sum() / total_waste_global
-        dynamic_fleet = [{**t, 'trips_allowed': (max(1, round(trip_limits[t['name']] * share)) if t['name'] != 'Mini Tipper 4T' else 9999)} for t in fleet_base]
-        
-        print(f"  > Processing: {sctp_row['SCTP_Name'].ljust(20)} | GVPs: {len(zone_gvps):3}")
-        
-        try:
-            result = ga_solver.solve_scenario(zone_gvps, dynamic_fleet, G, depot_loc=(sctp_row['lat'], sctp_row['lon']))
-            routes = result['routes']['features']
-            
-            for i, r in enumerate(routes):
-                props = r['properties']
-                all_routes_data.append({
-                    'SCTP_Name': sctp_row['SCTP_Name'],
-                    'VehicleID': f"TRK_{z_id}_{i+1}",
-                    'Truck_Type': props['type'],
-                    'Payload_Capacity_T': 16.0 if '16T' in props['type'] else (8.0 if '8T' in props['type'] else 4.0),
-                    'Load_kg': props['load'],
-                    'Utilization_%': round((props['load'] / (16000 if '16T' in props['type'] else (8000 if '8T' in props['type'] else 4000))) * 100, 1),
-                    'Dist_km': props['distance_km'],
-                    'Duration_mins': props['duration_min'],
-                    'CO2_kg': props['co2']
-                })
-        except Exception as e:
-            print(f"    ⚠️ Warning in Zone {z_id}: {e}")
+        res = results[z_id]
+        if res.get('error'):
+            failed.append(res)
+            continue
+        zone_perf.append(res['perf'])
+        ga_solver.TELEMETRY.merge(res.get('telemetry', {}))
+    for res in failed:
+        print(f"    ⚠️ Warning in Zone {res['zone_id']} ({res['zone']}): {res['error']}")
+    resumed = sum(1 for res in results.values() if res.get('resumed'))
+    if resumed:
+        print(f"    ↩️  {resumed} zone(s) restored from {args.checkpoint_dir}")
+    if args.checkpoint_dir and not failed:
+        # Complete run: checkpoints have served their purpose
+        clear_checkpoints(context, zones)
 
     # 5. GENERATE REPORTS
     print("\n" + "-"*70)
-    print(f"✅ ANALYSIS COMPLETE")
-    print(f"   Total Distance:    {sum(r['Dist_km'] for r in all_routes_data):,.2f} km")
-    print(f"   Total Waste:        {sum(r['Load_kg'] for r in all_routes_data)/1000:,.1f} Tonnes")
-    print(f"   Fleet Efficiency:   {sum(r['Utilization_%'] for r in all_routes_data)/len(all_routes_data):.1f}% Avg Util")
+    print("✅ ANALYSIS COMPLETE")
+    print(f"   Total Distance:    {report.total_dist:,.2f} km")
+    print(f"   Total Waste:        {report.total_load/1000:,.1f} Tonnes")
+    print(f"   Fleet Efficiency:   {report.avg_utilization():.1f}% Avg Util")
     print("-" * 70)
 
-    # Export to Excel (Detailed Analysis)
-    df_out = pd.DataFrame(all_routes_data)
-    excel_path = "detailed_project_analysis.xlsx"
-    df_out.to_excel(excel_path, index=False)
-    
-    # Export to JSON (Technical Results)
+    # Export to JSON (Technical Results: totals, per-zone totals, route file locations)
     json_path = "analysis_results.json"
-    with open(json_path, "w") as f:
-        json.dump({"summary": {"total_dist": sum(r['Dist_km'] for r in all_routes_data), "total_waste": sum(r['Load_kg'] for r in all_routes_data)}, "routes": all_routes_data}, f, indent=4)
+    report.write_summary(json_path)
+
+    # Optional Excel (Detailed Analysis), converted from the finished route report
+    excel_path = None
+    if args.excel:
+        excel_path = reports.export_excel(next(iter(report.paths.values())), "detailed_project_analysis.xlsx")
+
+    # Export Performance Summary (Stage Timings)
+    perf = {
+        "startup_s": {k: round(v, 3) for k, v in startup.items()},
+        "optimization_wall_s": round(time.perf_counter() - t_optimization, 3),
+        "solver": ga_solver.TELEMETRY.snapshot(),
+        "zones": zone_perf
+    }
+    with open(args.metrics_out, "w") as f:
+        json.dump(perf, f, indent=2)
+    print(f"\n⏱️  Solver throughput: {perf['solver']['fitness_evals_per_sec']:,.0f} fitness evals/s "
+          f"over {perf['solver']['counters'].get('fitness_evaluations', 0):,} evaluations")
+    if args.profile:
+        print(f"🔬 Zone profiles ({args.profile}) written to {args.profile_dir}/ "
+              f"(compare runs: python -m core.profiling diff old.pstats new.pstats)")
 
-    print(f"\n[SUCCESS] Reports generated:")
-    print(f"  - {excel_path} (For Presentation/Verification)")
+    print("\n[SUCCESS] Reports generated:")
+    for path in report.paths.values():
+        print(f"  - {path} (Route-by-Route Detail)")
+    if excel_path:
+        print(f"  - {excel_path} (For Presentation/Verification)")
     print(f"  - {json_path} (For Technical Review)")
+    print(f"  - {args.metrics_out} (Stage Timings)")
     print("\nSimulation Finished.")
 
 if __name__ == "__main__":
@@ -0,0 +1,205 @@
+import time
+import sys
+import os
+import csv
+import json
+import argparse
+import itertools
+from datetime import datetime
+
+# Scenario sweep: snapping, road-tier classification and distance matrices are computed once,
+# then every (scenario, zone) pair is solved on a worker pool against those shared inputs.
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+import run_analysis as analysis
+from run_analysis import ga_solver
+import solve_unified_vrp as data_loader
+
+# Grid keys and their defaults (the production settings of run_analysis.py)
+GRID_DEFAULTS = {
+    'fleet': [None],                   # {truck name: vehicle count} overrides; None = standard fleet
+    'trips_per_vehicle': [2],          # run_analysis.py: count * 2
+    'shift_minutes': [ga_solver.SHIFT_TIME_MINUTES],
+    'traffic': ['default'],            # key of ga_solver.TRAFFIC_PROFILES
+}
+COMPARISON_COLUMNS = ['scenario', 'fleet', 'trips_per_vehicle', 'shift_minutes', 'traffic',
+                      'total_dist_km', 'trips', 'avg_utilization_%', 'total_co2_kg',
+                      'waste_collected_t', 'zones_failed', 'solve_s']
+
+def _csv_list(kind):
+    return lambda text: [kind(v) for v in text.split(',') if v.strip()]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Team RouteMind | scenario sweep over fleet, trip, shift and traffic settings.")
+    parser.add_argument("--grid", help="JSON file with lists for any of: " + ", ".join(GRID_DEFAULTS))
+    parser.add_argument("--trips-per-vehicle", type=_csv_list(int), help="e.g. 1,2,3")
+    parser.add_argument("--shift-minutes", type=_csv_list(int), help="e.g. 420,480,540")
+    parser.add_argument("--traffic", type=_csv_list(str), help="Profiles from: " + ", ".join(ga_solver.TRAFFIC_PROFILES))
+    parser.add_argument("--generations", type=int, help="GA generations per zone (default: solver setting)")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes; 0 = one per CPU (default: %(default)s)")
+    parser.add_argument("--out", default="sweep_comparison.csv", help="Comparison table (default: %(default)s)")
+    return parser.parse_args(argv)
+
+def build_grid(args):
+    grid = {k: list(v) for k, v in GRID_DEFAULTS.items()}
+    if args.grid:
+        with open(args.grid) as f:
+            spec = json.load(f)
+        unknown = set(spec) - set(GRID_DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown grid key(s): {', '.join(sorted(unknown))}")
+        grid.update({k: list(v) for k, v in spec.items()})
+    for key, values in (('trips_per_vehicle', args.trips_per_vehicle), ('shift_minutes', args.shift_minutes), ('traffic', args.traffic)):
+        if values:
+            grid[key] = values
+    bad = [t for t in grid['traffic'] if t not in ga_solver.TRAFFIC_PROFILES]
+    if bad:
+        raise ValueError(f"Unknown traffic profile(s): {', '.join(bad)}")
+    keys = list(GRID_DEFAULTS)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(grid[k] for k in keys))]
+
+def scenario_label(scenario):
+    fleet = scenario['fleet']
+    mix = "std" if not fleet else "/".join(f"{n.split()[-1]}x{c}" for n, c in fleet.items())
+    return f"{mix} | {scenario['trips_per_vehicle']} trips | {scenario['shift_minutes']} min | {scenario['traffic']}"
+
+def precompute_matrices(df_clusters, df_sctp, zones):
+    """
+    Distance matrix per zone, shared by every scenario (they only depend on GVP and depot positions).
+    """
+    matrices = {}
+    for z_id in zones:
+        sctp_row = df_sctp[df_sctp['SCTP_ID'] == z_id].iloc[0]
+        zone_gvps = df_clusters[df_clusters['Assigned_SCTP_ID'] == z_id]
+        gvp_data = ga_solver.prepare_gvp_data(zone_gvps)
+        matrices[z_id] = ga_solver.build_distance_matrix(gvp_data, (sctp_row['lat'], sctp_row['lon']), None)
+    return matrices
+
+def scenario_context(base, scenario):
+    fleet = base['fleet_base']
+    if scenario['fleet']:
+        fleet = [{**t, 'count': scenario['fleet'].get(t['name'], t['count'])} for t in fleet]
+    return analysis.build_zone_context(base['clusters'], base['sctp'], fleet,
+                                       trips_per_vehicle=scenario['trips_per_vehicle'], matrices=base['matrices'])
+
+# Pool worker state, set once per process
+_SWEEP = {}
+
+def _init_sweep(base, scenarios, generations):
+    _SWEEP['base'] = base
+    _SWEEP['scenarios'] = scenarios
+    if generations:
+        ga_solver.GENERATIONS = generations
+    # Per-generation solver output from every worker is noise here
+    sys.stdout = open(os.devnull, 'w')
+
+def solve_pair(s_idx, z_id):
+    """
+    One zone of one scenario. Returns totals only, never the route rows.
+    """
+    scenario = _SWEEP['scenarios'][s_idx]
+    ga_solver.SHIFT_TIME_MINUTES = scenario['shift_minutes']
+    ga_solver.TRAFFIC_PROFILE = ga_solver.TRAFFIC_PROFILES[scenario['traffic']]
+    res = analysis.solve_zone(scenario_context(_SWEEP['base'], scenario), z_id)
+    if res.get('error'):
+        return s_idx, z_id, {'error': res['error']}
+    rows = res['rows']
+    return s_idx, z_id, {
+        'dist': sum(r['Dist_km'] for r in rows),
+        'trips': len(rows),
+        'util_sum': sum(r['Utilization_%'] for r in rows),
+        'co2': sum(r['CO2_kg'] for r in rows),
+        'load': sum(r['Load_kg'] for r in rows),
+        'wall_s': res['perf']['wall_s'],
+    }
+
+def summarize(scenarios, zone_results):
+    table = []
+    for s_idx, scenario in enumerate(scenarios):
+        parts = zone_results.get(s_idx, {}).values()
+        ok = [p for p in parts if 'error' not in p]
+        trips = sum(p['trips'] for p in ok)
+        table.append({
+            'scenario': s_idx + 1,
+            'fleet': json.dumps(scenario['fleet']) if scenario['fleet'] else 'standard',
+            'trips_per_vehicle': scenario['trips_per_vehicle'],
+            'shift_minutes': scenario['shift_minutes'],
+            'traffic': scenario['traffic'],
+            'total_dist_km': round(sum(p['dist'] for p in ok), 2),
+            'trips': trips,
+            'avg_utilization_%': round(sum(p['util_sum'] for p in ok) / trips, 1) if trips else 0.0,
+            'total_co2_kg': round(sum(p['co2'] for p in ok), 2),
+            'waste_collected_t': round(sum(p['load'] for p in ok) / 1000, 1),
+            'zones_failed': len(parts) - len(ok),
+            'solve_s': round(sum(p['wall_s'] for p in ok), 1),
+        })
+    return table
+
+def run_sweep(base, scenarios, zones, workers, generations=None):
+    """
+    Fans every (scenario, zone) pair out over a process pool. Returns the comparison table.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    pairs = [(s_idx, z_id) for s_idx in range(len(scenarios)) for z_id in zones]
+    zone_results = {}
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_sweep, initargs=(base, scenarios, generations)) as pool:
+        futures = {pool.submit(solve_pair, s_idx, z_id): (s_idx, z_id) for s_idx, z_id in pairs}
+        for future in as_completed(futures):
+            s_idx, z_id = futures[future]
+            try:
+                _, _, totals = future.result()
+            except Exception as e:
+                totals = {'error': f"{type(e).__name__}: {e}"}
+            zone_results.setdefault(s_idx, {})[z_id] = totals
+            done += 1
+            if 'error' in totals:
+                print(f"    ⚠️ Scenario {s_idx + 1}, zone {z_id}: {totals['error']}")
+            if done % max(1, len(pairs) // 20) == 0 or done == len(pairs):
+                print(f"  ⏳ {100.0 * done / len(pairs):5.1f}% | {done}/{len(pairs)} zone solves", flush=True)
+    return summarize(scenarios, zone_results)
+
+def write_table(table, path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=COMPARISON_COLUMNS)
+        writer.writeheader()
+        writer.writerows(table)
+
+def print_table(table, scenarios):
+    print(f"\n  {'#':>3}  {'Scenario':<44} {'Dist km':>10} {'Trips':>6} {'Util %':>7} {'CO2 kg':>9} {'Waste t':>8}")
+    for row, scenario in zip(table, scenarios):
+        print(f"  {row['scenario']:>3}  {scenario_label(scenario)[:44]:<44} {row['total_dist_km']:>10,.1f} {row['trips']:>6} "
+              f"{row['avg_utilization_%']:>7.1f} {row['total_co2_kg']:>9,.1f} {row['waste_collected_t']:>8,.1f}"
+              + (f"  ({row['zones_failed']} zones failed)" if row['zones_failed'] else ""))
+
+def main(argv=None):
+    args = parse_args(argv)
+    scenarios = build_grid(args)
+
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 📂 Loading Geospatial Datasets...")
+    df_clusters, df_sctp, fleet_base, G = data_loader.load_data()
+    if G is None:
+        print("❌ Error: Could not load road network graph (hyderabad_network.graphml).")
+        return
+
+    # Shared inputs, computed once for every scenario
+    t = time.perf_counter()
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 🗺️  Calculating Road Constraints...")
+    df_clusters['max_kg'] = df_clusters['GVP_ID'].map(analysis.compute_road_limits(G, df_clusters))
+    del G  # workers only need the tables and matrices
+    zones = list(df_clusters['Assigned_SCTP_ID'].unique())
+    base = analysis.build_zone_context(df_clusters, df_sctp, fleet_base,
+                                       matrices=precompute_matrices(df_clusters, df_sctp, zones))
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] ⏱️  Shared inputs ready in {time.perf_counter() - t:.1f}s")
+
+    workers = analysis.resolve_workers(args.workers, len(scenarios) * len(zones))
+    print(f"\n🚀 Sweeping {len(scenarios)} scenarios x {len(zones)} zones on {workers} workers...\n")
+    t = time.perf_counter()
+    table = run_sweep(base, scenarios, zones, workers, args.generations)
+
+    write_table(table, args.out)
+    print_table(table, scenarios)
+    print(f"\n[SUCCESS] {len(scenarios)} scenarios in {time.perf_counter() - t:.1f}s -> {args.out}")
+
+if __name__ == "__main__":
+    main()
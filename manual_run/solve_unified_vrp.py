@@ -1,8 +1,4 @@
-import pandas as pd
-import networkx as nx
-import osmnx as ox
 import os
-from geopy.distance import geodesic
 import math
 import warnings
 warnings.filterwarnings("ignore")
@@ -18,6 +14,7 @@ SHIFT_TIME_MINUTES = 480
 
 def load_data():
     print("Loading Data...")
+    import pandas as pd
     df_clusters = pd.read_csv("step1_clusters.csv")
     df_sctp = pd.read_csv("sctp_locations.csv")
     
@@ -31,6 +28,7 @@ def load_data():
             zip_ref.extractall(".")
     
     if os.path.exists(graph_path):
+        import osmnx as ox
         print(f"Loading Graph from {graph_path}...")
         G = ox.load_graphml(graph_path)
     else:
@@ -0,0 +1,77 @@
+import os
+import sys
+import gzip
+import json
+import threading
+
+import pytest
+
+# Add parent to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Website')))
+os.environ.setdefault('ROUTEMIND_WARMUP', '0')
+import app as server
+from core import jobs
+
+@pytest.fixture
+def client():
+    return server.app.test_client()
+
+@pytest.fixture
+def finished_job():
+    done = threading.Event()
+    job = jobs.submit(lambda job: job.emit('zone', {'zone': 'A'}) or 'routes')
+    job.add_done_callback(lambda j: done.set())
+    assert done.wait(5)
+    return job
+
+@pytest.mark.parametrize('header', ['junk', '-3', '', '1.5'])
+def test_job_events_ignore_bad_last_event_id(client, finished_job, header):
+    response = client.get(f'/api/jobs/{finished_job.id}/events', headers={'Last-Event-ID': header})
+    assert response.status_code == 200
+    body = response.get_data(as_text=True)
+    # Replayed from the start: running, zone, done
+    assert body.count('id: ') == 3 and 'event: done' in body
+
+def test_job_events_resume_after_last_event_id(client, finished_job):
+    response = client.get(f'/api/jobs/{finished_job.id}/events', headers={'Last-Event-ID': '2'})
+    assert response.get_data(as_text=True).startswith('id: 3\nevent: done')
+
+@pytest.fixture(scope='module')
+def static_data():
+    assert server.ensure_data(), server.DATA_STATE
+    return server.app.test_client()
+
+def test_static_data_identity_without_accept_encoding(static_data):
+    response = static_data.get('/api/data/static')
+    assert response.status_code == 200
+    assert 'Content-Encoding' not in response.headers
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert set(json.loads(response.data)) >= {'gvps', 'sctps'}
+
+@pytest.mark.parametrize('accept', ['gzip', 'deflate, gzip;q=0.8', 'identity, gzip'])
+def test_static_data_gzip_when_accepted(static_data, accept):
+    plain = static_data.get('/api/data/static')
+    response = static_data.get('/api/data/static', headers={'Accept-Encoding': accept})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data) == plain.data
+    # Each representation has its own ETag
+    assert response.headers['ETag'] != plain.headers['ETag']
+
+@pytest.mark.parametrize('accept', ['gzip;q=0', 'deflate', 'identity'])
+def test_static_data_identity_when_gzip_refused(static_data, accept):
+    response = static_data.get('/api/data/static', headers={'Accept-Encoding': accept})
+    assert 'Content-Encoding' not in response.headers
+
+@pytest.mark.parametrize('accept', [None, 'gzip'])
+def test_static_data_not_modified(static_data, accept):
+    headers = {'Accept-Encoding': accept} if accept else {}
+    etag = static_data.get('/api/data/static', headers=headers).headers['ETag']
+    for tag in (etag, 'W/' + etag, f'"stale", {etag}'):
+        response = static_data.get('/api/data/static', headers={**headers, 'If-None-Match': tag})
+        assert response.status_code == 304 and response.data == b''
+        assert response.headers['ETag'] == etag
+
+def test_static_data_etag_of_other_encoding_does_not_match(static_data):
+    gzip_etag = static_data.get('/api/data/static', headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+    response = static_data.get('/api/data/static', headers={'If-None-Match': gzip_etag})
+    assert response.status_code == 200 and response.data
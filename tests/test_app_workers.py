@@ -0,0 +1,50 @@
+import os
+import sys
+import subprocess
+import textwrap
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Loaded by every interpreter in the test, spawned workers included: records the data
+# warm-up thread instead of starting it
+SITECUSTOMIZE = textwrap.dedent('''
+    import os
+    import threading
+
+    class RecordingThread(threading.Thread):
+        def start(self):
+            if self.name == 'data-warmup':
+                with open(os.environ['WARMUP_LOG'], 'a') as f:
+                    f.write(f"{os.getpid()}\\n")
+                return
+            super().start()
+    threading.Thread = RecordingThread
+''')
+
+# `python Website/app.py`, with app.run() replaced by one task on the SA pool
+DRIVER = textwrap.dedent('''
+    import os
+    import sys
+    import runpy
+    import flask
+
+    def run(self, *args, **kwargs):
+        from core import engine
+        assert engine.sa_pool(2).submit(os.getpid).result() != os.getpid()
+        engine.shutdown_sa_pool()
+    flask.Flask.run = run
+
+    sys.path.insert(0, ROOT)
+    runpy.run_path(os.path.join(ROOT, 'Website', 'app.py'), run_name='__main__')
+''')
+
+def test_sa_pool_workers_do_not_rerun_app_warmup(tmp_path):
+    (tmp_path / 'sitecustomize.py').write_text(SITECUSTOMIZE)
+    driver = tmp_path / 'serve.py'
+    driver.write_text(f"ROOT = {ROOT!r}\n" + DRIVER)
+    log = tmp_path / 'warmups.log'
+    env = {**os.environ, 'WARMUP_LOG': str(log), 'PYTHONPATH': str(tmp_path), 'ROUTEMIND_WARMUP': '1'}
+    proc = subprocess.run([sys.executable, str(driver)], cwd=tmp_path, env=env, capture_output=True, text=True, timeout=120)
+    assert proc.returncode == 0, proc.stderr
+    # Spawned workers re-import app.py as __mp_main__; only the serving process may warm up
+    assert len(log.read_text().split()) == 1
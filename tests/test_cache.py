@@ -0,0 +1,77 @@
+import os
+import sys
+import threading
+
+import pytest
+
+# Add parent to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core import cache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_lru_evicts_least_recently_used():
+    results = cache.ResultCache(max_entries=2, clock=FakeClock())
+    results.put('a', 1)
+    results.put('b', 2)
+    assert results.get('a') == 1          # 'a' becomes most recent
+    results.put('c', 3)
+    assert results.get('b') is None
+    assert results.get('a') == 1 and results.get('c') == 3
+    assert results.stats()['entries'] == 2
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    results = cache.ResultCache(ttl_seconds=60, clock=clock)
+    results.put('a', 1)
+    clock.now += 60
+    assert results.get('a') == 1
+    clock.now += 0.001
+    assert results.get('a') is None
+    assert results.stats()['entries'] == 0
+    # An expired entry is recomputed
+    assert results.get_or_compute('a', lambda: 2) == (2, False)
+
+def test_concurrent_misses_are_coalesced():
+    results = cache.ResultCache(clock=FakeClock())
+    started, release = threading.Event(), threading.Event()
+    computed = []
+    outcome = {}
+
+    def slow():
+        computed.append(1)
+        started.set()
+        release.wait(5)
+        return 'routes'
+
+    def request(name, compute, on_follow=None):
+        outcome[name] = results.get_or_compute('key', compute, on_follow)
+
+    leader = threading.Thread(target=request, args=('leader', slow))
+    leader.start()
+    assert started.wait(5)
+    followed = threading.Event()
+    follower = threading.Thread(target=request, args=('follower', lambda: 'again', followed.set))
+    follower.start()
+    assert followed.wait(5)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+    assert outcome == {'leader': ('routes', False), 'follower': ('routes', True)}
+    assert computed == [1]
+    assert results.stats() == {'entries': 1, 'hits': 1, 'misses': 1}
+
+def test_errors_are_not_cached():
+    results = cache.ResultCache(clock=FakeClock())
+
+    def fail():
+        raise RuntimeError("solver crashed")
+
+    with pytest.raises(RuntimeError):
+        results.get_or_compute('key', fail)
+    assert results.get_or_compute('key', lambda: 'routes') == ('routes', False)
@@ -0,0 +1,56 @@
+import os
+import sys
+import io
+import random
+from contextlib import redirect_stdout
+
+import pytest
+
+# Add parent to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core import data, engine
+from core.utils import vectorized_haversine_matrix
+
+def small_zone(n, seed=0):
+    rng = random.Random(seed)
+    gvp_data = [{'id': i, 'max_kg': 16000, 'lat': 17.38 + rng.uniform(-0.02, 0.02),
+                 'lon': 78.48 + rng.uniform(-0.02, 0.02), 'demand': rng.uniform(200, 3000)} for i in range(n)]
+    depot_loc = (17.385, 78.4867)
+    return gvp_data, vectorized_haversine_matrix(gvp_data, depot_loc)
+
+@pytest.mark.parametrize('n', [2, 3, 4])
+@pytest.mark.parametrize('sa_elites', [1, 2, 5])
+def test_run_ga_small_zone_with_several_sa_elites(monkeypatch, n, sa_elites):
+    # population_target(2) == 2: elites alone could fill (and overflow) the buffer
+    monkeypatch.setattr(engine, 'MAX_GENERATIONS', 5)
+    monkeypatch.setattr(engine, 'SA_ELITES', sa_elites)
+    gvp_data, matrix = small_zone(n)
+    for seed in range(20):
+        random.seed(seed)
+        with redirect_stdout(io.StringIO()):
+            best = engine.run_ga(gvp_data, data.default_fleet(), matrix, n)
+        assert sorted(best) == list(range(n))
+
+def test_population_buffer_add_when_full():
+    pop = engine.PopulationBuffer(2, 3)
+    pop.begin()
+    assert pop.add([0, 1, 2]) and pop.add([2, 1, 0])
+    assert not pop.add([1, 0, 2])
+    assert not pop.add([0, 1, 2])
+    assert len(pop) == 2
+
+def travel_model(km):
+    return engine.build_travel_model([[0.0, km], [km, 0.0]])
+
+def test_trip_into_peak_band_is_slower_than_free_flow():
+    model = travel_model(engine.AVG_SPEED_KMPH)   # 60 free-flow minutes
+    assert engine.get_travel_time(model, 0, 1, 0) == pytest.approx(60)
+    # 10 minutes off-peak cover 10 free-flow minutes, the other 50 run at the 1.8x peak factor
+    assert engine.get_travel_time(model, 0, 1, 110) == pytest.approx(10 + 50 * 1.8)
+    assert engine.get_travel_time(model, 0, 1, 119.5) > 60
+
+@pytest.mark.parametrize('km', [1.0, 10.0, 60.0])
+def test_later_departure_never_arrives_earlier(km):
+    model = travel_model(km)
+    arrivals = [d / 4 + engine.get_travel_time(model, 0, 1, d / 4) for d in range(0, 4 * 420)]
+    assert all(later >= earlier - 1e-9 for earlier, later in zip(arrivals, arrivals[1:]))
@@ -0,0 +1,76 @@
+import os
+import sys
+import json
+import random
+
+import pandas as pd
+import pytest
+
+# Add the manual solver to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'manual_run', 'Advanced_Optimization')))
+import ga_vrp_solver as ga
+
+FLEET = [{'name': 'Mini Tipper 8T', 'payload_kg': 8000, 'count': 10, 'cost_per_km': 18}]
+DEPOT = (17.385, 78.4867)
+
+class Interrupted(Exception):
+    pass
+
+@pytest.fixture
+def solver(monkeypatch, tmp_path):
+    # Keeps simulation_debug.log out of the repo
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(ga, 'GENERATIONS', 12)
+    monkeypatch.setattr(ga, 'CHECKPOINT_EVERY', 5)
+    monkeypatch.setattr(ga, 'PROGRESS_CALLBACK', None)
+    return ga
+
+def zone(n=12, seed=0):
+    rng = random.Random(seed)
+    return pd.DataFrame([{'lat': 17.38 + rng.uniform(-0.02, 0.02), 'lon': 78.48 + rng.uniform(-0.02, 0.02),
+                          'Waste_Tonnes': rng.uniform(0.2, 3.0)} for _ in range(n)])
+
+def solve(df, path, resume=False, fleet=FLEET, stop_at=None):
+    if stop_at is not None:
+        def stop(gen, total, message):
+            if gen == stop_at:
+                raise Interrupted()
+        ga.PROGRESS_CALLBACK = stop
+    random.seed(1)
+    try:
+        return ga.solve_scenario(df, fleet, None, depot_loc=DEPOT, checkpoint_path=str(path), resume=resume)
+    finally:
+        ga.PROGRESS_CALLBACK = None
+
+def test_resumed_run_matches_uninterrupted_run(solver, tmp_path, capsys):
+    df = zone()
+    path = tmp_path / 'zone.ckpt.json'
+    full = solve(df, path)
+    assert not path.exists()          # cleared once the zone is solved
+
+    with pytest.raises(Interrupted):
+        solve(df, path, stop_at=8)
+    assert json.loads(path.read_text())['gen'] == 5
+
+    capsys.readouterr()
+    resumed = solve(df, path, resume=True)
+    out = capsys.readouterr().out
+    assert "Resuming from checkpoint at Gen 5" in out and "Gen 4:" not in out
+    assert resumed['routes'] == full['routes']
+    assert resumed['metrics'] == full['metrics']
+
+def test_checkpoint_for_other_inputs_is_discarded(solver, tmp_path, capsys):
+    df = zone()
+    path = tmp_path / 'zone.ckpt.json'
+    with pytest.raises(Interrupted):
+        solve(df, path, stop_at=8)
+
+    other_fleet = [{**FLEET[0], 'count': 4}]
+    key = ga.instance_key(ga.prepare_gvp_data(df), other_fleet, DEPOT)
+    assert ga.GACheckpoint(str(path), key, resume=True).load() is None
+
+    capsys.readouterr()
+    fresh = solve(df, path, resume=True, fleet=other_fleet)
+    out = capsys.readouterr().out
+    assert "written for different inputs" in out and "Resuming" not in out
+    assert fresh['routes'] == solve(df, path, fleet=other_fleet)['routes']
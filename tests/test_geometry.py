@@ -0,0 +1,44 @@
+import os
+import sys
+
+# Add parent to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core import geometry
+
+class LineGraph:
+    # Nodes 0..n-1 on a straight road; duck-types core.shared.CompactGraph
+    def __init__(self, n):
+        self.n = n
+        self.searches = 0
+
+    def node_coord(self, u):
+        return [float(u), 0.0]
+
+    def edge_coords(self, u, v):
+        return [self.node_coord(u), self.node_coord(v)]
+
+    def shortest_path(self, u, v):
+        self.searches += 1
+        step = 1 if v > u else -1
+        return list(range(u, v + step, step))
+
+def test_leg_cache_is_bounded_lru(monkeypatch):
+    monkeypatch.setattr(geometry, 'LEG_CACHE_SIZE', 2)
+    geometry.clear_leg_cache()
+    G = LineGraph(10)
+    assert geometry.leg_path(G, 0, 3) == [[0.0, 0.0], [1.0, 0.0], [2.0, 0.0], [3.0, 0.0]]
+    geometry.leg_path(G, 1, 4)
+    geometry.leg_path(G, 0, 3)           # hit: (0, 3) becomes most recent
+    geometry.leg_path(G, 2, 5)           # evicts (1, 4)
+    assert G.searches == 3
+    assert list(geometry._LEG_CACHE) == [(0, 3), (2, 5)]
+    geometry.leg_path(G, 1, 4)
+    assert G.searches == 4
+
+def test_leg_cache_resets_for_another_graph():
+    geometry.clear_leg_cache()
+    first, second = LineGraph(10), LineGraph(10)
+    geometry.leg_path(first, 0, 3)
+    geometry.leg_path(second, 0, 3)
+    assert second.searches == 1
+    geometry.clear_leg_cache()
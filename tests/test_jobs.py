@@ -0,0 +1,33 @@
+import os
+import sys
+import threading
+
+# Add parent to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core import jobs
+
+def test_cancel_while_queued_never_runs_fn():
+    job = jobs.Job('queued')
+    job.cancel()
+    ran = []
+    jobs._run(job, lambda j: ran.append(1), (), {})
+    assert job.status == 'cancelled' and ran == []
+
+def test_cancel_running_job_unwinds_at_progress():
+    started, release = threading.Event(), threading.Event()
+
+    def solve(job):
+        started.set()
+        release.wait(5)
+        job.progress(gen=1)
+        return 'routes'
+
+    job = jobs.submit(solve)
+    assert started.wait(5)
+    jobs.cancel(job.id)
+    assert job.status == 'running'
+    release.set()
+    done = threading.Event()
+    job.add_done_callback(lambda j: done.set())
+    assert done.wait(5)
+    assert job.status == 'cancelled' and job.result is None
@@ -0,0 +1,24 @@
+import os
+import sys
+
+# Add parent to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core import metrics
+
+def test_counter_callback_is_exported_as_counter():
+    registry = metrics.Registry()
+    rejected = [0]
+    registry.set_counter('solves_rejected', lambda: rejected[0])
+    rejected[0] = 3
+    assert registry.snapshot()['counters']['solves_rejected'] == 3
+    text = registry.render_prometheus()
+    assert '# TYPE routemind_solves_rejected_total counter\nroutemind_solves_rejected_total 3\n' in text
+    assert 'gauge\nroutemind_solves_rejected ' not in text
+
+def test_counter_callback_adds_to_incremented_counter_and_survives_reset():
+    registry = metrics.Registry()
+    registry.set_counter('zone_solves', lambda: 2)
+    registry.inc('zone_solves', 5)
+    assert registry.snapshot()['counters']['zone_solves'] == 7
+    registry.reset()
+    assert registry.snapshot()['counters']['zone_solves'] == 2
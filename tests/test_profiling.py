@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+# Add parent to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core import profiling
+
+def busy():
+    return sum(i * i for i in range(20000))
+
+@pytest.mark.parametrize('mode', profiling.PROFILE_MODES)
+def test_profile_session_lists_zone_files(tmp_path, mode):
+    session = profiling.ProfileSession(str(tmp_path / 'session'), mode)
+    with session.zone('Saket / North'):
+        busy()
+    assert session.files and all(os.path.exists(f) for f in session.files)
+    assert all(os.path.basename(f).startswith('zone_Saket_North.') for f in session.files)
+
+def test_failed_zone_profile_is_written_and_listed(tmp_path):
+    session = profiling.ProfileSession(str(tmp_path / 'session'), 'all')
+    with pytest.raises(RuntimeError):
+        with session.zone('Banjara'):
+            busy()
+            raise RuntimeError("solver crashed")
+    assert sorted(os.path.basename(f) for f in session.files) == ['zone_Banjara.collapsed', 'zone_Banjara.pstats']
+    assert all(os.path.exists(f) for f in session.files)
+    # The cProfile slot was released: the next zone can profile
+    with session.zone('Saket'):
+        busy()
+    assert len(session.files) == 4
@@ -0,0 +1,76 @@
+import os
+import sys
+import csv
+import json
+
+import numpy as np
+import pytest
+
+# Add the manual runner to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'manual_run')))
+import reports
+
+def zone_rows(zone, count):
+    # Solver rows carry numpy scalars
+    return [{'SCTP_Name': zone, 'VehicleID': f'{zone}-{i}', 'Truck_Type': 'Mini Tipper 8T',
+             'Payload_Capacity_T': np.float64(8.0), 'Load_kg': np.int64(1000 * (i + 1)),
+             'Utilization_%': np.float64(12.5 * (i + 1)), 'Dist_km': np.float64(3.25 * (i + 1)),
+             'Duration_mins': np.int64(40 + i), 'CO2_kg': np.float64(1.5)} for i in range(count)]
+
+def read_csv(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+def test_csv_report_streams_zone_by_zone(tmp_path):
+    report = reports.RouteReport(str(tmp_path / 'routes'), ['csv'])
+    path = report.paths['csv']
+    report.write_zone('Saket', zone_rows('Saket', 2))
+    # Rows are on disk as soon as the zone is written
+    assert [r['VehicleID'] for r in read_csv(path)] == ['Saket-0', 'Saket-1']
+    report.write_zone('Empty', [])
+    report.write_zone('Banjara', zone_rows('Banjara', 3))
+    report.close()
+
+    rows = read_csv(path)
+    assert [r['SCTP_Name'] for r in rows] == ['Saket'] * 2 + ['Banjara'] * 3
+    assert list(rows[0]) == [name for name, _ in reports.ROUTE_COLUMNS]
+    assert rows[2] == {'SCTP_Name': 'Banjara', 'VehicleID': 'Banjara-0', 'Truck_Type': 'Mini Tipper 8T',
+                       'Payload_Capacity_T': '8.0', 'Load_kg': '1000', 'Utilization_%': '12.5',
+                       'Dist_km': '3.25', 'Duration_mins': '40', 'CO2_kg': '1.5'}
+
+    assert report.zones['Empty'] == {'routes': 0, 'total_dist': 0.0, 'total_waste': 0}
+    assert report.summary() == {'total_dist': 3.25 * 3 + 3.25 * 6, 'total_waste': 3000 + 6000, 'total_co2': 7.5,
+                                'total_routes': 5, 'avg_utilization': 22.5}
+    summary_path = tmp_path / 'summary.json'
+    report.write_summary(summary_path)
+    assert json.loads(summary_path.read_text())['route_files'] == {'csv': path}
+
+def test_parquet_report_reads_back(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    report = reports.RouteReport(str(tmp_path / 'routes'), ['parquet', 'csv'])
+    report.write_zone('Saket', zone_rows('Saket', 2))
+    report.write_zone('Banjara', zone_rows('Banjara', 3))
+    report.close()
+
+    table = pq.ParquetFile(report.paths['parquet'])
+    assert table.metadata.num_row_groups == 2       # one per zone
+    rows = table.read().to_pylist()
+    assert rows == [{k: v if isinstance(v, str) else v.item() for k, v in r.items()}
+                    for r in zone_rows('Saket', 2) + zone_rows('Banjara', 3)]
+    assert len(read_csv(report.paths['csv'])) == 5
+
+def test_parquet_falls_back_to_csv_without_pyarrow(tmp_path, monkeypatch, capsys):
+    # None in sys.modules makes the import fail even where pyarrow is installed
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+    monkeypatch.setitem(sys.modules, 'pyarrow.parquet', None)
+    assert not reports.parquet_available()
+    with pytest.raises(RuntimeError):
+        reports.ParquetRouteSink(str(tmp_path / 'direct.parquet'))
+
+    report = reports.RouteReport(str(tmp_path / 'routes'), ['parquet', 'csv'])
+    assert "pyarrow is not installed" in capsys.readouterr().out
+    assert report.paths == {'csv': str(tmp_path / 'routes.csv')}
+    report.write_zone('Saket', zone_rows('Saket', 2))
+    report.close()
+    assert len(read_csv(report.paths['csv'])) == 2
+    assert not (tmp_path / 'routes.parquet').exists()
@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+
+# Add parent to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core import scenario
+
+def test_validate_config_accepts_documented_shape():
+    config = {'demand': {'G1': 2.5}, 'fleet': {'Mini Tipper 8T': 10},
+              'zones': {'S1': {'demand_scale': 1.2, 'fleet_share': 0.5, 'exclude_gvps': ['G2'], 'max_kg': 8000}}}
+    assert scenario.validate_config(config) is config
+    assert scenario.validate_config({}) == {}
+
+@pytest.mark.parametrize('config', [
+    ['fleet'],
+    'fleet',
+    {'fleet': 'bad'},
+    {'fleet': {'Mini Tipper 8T': -1}},
+    {'fleet': {'Mini Tipper 8T': 2.5}},
+    {'demand': {'G1': 'heavy'}},
+    {'demand': {'G1': float('nan')}},
+    {'zones': ['S1']},
+    {'zones': {'S1': 'all'}},
+    {'zones': {'S1': {'fleet_share': 2}}},
+    {'zones': {'S1': {'exclude_gvps': 'G2'}}},
+])
+def test_validate_config_rejects_bad_shape(config):
+    with pytest.raises(ValueError):
+        scenario.validate_config(config)
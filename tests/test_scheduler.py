@@ -0,0 +1,78 @@
+import os
+import sys
+import threading
+import time
+
+# Add parent to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core import cache, scheduler
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while not predicate():
+        if time.time() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.01)
+
+def test_coalesced_follower_releases_ticket_so_leader_can_start():
+    # A is admitted first (heads the FIFO) but B reaches the cache first and leads the solve
+    sched = scheduler.SolveScheduler(max_concurrent=1, max_queue=8)
+    results = cache.ResultCache()
+    ticket_a, ticket_b = sched.admit(), sched.admit()
+    computed = []
+    outcome = {}
+
+    def solve():
+        computed.append(1)
+        return 'routes'
+
+    def request(name, ticket):
+        outcome[name] = scheduler.run_coalesced(sched, results, 'key', ticket, solve)
+
+    leader = threading.Thread(target=request, args=('b', ticket_b), daemon=True)
+    leader.start()
+    wait_until(lambda: 'key' in results._inflight)
+    follower = threading.Thread(target=request, args=('a', ticket_a), daemon=True)
+    follower.start()
+
+    leader.join(5)
+    follower.join(5)
+    assert not leader.is_alive() and not follower.is_alive(), sched.stats()
+    assert outcome == {'b': ('routes', False), 'a': ('routes', True)}
+    assert computed == [1]
+    assert sched.stats()['running'] == 0 and sched.stats()['queued'] == 0
+
+def test_follower_readmits_after_failed_leader():
+    sched = scheduler.SolveScheduler(max_concurrent=1, max_queue=8)
+    results = cache.ResultCache()
+    started = threading.Event()
+    proceed = threading.Event()
+    outcome = {}
+
+    def failing_solve():
+        started.set()
+        proceed.wait(5)
+        raise RuntimeError("solver crashed")
+
+    def leader():
+        try:
+            scheduler.run_coalesced(sched, results, 'key', sched.admit(), failing_solve)
+        except RuntimeError as e:
+            outcome['leader'] = str(e)
+
+    def follower(ticket):
+        outcome['follower'] = scheduler.run_coalesced(sched, results, 'key', ticket, lambda: 'routes')
+
+    t_leader = threading.Thread(target=leader, daemon=True)
+    t_leader.start()
+    started.wait(5)
+    t_follower = threading.Thread(target=follower, args=(sched.admit(),), daemon=True)
+    t_follower.start()
+    # The follower gave its place in line back while waiting on the leader
+    wait_until(lambda: sched.stats()['queued'] == 0)
+    proceed.set()
+
+    t_leader.join(5)
+    t_follower.join(5)
+    assert outcome == {'leader': "solver crashed", 'follower': ('routes', False)}
+    assert sched.stats()['running'] == 0 and sched.stats()['queued'] == 0
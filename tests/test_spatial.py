@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+# Add parent to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core import spatial
+
+def test_parse_bbox():
+    assert spatial.parse_bbox('78.4,17.3,78.5,17.4') == (78.4, 17.3, 78.5, 17.4)
+
+@pytest.mark.parametrize('text', ['0,0,inf,inf', 'nan,0,1,1', '-inf,0,1,1', '0,0,1', '1,0,0,1', None])
+def test_parse_bbox_rejects_bad_input(text):
+    with pytest.raises(ValueError):
+        spatial.parse_bbox(text)